@@ -1,9 +1,18 @@
 import streamlit as st
 from st_pages import add_page_title, get_nav_from_toml
+from utils import cache_warmer, tracing
+from utils.session_bootstrap import bootstrap_session
 
 st.set_page_config(layout="wide")
+bootstrap_session()
+cache_warmer.start()
 
 nav = get_nav_from_toml()
 pg = st.navigation(nav)
 add_page_title(pg)
-pg.run()
\ No newline at end of file
+pg.run()
+
+if tracing.is_enabled():
+    with st.sidebar.expander("⏱️ Tracing"):
+        st.dataframe(tracing.summary(), use_container_width=True)
+        st.download_button("Export", tracing.export_summary(), file_name="tracing.json")
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Headless batch runner for saved simulations and holdings.
+
+Loads the saved simulations (`SimulationManager`) and/or the holdings
+(`MyInvestmentsManager`) and runs one job per simulation (`MFSimulator`) and per held
+scheme (`PortfolioValuation`, from the stored holdings aggregate) on a process pool. The simulations of one scheme are
+sent to the same worker, which downloads its NAV history once (per-process caches of
+`utils.caching`), so only the first job of a scheme has a noticeable ``load_ms``.
+
+Output, in ``--output-dir`` (default ``reports/<timestamp>``), as Parquet or CSV:
+    - ``simulations``: one row per saved simulation (parameters as JSON, final metrics, timings);
+    - ``holdings``: one row per held scheme (metrics, timings);
+    - ``histories/<simulation id>``: investment history of every simulation.
+
+Every row carries ``status``, ``error``, ``load_ms`` (NAV / scheme fetch), ``run_ms``
+(computation), ``total_ms`` and the worker ``pid``. Exits with status 1 if a job failed.
+
+Usage::
+
+    python batch_report.py                                  # everything, Parquet
+    python batch_report.py --simulations --format csv
+    python batch_report.py --simulations abc123 xyz789 --workers 2
+    MF_GCS_EMULATOR=1 python batch_report.py --holdings     # offline, against the emulator
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+logger = logging.getLogger("batch_report")
+
+
+def _quiet_streamlit() -> None:
+    # Caches work without a Streamlit runtime; silence the "no runtime" warnings
+    # (after importing, as Streamlit sets its loggers' levels on creation)
+    import streamlit.runtime.caching  # noqa: F401
+    for name in ("streamlit", "streamlit.runtime.caching.cache_data_api", "streamlit.runtime.scriptrunner_utils"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+
+def run_simulation_job(sim: dict) -> dict:
+    """Run one saved simulation; returns its summary row and investment history."""
+    from src.mf_simulator import MFSimulator
+
+    row = {"id": sim.get("id"), "scheme_code": sim.get("scheme_code"), "scheme_name": sim.get("scheme_name"),
+           "frequency": sim.get("frequency"), "description": sim.get("description"),
+           "params": json.dumps(sim, default=str, sort_keys=True), "pid": os.getpid()}
+    start = time.perf_counter()
+    history = None
+    try:
+        simulator = MFSimulator(scheme_code=sim["scheme_code"])
+        loaded = time.perf_counter()
+        investment_history, final_metrics = simulator.run_simulation_from_params(sim)
+        done = time.perf_counter()
+        history = investment_history.to_pandas()
+        row.update(final_metrics, investments=len(history), status="ok", error=None,
+                   load_ms=(loaded - start) * 1000, run_ms=(done - loaded) * 1000)
+    except Exception as exc:
+        row.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    row["total_ms"] = (time.perf_counter() - start) * 1000
+    return {"row": row, "history": history}
+
+
+def run_simulation_group(sims: list) -> list:
+    """Run the simulations of one scheme in order (one NAV download)."""
+    return [run_simulation_job(sim) for sim in sims]
+
+
+def run_holding_job(holding: dict) -> dict:
+    """Value one held scheme from its holdings aggregate record (as the investment pages do)."""
+    from mftools_wrapper import MFClient
+    from src.portfolio import PortfolioValuation
+
+    row = {"scheme_code": holding["scheme_code"], "scheme_name": holding.get("scheme_name"),
+           "transactions": len(holding["transaction_ids"]), "pid": os.getpid()}
+    start = time.perf_counter()
+    try:
+        quotes = MFClient().get_scheme_quotes([holding["scheme_code"]])  # AMFI file, timed separately
+        loaded = time.perf_counter()
+        valuation = PortfolioValuation(pd.DataFrame(), quotes=quotes, holdings=[holding])
+        metrics = valuation.holdings().drop(columns=["scheme_code", "scheme_name"]).iloc[0].to_dict()
+        if pd.isna(metrics["latest_nav"]):
+            raise LookupError(f"No quote for scheme {holding['scheme_code']}")
+        done = time.perf_counter()
+        row.update(metrics, status="ok", error=None, load_ms=(loaded - start) * 1000, run_ms=(done - loaded) * 1000)
+    except Exception as exc:
+        row.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    row["total_ms"] = (time.perf_counter() - start) * 1000
+    return {"row": row}
+
+
+def load_jobs(simulations, holdings: bool) -> tuple:
+    """(simulation records, holdings aggregate records) selected by the CLI flags.
+
+    Args:
+        simulations (list[str] | None): None to skip simulations, [] for all, else the ids to run.
+        holdings (bool): Whether to include the holdings.
+    """
+    from utils.data_loader import MyInvestmentsManager, SimulationManager
+
+    sims = []
+    if simulations is not None:
+        sims = SimulationManager().load_data()
+        if simulations:
+            wanted = set(simulations)
+            sims = [sim for sim in sims if sim.get("id") in wanted]
+            missing = wanted - {sim.get("id") for sim in sims}
+            if missing:
+                logger.warning("Unknown simulation ids: %s", ", ".join(sorted(missing)))
+
+    held = MyInvestmentsManager().load_holdings() if holdings else []  # read-only, never rebuilt here
+    return sims, held
+
+
+def write_frame(df: pd.DataFrame, path: str, fmt: str) -> str:
+    path = f"{path}.{fmt}"
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--simulations", nargs="*", metavar="ID",
+                        help="run saved simulations (all, or only the given ids)")
+    parser.add_argument("--holdings", action="store_true", help="compute metrics of every held scheme")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet", help="output format")
+    parser.add_argument("--output-dir", default=None, help="output directory (default reports/<timestamp>)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    _quiet_streamlit()
+    if args.simulations is None and not args.holdings:
+        args.simulations, args.holdings = [], True  # nothing selected: run everything
+
+    sims, held = load_jobs(args.simulations, args.holdings)
+    if not sims and not held:
+        logger.info("Nothing to run.")
+        return 0
+
+    output_dir = args.output_dir or os.path.join("reports", time.strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_quiet_streamlit) as pool:
+        groups = {}
+        for sim in sims:
+            groups.setdefault(str(sim.get("scheme_code")), []).append(sim)
+        sim_futures = [pool.submit(run_simulation_group, group) for group in groups.values()]
+        holding_futures = [pool.submit(run_holding_job, holding) for holding in held]
+        sim_results = [result for future in sim_futures for result in future.result()]
+        holding_results = [future.result() for future in holding_futures]
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    failed = 0
+    if sim_results:
+        rows = pd.DataFrame([result["row"] for result in sim_results])
+        logger.info("Wrote %s", write_frame(rows, os.path.join(output_dir, "simulations"), args.format))
+        os.makedirs(os.path.join(output_dir, "histories"), exist_ok=True)
+        for result in sim_results:
+            if result["history"] is not None:
+                write_frame(result["history"], os.path.join(output_dir, "histories", str(result["row"]["id"])), args.format)
+        failed += int((rows["status"] != "ok").sum())
+    if holding_results:
+        rows = pd.DataFrame([result["row"] for result in holding_results])
+        logger.info("Wrote %s", write_frame(rows, os.path.join(output_dir, "holdings"), args.format))
+        failed += int((rows["status"] != "ok").sum())
+
+    jobs = len(sim_results) + len(holding_results)
+    job_ms = sum(result["row"]["total_ms"] for result in sim_results + holding_results)
+    print(f"{jobs} jobs ({len(sim_results)} simulations, {len(holding_results)} holdings) on {args.workers} workers: "
+          f"wall {wall_ms:.0f} ms, sum of job times {job_ms:.0f} ms, {failed} failed -> {output_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
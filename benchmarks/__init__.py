@@ -0,0 +1,27 @@
+"""
+    benchmarks
+    ----------
+
+    Benchmark suite for the simulation and metrics hot paths.
+
+    Modules
+    -------
+
+    - `synthetic`: Synthetic NAV histories (1k-30k days) with weekends, holidays and data gaps.
+    - `presets`: Simulation parameter presets mirroring the defaults of the simulation pages.
+    - `reference`: Reference (original loop-based) simulator used to validate optimized results.
+    - `run`: Command line runner recording timing and peak memory per hot path and comparing
+      them against a stored baseline.
+    - `storage_load`: Concurrent-session load test of the user-data managers against the
+      in-process GCS emulator (`utils.gcs_emulator`).
+
+    Usage
+    -----
+
+    Run from the repository root::
+
+        python -m benchmarks.run --save-baseline        # record benchmarks/baseline.json
+        python -m benchmarks.run                        # compare against it
+        python -m benchmarks.run --sizes 1000 5000 --threshold 0.25
+        python -m benchmarks.storage_load --sessions 8 --latency-ms 30 --cache-ttl 0 5
+"""
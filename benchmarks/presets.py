@@ -0,0 +1,56 @@
+"""Parameter presets mirroring the defaults of `pages/simulations/simulate_strategy.py`."""
+
+PAGE_DROP_THRESHOLD_RANGE = (2.0, 8.0)
+PAGE_WEIGHTS = {
+    "recent_vs_historical": 0.3,
+    "peak_vs_average": 0.4
+}
+
+PRESETS = {
+    "weekly_default": {
+        "frequency": "Weekly",
+        "weeks": 150,
+        "weekday": 4,
+        "sip_amount": 1000,
+        "carry_forward": False,
+        "lumpsum": 5000,
+        "drop_threshold_range": PAGE_DROP_THRESHOLD_RANGE,
+        "weights": PAGE_WEIGHTS,
+    },
+    "weekly_carry_forward": {
+        "frequency": "Weekly",
+        "weeks": 400,
+        "weekday": 2,
+        "sip_amount": 1000,
+        "carry_forward": True,
+        "lumpsum": 5000,
+        "drop_threshold_range": PAGE_DROP_THRESHOLD_RANGE,
+        "weights": PAGE_WEIGHTS,
+    },
+    "monthly_default": {
+        "frequency": "Monthly",
+        "months": 24,
+        "date_of_investment": 5,
+        "sip_amount": 20000,
+        "carry_forward": False,
+        "lumpsum": 20000,
+        "drop_threshold_range": PAGE_DROP_THRESHOLD_RANGE,
+        "weights": PAGE_WEIGHTS,
+    },
+    "monthly_carry_forward": {
+        "frequency": "Monthly",
+        "months": 200,
+        "date_of_investment": 28,
+        "sip_amount": 20000,
+        "carry_forward": True,
+        "lumpsum": 20000,
+        "drop_threshold_range": PAGE_DROP_THRESHOLD_RANGE,
+        "weights": PAGE_WEIGHTS,
+    },
+}
+
+# NAV history lengths (rows) exercised by default
+SIZES = [1000, 5000, 15000, 30000]
+
+# Lookback windows used on the mf_details / saved simulations pages
+LOOKBACK_DAYS = [7, 30, 60, 90, 180, 365]
@@ -0,0 +1,106 @@
+"""
+Reference simulator: the original per-day loop implementation of `MFSimulator`.
+
+Every schedule date is resolved by filtering the NAV frame and every dip factor is
+computed from the truncated history with `DipFactorUtils.compute_raw`. It is slow by
+design and only used to check that optimized code paths produce the same results.
+"""
+from datetime import timedelta
+
+import pandas as pd
+
+from src.dip_factor import DipFactorUtils
+from src.mf_simulator import MFSimulator
+
+
+def _finish(df: pd.DataFrame, history: list, cashflows: list, total_units: float, total_invested: float):
+    latest_nav = df['nav'].iloc[-1]
+    final_value = total_units * latest_nav
+    cashflows.append((df["date"].iloc[-1], final_value))
+    metrics = {
+        "total_invested": total_invested,
+        "final_value": final_value,
+        "xirr": MFSimulator.calculate_xirr(cashflows),
+        "total_units": total_units,
+        "latest_nav": latest_nav,
+        "profit": final_value - total_invested,
+        "roi": (final_value - total_invested) / total_invested * 100 if total_invested else 0,
+        "average_nav": total_invested / total_units if total_units else 0,
+    }
+    columns = ["date", "nav", "dip_factor", "dip_buy", "sip", "total_investment", "units"]
+    return pd.DataFrame(history, columns=columns), metrics
+
+
+def simulate_weekly(nav_df, weights, drop_threshold_range, lumpsum, carry_forward, sip_amount, weeks, weekday):
+    """Original weekly loop: invest on `weekday`, skipping days without NAV."""
+    df = nav_df.sort_values("date").reset_index(drop=True)
+    end_date = df["date"].max()
+    start_date = end_date - timedelta(weeks=weeks)
+
+    lumpsum_remain = lumpsum
+    total_units, total_invested = 0.0, 0.0
+    history, cashflows = [], []
+
+    for curr_date in pd.date_range(start_date, end_date):
+        if curr_date.weekday() != weekday:
+            continue
+        row = df[df["date"] == curr_date]
+        if row['nav'].values.size == 0:
+            continue
+        nav = row['nav'].values[0]
+        past_df = df[df["date"] <= curr_date]
+        dip_factor = DipFactorUtils(past_df, weights, drop_threshold_range).from_frequency("Weekly")
+
+        dip_buy = dip_factor * lumpsum_remain
+        amount = dip_buy + sip_amount
+        if amount > 0:
+            total_units += amount / nav
+            total_invested += amount
+            cashflows.append((curr_date, -amount))
+            history.append((curr_date, nav, dip_factor, dip_buy, sip_amount, amount, amount / nav))
+        if carry_forward:
+            lumpsum_remain += (lumpsum - dip_buy)
+
+    return _finish(df, history, cashflows, total_units, total_invested)
+
+
+def simulate_monthly(nav_df, weights, drop_threshold_range, lumpsum, carry_forward, sip_amount, months, date_of_investment):
+    """Original monthly loop: invest on the latest NAV on or before `date_of_investment`."""
+    df = nav_df.sort_values("date").reset_index(drop=True)
+    end_date = df["date"].max()
+    start_date = end_date - pd.DateOffset(months=months)
+
+    lumpsum_remain = lumpsum
+    total_units, total_invested = 0.0, 0.0
+    history, cashflows = [], []
+
+    for curr_date in pd.date_range(start_date, end_date, freq='D'):
+        if curr_date.day != date_of_investment:
+            continue
+        row = df[df["date"] <= curr_date].nlargest(1, "date")
+        if row.empty:
+            continue
+        nav = row.iloc[0]['nav']
+        curr_date = row.iloc[0]['date']
+        past_df = df[df["date"] <= curr_date]
+        dip_factor = DipFactorUtils(past_df, weights, drop_threshold_range).from_frequency("Monthly")
+
+        dip_buy = dip_factor * lumpsum_remain
+        amount = dip_buy + sip_amount
+        if amount > 0:
+            total_units += amount / nav
+            total_invested += amount
+            cashflows.append((curr_date, -amount))
+            history.append((curr_date, nav, dip_factor, dip_buy, sip_amount, amount, amount / nav))
+        if carry_forward:
+            lumpsum_remain += (lumpsum - dip_buy)
+
+    return _finish(df, history, cashflows, total_units, total_invested)
+
+
+def run_simulation_from_params(nav_df: pd.DataFrame, params: dict):
+    """Reference counterpart of `MFSimulator.run_simulation_from_params`."""
+    common = {k: params[k] for k in ("weights", "drop_threshold_range", "lumpsum", "carry_forward", "sip_amount")}
+    if params["frequency"] == "Weekly":
+        return simulate_weekly(nav_df, weeks=params["weeks"], weekday=params["weekday"], **common)
+    return simulate_monthly(nav_df, months=params["months"], date_of_investment=params["date_of_investment"], **common)
@@ -0,0 +1,177 @@
+"""
+Benchmark runner for the simulation and metrics hot paths.
+
+For every synthetic history size it times each hot path (best of `--repeat` runs),
+records its peak traced memory, checks the simulator against `benchmarks.reference`,
+and compares the numbers with a stored baseline. Exits with status 1 if a result
+does not match the reference or a hot path regressed by more than `--threshold`.
+
+Timings are machine specific, so the baseline is recorded locally from the code before a
+change (`--save-baseline`) and is not committed; without one only the reference check runs.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import config.constants as CONSTANTS
+
+from src.dip_factor import DipFactorUtils
+from src.mf_simulator import MFSimulator
+from src.nav_metrics import compute_nav_metrics
+
+from benchmarks import reference
+from benchmarks.presets import PRESETS, SIZES, LOOKBACK_DAYS
+from benchmarks.synthetic import generate_nav_history
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+HISTORY_COLUMNS = ["nav", "dip_factor", "dip_buy", "total_investment", "units"]
+METRIC_KEYS = ["total_invested", "final_value", "xirr", "total_units", "roi", "average_nav"]
+
+
+def measure(fn, repeat: int) -> dict:
+    """Return the best wall time over `repeat` runs and the peak traced memory of one run."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"time_s": min(times), "peak_mb": peak / 2**20}
+
+
+def hot_paths(nav_df) -> dict:
+    """Callables for every benchmarked hot path on one NAV history."""
+    simulator = MFSimulator(nav_df=nav_df)
+    dip_utils = DipFactorUtils(df=nav_df)
+    paths = {
+        f"simulate:{name}": (lambda params=params: simulator.run_simulation_from_params(params))
+        for name, params in PRESETS.items()
+    }
+    sweep_params = lambda name, drop: {k: v for k, v in PRESETS[name].items() if k not in ("frequency", drop)}
+    paths.update({
+        "simulator_init": lambda: MFSimulator(nav_df=nav_df),
+        "sweep_weekly": lambda: simulator.sweep_weekly(**sweep_params("weekly_default", "weekday")),
+        "sweep_monthly": lambda: simulator.sweep_monthly(**sweep_params("monthly_default", "date_of_investment")),
+        "dip_factor.compute_raw": lambda: dip_utils.compute_raw(30, 60),
+        "dip_factor.compute_raw_series": lambda: dip_utils.compute_raw_series(30, 60),
+        "compute_nav_metrics": lambda: [compute_nav_metrics(df=nav_df, lookback_days=d) for d in LOOKBACK_DAYS],
+    })
+    return paths
+
+
+def verify(nav_df) -> list:
+    """Compare `MFSimulator` against the reference loop for every preset.
+
+    Returns:
+        list[str]: Human readable mismatches (empty if everything matches).
+    """
+    simulator = MFSimulator(nav_df=nav_df)
+    mismatches = []
+    for name, params in PRESETS.items():
+        history, metrics = simulator.run_simulation_from_params(params)
+        ref_history, ref_metrics = reference.run_simulation_from_params(nav_df, params)
+        history = history.to_pandas() if hasattr(history, "to_pandas") else history
+
+        if len(history) != len(ref_history):
+            mismatches.append(f"{name}: {len(history)} investments, reference has {len(ref_history)}")
+            continue
+        if not np.array_equal(history["date"].to_numpy("datetime64[D]"), ref_history["date"].to_numpy("datetime64[D]")):
+            mismatches.append(f"{name}: investment dates differ")
+        for col in HISTORY_COLUMNS:
+            if not np.allclose(history[col].to_numpy(float), ref_history[col].to_numpy(float), rtol=1e-9, atol=1e-9):
+                mismatches.append(f"{name}: column '{col}' differs")
+        for key in METRIC_KEYS:
+            if not np.isclose(metrics[key], ref_metrics[key], rtol=1e-9, atol=1e-9):
+                mismatches.append(f"{name}: metric '{key}' {metrics[key]} != {ref_metrics[key]}")
+
+        # The sweep row for the preset's schedule must equal the single run
+        if params["frequency"] == "Weekly":
+            sweep = simulator.sweep_weekly(**{k: v for k, v in params.items() if k not in ("frequency", "weekday")})
+            row = sweep.set_index("weekday").loc[CONSTANTS.WEEKDAY_MAPPING[params["weekday"]]]
+        else:
+            sweep = simulator.sweep_monthly(**{k: v for k, v in params.items() if k not in ("frequency", "date_of_investment")})
+            row = sweep.iloc[params["date_of_investment"] - 1]
+        for key in METRIC_KEYS:
+            if not np.isclose(row[key], ref_metrics[key], rtol=1e-9, atol=1e-9):
+                mismatches.append(f"{name}: sweep metric '{key}' {row[key]} != {ref_metrics[key]}")
+    return mismatches
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return the keys whose time or peak memory exceeds the baseline by more than `threshold`."""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in ("time_s", "peak_mb"):
+            if base[metric] > 0 and current[metric] > base[metric] * (1 + threshold):
+                regressions.append(f"{key} {metric}: {base[metric]:.4f} -> {current[metric]:.4f}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="NAV history lengths (rows)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per hot path (best is kept)")
+    parser.add_argument("--only", nargs="+", help="substrings of hot path names to run")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON path")
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown / memory growth")
+    parser.add_argument("--no-verify", action="store_true", help="skip the reference comparison")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results, mismatches = {}, []
+    for size in args.sizes:
+        nav_df = generate_nav_history(size, seed=args.seed)
+
+        if not args.no_verify:
+            mismatches += [f"[{size}] {m}" for m in verify(nav_df)]
+
+        for name, fn in hot_paths(nav_df).items():
+            if args.only and not any(s in name for s in args.only):
+                continue
+            key = f"{name}@{size}"
+            results[key] = measure(fn, args.repeat)
+            print(f"{key:<45} {results[key]['time_s'] * 1000:>10.2f} ms {results[key]['peak_mb']:>9.2f} MB")
+
+    status = 0
+    if mismatches:
+        status = 1
+        print("\nResults differ from the reference implementation:")
+        print("\n".join(f"  {m}" for m in mismatches))
+
+    if args.save_baseline:
+        meta = {"python": sys.version.split()[0], "machine": platform.machine(), "created": time.strftime("%Y-%m-%d %H:%M:%S")}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            status = 1
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            print("\n".join(f"  {r}" for r in regressions))
+        else:
+            print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
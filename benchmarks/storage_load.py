@@ -0,0 +1,111 @@
+"""
+Load test of the user-data managers against the in-process GCS emulator.
+
+Simulates `--sessions` concurrent sessions, each repeating a page-like sequence of
+reads and writes (watchlist render, favourite/blacklist toggle, add investment and
+reload holdings, save simulation). Reports per-operation latency, storage requests by
+type and lost writes, once per `--cache-ttl` value, so the effect of caching and
+batching can be measured without network access or credentials.
+"""
+import argparse
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils import data_loader, gcs_client
+from utils.data_loader import (
+    BlacklistManager, FavouritesManager, GCSJSONManager, MyInvestmentsManager, SimulationManager
+)
+from utils.gcs_emulator import EmulatedBucket
+
+
+def run_session(session_id: int, iterations: int, latencies: dict) -> list:
+    """One session's workload; returns the investment ids it wrote."""
+    written = []
+
+    def timed(name, fn):
+        start = time.perf_counter()
+        result = fn()
+        latencies.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+        return result
+
+    for i in range(iterations):
+        scheme_code = str(100000 + (session_id * iterations + i) % 50)
+        timed("watchlist_render", lambda: (FavouritesManager().load_data(), BlacklistManager().load_data()))
+        timed("add_favourite", lambda: FavouritesManager().add_favourite(scheme_code, f"Scheme {scheme_code}"))
+        timed("add_blacklist", lambda: BlacklistManager().add_blacklist(scheme_code, f"Scheme {scheme_code}"))
+
+        investment = {
+            "investment_id": str(uuid.uuid4()), "scheme_code": scheme_code, "scheme_name": f"Scheme {scheme_code}",
+            "amount_invested": 1000, "units_bought": 10.0, "nav": 100.0, "nav_date": "2025-01-01",
+            "date_of_transaction": "2025-01-01",
+        }
+        timed("add_investment", lambda: MyInvestmentsManager().add_investment(investment))
+        written.append(investment["investment_id"])
+
+        def investments_page():
+            manager = MyInvestmentsManager()
+            return manager.load_data(), manager.load_holdings()
+        timed("investments_render", investments_page)
+        timed("save_simulation", lambda: SimulationManager().save_simulation({"id": f"{session_id}-{i}", "weeks": 150}))
+    return written
+
+
+def run_scenario(sessions: int, iterations: int, latency_ms: float, jitter_ms: float, cache_ttl: float) -> dict:
+    bucket = EmulatedBucket(GCSJSONManager.BUCKET_NAME, latency_ms=latency_ms, jitter_ms=jitter_ms)
+    gcs_client.set_bucket_factory(lambda name: bucket)
+    data_loader.clear_caches()
+    GCSJSONManager.CACHE_TTL_SECONDS = cache_ttl
+
+    latencies = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        written = [
+            txn_id
+            for ids in pool.map(lambda s: run_session(s, iterations, latencies), range(sessions))
+            for txn_id in ids
+        ]
+    wall_s = time.perf_counter() - start
+
+    data_loader.clear_caches()
+    stored = {d["investment_id"] for d in MyInvestmentsManager().load_data()}
+    held = {txn_id for h in data_loader.HoldingsManager().load_data() for txn_id in h["transaction_ids"]}
+    return {
+        "wall_s": wall_s,
+        "latencies": {name: np.percentile(values, [50, 95]) for name, values in latencies.items()},
+        "requests": bucket.request_counts(),
+        "lost_investments": len(set(written) - stored),
+        "lost_holdings": len(set(written) - held),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=10, help="workload repetitions per session")
+    parser.add_argument("--latency-ms", type=float, default=30.0, help="emulated latency per storage request")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="uniform extra latency per request")
+    parser.add_argument("--cache-ttl", type=float, nargs="+", default=[0.0, 5.0], help="read cache TTLs (s) to compare")
+    args = parser.parse_args(argv)
+
+    status = 0
+    try:
+        for ttl in args.cache_ttl:
+            result = run_scenario(args.sessions, args.iterations, args.latency_ms, args.jitter_ms, ttl)
+            print(f"\ncache TTL {ttl:g}s | {args.sessions} sessions x {args.iterations} iterations | wall {result['wall_s']:.2f} s")
+            for name, (p50, p95) in result["latencies"].items():
+                print(f"  {name:<22} p50 {p50:>8.1f} ms   p95 {p95:>8.1f} ms")
+            print("  requests: " + ", ".join(f"{op}={n}" for op, n in sorted(result["requests"].items())))
+            print(f"  lost writes: investments={result['lost_investments']} holdings={result['lost_holdings']}")
+            if result["lost_investments"] or result["lost_holdings"]:
+                status = 1
+    finally:
+        gcs_client.set_bucket_factory(None)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+
+def generate_nav_history(
+    n_days: int,
+    seed: int = 0,
+    holiday_rate: float = 0.03,
+    gap_count: int = 3,
+    max_gap_days: int = 20,
+    end_date: str = "2025-09-30",
+    start_nav: float = 10.0,
+) -> pd.DataFrame:
+    """
+    Generate a synthetic NAV history shaped like `MFScheme.get_nav_data()`.
+
+    NAVs follow a geometric random walk on business days. Random business days are removed
+    as holidays and a few longer stretches are removed as data gaps, so schedule resolution
+    and trailing windows see the same irregularities as real AMFI data.
+
+    Args:
+        n_days: Number of NAV rows to return.
+        seed: Random seed; the same arguments always produce the same history.
+        holiday_rate: Probability that a business day is a holiday (no NAV).
+        gap_count: Number of multi-day gaps with no NAV.
+        max_gap_days: Maximum length (in business days) of a gap.
+        end_date: Date of the latest NAV.
+        start_nav: NAV of the first row.
+
+    Returns:
+        pd.DataFrame: Columns ['date', 'nav', 'day', 'month', 'year'], latest date first
+        (the order `MFScheme` returns).
+    """
+    rng = np.random.default_rng(seed)
+
+    # Over-generate business days, then drop holidays and gaps
+    n_candidates = int(n_days / (1 - holiday_rate)) + gap_count * max_gap_days + 10
+    dates = pd.bdate_range(end=end_date, periods=n_candidates)
+    keep = rng.random(n_candidates) >= holiday_rate
+    for start in rng.integers(0, n_candidates - max_gap_days, size=gap_count):
+        keep[start:start + rng.integers(5, max_gap_days + 1)] = False
+    keep[-1] = True
+    dates = dates[keep][-n_days:]
+
+    returns = rng.normal(loc=0.0004, scale=0.011, size=len(dates))
+    nav = np.round(start_nav * np.exp(np.cumsum(returns)), 4)
+
+    df = pd.DataFrame({"date": dates, "nav": nav})
+    df = df.assign(
+        day=df["date"].dt.day_name(),
+        month=df["date"].dt.month_name(),
+        year=df["date"].dt.year
+    )
+    return df.iloc[::-1].reset_index(drop=True)
@@ -20,6 +20,7 @@ LUMPSUM_PER_WEEK = 5000
 SIP_AMOUNT_WEEKLY = 1000
 WEEKS = 150
 WEEKDAY = 4  # Friday
+HOLIDAY_POLICY_WEEKLY = "skip"  # skip weeks where the weekday has no NAV
 
 
 #MONTHLY SPECIFIC CONSTANTS
@@ -27,4 +28,10 @@ CARRY_FORWARD_MONTHLY = False
 LUMPSUM_PER_MONTH = 20000
 SIP_AMOUNT_MONTHLY = 20000
 MONTHS = 24
-DATE_OF_INVESTMENT = 5
\ No newline at end of file
+DATE_OF_INVESTMENT = 5
+HOLIDAY_POLICY_MONTHLY = "previous"  # use the last NAV on or before the date
+
+HOLIDAY_POLICIES = ["previous", "next", "skip"]
+
+#TAX LOTS
+LONG_TERM_HOLDING_DAYS = 365  # gains on units held longer than this are long term
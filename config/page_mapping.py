@@ -5,5 +5,6 @@ PAGE_MAPPING = {
     "SIMULATE_STRATEGY" : "pages/simulations/simulate_strategy.py",
     "SAVED_SIMULATIONS" : "pages/simulations/saved_simulations.py",
     "MY_INVESTMENTS" : "pages/investments/my_investments.py",
-    "ADD_DELETE_INVESTMENTS" : "pages/investments/add_or_delete_investment.py"
+    "ADD_DELETE_INVESTMENTS" : "pages/investments/add_or_delete_investment.py",
+    "CACHE_STATUS" : "pages/cache_status.py"
 }
@@ -6,3 +6,19 @@ FAV_FILE_PATH = "favourites.json"
 BLACKLIST_FILE_PATH = "blacklist.json"
 SAVED_SIMULATIONS_FILE_PATH = "saved_simulations.json"
 MY_INVESTMENTS_FILE_PATH = "my_investments.json"
+MY_HOLDINGS_FILE_PATH = "my_holdings.json"
+
+# Storage backend for user data: "gcs" (default) or "sqlite" (self-hosted / local testing)
+STORAGE_BACKEND = os.environ.get("MF_STORAGE_BACKEND", "gcs")
+SQLITE_DB_PATH = os.environ.get("MF_SQLITE_DB_PATH", os.path.join(BASE_DIR, "data", "mf_analytics.db"))
+
+# Format of JSON objects written to GCS: "json-gzip" (minified + gzip) or "json" (indented, legacy).
+# Both formats are always readable.
+STORAGE_FORMAT = os.environ.get("MF_STORAGE_FORMAT", "json-gzip")
+
+# Daily NAV publication (AMFI): the cache warmer refreshes user schemes after this time.
+NAV_PUBLISH_TIME = os.environ.get("MF_NAV_PUBLISH_TIME", "23:30")  # HH:MM in NAV_PUBLISH_TIMEZONE
+NAV_PUBLISH_TIMEZONE = "Asia/Kolkata"
+CACHE_WARMER_ENABLED = os.environ.get("MF_CACHE_WARMER", "1").lower() not in ("0", "false", "no")
+# Last NAV publication the warmer completed (survives restarts; a process started after it skips the start-up run)
+CACHE_WARMER_STATE_PATH = os.environ.get("MF_CACHE_WARMER_STATE_PATH", os.path.join(BASE_DIR, "data", "cache_warmer.json"))
@@ -1,19 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+import requests
 from mftool import Mftool
+from utils import caching, tracing
+
+
+# Cached fetches shared by every client (the Mftool instance is not part of the key)
+@caching.cache_data("mf_registry", ttl=caching.REGISTRY_TTL_SECONDS)
+def _scheme_codes(_mftool):
+    return _mftool.get_scheme_codes()
+
+
+@caching.cache_data("mf_registry", ttl=caching.REGISTRY_TTL_SECONDS, max_entries=512)
+def _scheme_details(scheme_code, _mftool):
+    return _mftool.get_scheme_details(scheme_code)
+
+
+@caching.cache_data("mf_nav", ttl=caching.QUOTE_TTL_SECONDS, max_entries=512)
+def _scheme_quote(scheme_code, _mftool):
+    return _mftool.get_scheme_quote(scheme_code)
+
+
+@caching.cache_data("mf_nav", ttl=caching.NAV_TTL_SECONDS, max_entries=128)
+def _historical_nav(scheme_code, _mftool):
+    return _mftool.get_scheme_historical_nav(scheme_code, as_Dataframe=False)["data"]
+
+
+@caching.cache_data("mf_nav", ttl=caching.QUOTE_TTL_SECONDS, max_entries=1)
+def _latest_nav_file(url):
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    return response.text
+
 
 class MFClient:
-    """Wrapper around Mftool with cleaner methods."""
+    """Wrapper around Mftool with cleaner methods.
+
+    Responses are cached process-wide (see `utils.caching` for the TTLs).
+    `caching.invalidate("mf_nav")` drops the NAV data, e.g. after the daily publication.
+    """
+
+    # AMFI file with the latest NAV of every scheme (the source of `get_scheme_quote`)
+    LATEST_NAV_URL = "https://www.amfiindia.com/spages/NAVAll.txt"
 
     def __init__(self):
         self.client = Mftool()
 
+    @tracing.traced("mf_client.get_scheme_codes")
     def get_scheme_codes(self):
-        return self.client.get_scheme_codes()
+        return _scheme_codes(self.client)
 
+    @tracing.traced("mf_client.get_scheme_details")
     def get_scheme_details(self, scheme_code):
-        return self.client.get_scheme_details(scheme_code)
+        return _scheme_details(scheme_code, self.client)
 
+    @tracing.traced("mf_client.get_scheme_quote")
     def get_scheme_quote(self, scheme_code):
-        return self.client.get_scheme_quote(scheme_code)
+        return _scheme_quote(scheme_code, self.client)
+
+    @tracing.traced("mf_client.get_scheme_quotes")
+    def get_scheme_quotes(self, scheme_codes=None):
+        """Latest quotes for many schemes from a single download of the AMFI NAV file.
 
+        Args:
+            scheme_codes (Iterable[str], optional): Codes to return. All schemes if None.
+
+        Returns:
+            dict: scheme_code -> quote dict with the same keys as `get_scheme_quote`
+            ('scheme_code', 'scheme_name', 'nav', 'last_updated'). Codes missing from
+            the file are absent from the result.
+        """
+        wanted = None if scheme_codes is None else {str(code) for code in scheme_codes}
+        quotes = {}
+        for line in _latest_nav_file(self.LATEST_NAV_URL).splitlines():
+            fields = line.split(";")
+            if len(fields) < 6 or not fields[0].strip().isdigit():
+                continue
+            code = fields[0].strip()
+            if wanted is not None and code not in wanted:
+                continue
+            # NAV and date are always the last two columns of a scheme row
+            quotes[code] = {
+                "scheme_code": code,
+                "scheme_name": fields[3].strip(),
+                "nav": fields[-2].strip(),
+                "last_updated": fields[-1].strip(),
+            }
+        return quotes
+
+    @tracing.traced("mf_client.get_historical_nav")
     def get_historical_nav(self, scheme_code):
-        return self.client.get_scheme_historical_nav(scheme_code, as_Dataframe=False)["data"]
+        return _historical_nav(scheme_code, self.client)
+
+    @tracing.traced("mf_client.get_historical_navs")
+    def get_historical_navs(self, scheme_codes, max_workers=8):
+        """Fetch the NAV history of several schemes concurrently.
+
+        Returns:
+            dict: scheme_code -> list of {'date', 'nav'} records (as `get_historical_nav`).
+        """
+        scheme_codes = list(dict.fromkeys(str(code) for code in scheme_codes))
+        if not scheme_codes:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(scheme_codes))) as executor:
+            return dict(zip(scheme_codes, executor.map(self.get_historical_nav, scheme_codes)))
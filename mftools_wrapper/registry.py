@@ -1,6 +1,18 @@
 import pandas as pd
+from utils import caching
 from .client import MFClient
 
+
+@caching.cache_data("mf_registry", ttl=caching.REGISTRY_TTL_SECONDS)
+def _scheme_codes_frame(_client: MFClient) -> pd.DataFrame:
+    return (
+        pd.DataFrame.from_dict(_client.get_scheme_codes(), orient="index", columns=["Name"])
+        .reset_index()
+        .rename(columns={"index": "scheme_code", "Name": "scheme_name"})
+        .iloc[1:]
+    )
+
+
 class MFRegistry:
     """Manages all mutual fund schemes metadata."""
 
@@ -9,13 +21,7 @@ class MFRegistry:
         self.scheme_codes = self._load_scheme_codes()
 
     def _load_scheme_codes(self):
-        scheme_codes = self.client.get_scheme_codes()
-        return (
-            pd.DataFrame.from_dict(scheme_codes, orient="index", columns=["Name"])
-            .reset_index()
-            .rename(columns={"index": "scheme_code", "Name": "scheme_name"})
-            .iloc[1:]
-        )
+        return _scheme_codes_frame(self.client)
 
     def get_scheme_codes(self):
         return self.scheme_codes
@@ -1,7 +1,30 @@
 import pandas as pd
 from datetime import datetime
+from utils import caching
 from .client import MFClient
 
+
+@caching.cache_data("mf_nav", ttl=caching.NAV_TTL_SECONDS, max_entries=64)
+def _nav_frame(scheme_code, current_date, current_nav, _client: MFClient) -> pd.DataFrame:
+    """Processed NAV history; keyed on the latest quote, so a new NAV builds a new frame."""
+    df = pd.DataFrame(_client.get_historical_nav(scheme_code))
+    df["date"] = pd.to_datetime(df["date"], format="%d-%m-%Y")
+    df["nav"] = df["nav"].astype(float)
+
+    if df["date"].max() != current_date:
+        new_row = pd.Series({
+            "date": current_date,
+            "nav": float(current_nav)
+        })
+        df = pd.concat([new_row.to_frame().T, df], ignore_index=True)
+
+    df["date"] = pd.to_datetime(df["date"], dayfirst=True, errors="coerce", format="%Y-%m-%d")
+    return df.assign(
+        day=df["date"].dt.day_name(),
+        month=df["date"].dt.month_name(),
+        year=df["date"].dt.year
+    )
+
 class MFScheme:
     """
     Represents a single mutual fund scheme and provides methods to access its 
@@ -17,6 +40,10 @@ class MFScheme:
         scheme_code (str): Unique identifier for the mutual fund scheme.
         eager (bool, optional): If True (default), fetch scheme details and NAV data on initialization.
 
+    Network responses and the processed NAV frame come from the process-wide caches of
+    `utils.caching` (namespace "mf_nav"), so constructing an `MFScheme` on every rerun is
+    cheap; `refresh` re-reads through those caches.
+
     Public Methods:
         get_details() -> dict
             Returns scheme metadata including current NAV.
@@ -51,27 +78,12 @@ class MFScheme:
 
     def _load_nav_data(self):
         """Return NAV data (historical + latest) for this scheme."""
-        df = pd.DataFrame(self.client.get_historical_nav(self.scheme_code))
-        df["date"] = pd.to_datetime(df["date"], format="%d-%m-%Y")
-        df["nav"] = df["nav"].astype(float)
-
         if self._details is None:
             self._load_details()
-            
-        if df["date"].max() != self._details["current_date"]:
-            new_row = pd.Series({
-                "date": self._details["current_date"],
-                "nav": float(self._details["current_nav"])
-            })
-            df = pd.concat([new_row.to_frame().T, df], ignore_index=True)
-
-        df["date"] = pd.to_datetime(df["date"], dayfirst=True, errors="coerce", format="%Y-%m-%d")
-        df = df.assign(
-            day=df["date"].dt.day_name(),
-            month=df["date"].dt.month_name(),
-            year=df["date"].dt.year
-        )
 
+        df = _nav_frame(
+            self.scheme_code, self._details["current_date"], self._details["current_nav"], self.client
+        )
         self._df = df
         return df
 
@@ -0,0 +1,59 @@
+import streamlit as st
+import pandas as pd
+
+from utils import cache_warmer, caching
+from streamlit_components.dataframe import show_dataframe
+
+STATE_ICONS = {"warm": "🟢 warm", "warming": "🔄 warming", "stale": "🟡 stale", "error": "🔴 error"}
+
+
+@st.fragment(run_every=5)
+def show_scheme_status():
+    st.subheader("Schemes")
+    rows = cache_warmer.status()
+    if not rows:
+        st.info("No favourites, holdings or saved simulations to warm.")
+        return
+    status_df = pd.DataFrame(rows)
+    counts = status_df["state"].value_counts()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(label="🟢 Warm", value=int(counts.get("warm", 0)))
+    col2.metric(label="🟡 Stale", value=int(counts.get("stale", 0)))
+    col3.metric(label="🔄 Warming", value=int(counts.get("warming", 0)))
+    col4.metric(label="🔴 Errors", value=int(counts.get("error", 0)))
+    show_dataframe(status_df.assign(state=status_df["state"].map(STATE_ICONS)))
+
+
+def show_runs():
+    st.subheader("Runs")
+    st.caption(
+        f"Latest NAV publication: {cache_warmer.last_publication():%Y-%m-%d %H:%M %Z} · "
+        f"{'running now' if cache_warmer.is_running() else 'idle'}"
+    )
+    if st.button("Warm caches now"):
+        if cache_warmer.trigger():
+            st.success("Cache warm-up started.")
+        else:
+            st.info("A cache warm-up is already running.")
+    runs = cache_warmer.runs()
+    if runs:
+        show_dataframe(pd.DataFrame(runs[::-1]))
+
+
+def main():
+    if not cache_warmer.start():
+        st.warning("The cache warmer is disabled (MF_CACHE_WARMER=0).")
+    show_runs()
+    st.divider()
+    show_scheme_status()
+
+    st.divider()
+    with st.expander("Cache namespaces"):
+        st.json(caching.namespaces())
+        namespace = st.selectbox("Namespace", sorted(caching.namespaces()))
+        if st.button("Invalidate"):
+            st.success(f"Cleared {caching.invalidate(namespace)} cache(s) in '{namespace}'.")
+
+
+if __name__ == "__main__":
+    main()
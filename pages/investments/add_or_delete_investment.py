@@ -2,9 +2,11 @@ import time
 import streamlit as st
 from utils.data_loader import MyInvestmentsManager
 from mftools_wrapper import MFScheme
+from src.tax_lots import redeemable_units
 import pandas as pd
 from streamlit_components.groww_link_manager import GrowwLinkManager
 from streamlit_components.dataframe import show_dataframe
+from streamlit_components.paged_table import show_paged_table
 
 def show_delete_investment_tab():
     invest_manager = MyInvestmentsManager()
@@ -14,11 +16,15 @@ def show_delete_investment_tab():
         st.write("No investments found.")
         return
 
-    show_dataframe(all_investments)
+    show_paged_table(all_investments, key="delete_investment_table")
 
     investment_to_delete = st.selectbox("Select Investment to Delete", options=all_investments["investment_id"])
     if st.button("Delete Investment"):
-        invest_manager.remove_investment(investment_to_delete)
+        try:
+            invest_manager.remove_investment(investment_to_delete)
+        except ValueError as exc:  # a later redemption would exceed the units left
+            st.error(str(exc))
+            return
         st.success("Investment deleted successfully!")
         time.sleep(1)
         st.rerun()
@@ -77,11 +83,80 @@ def show_add_investment_tab():
         st.success("Investment added successfully!")
 
 
+def show_redeem_units_tab():
+    st.subheader("Redeem Units")
+
+    if 'selected_scheme_code' not in st.session_state:
+        st.info("Please select a scheme first.")
+        return
+
+    scheme_name = st.session_state['selected_scheme_name']
+    scheme_code = st.session_state['selected_scheme_code']
+    st.write(f"{scheme_name} | {scheme_code}")
+
+    invest_manager = MyInvestmentsManager()
+    scheme_investments = [
+        inv for inv in invest_manager.load_data() if str(inv["scheme_code"]) == str(scheme_code)
+    ]
+    if round(sum(float(inv["units_bought"]) for inv in scheme_investments), 3) <= 0:
+        st.info("No units held in this scheme.")
+        return
+
+    mf_scheme_obj = MFScheme(scheme_code=scheme_code)
+    default_date = mf_scheme_obj.get_details()["current_date"]
+
+    col1, col2 = st.columns(2)
+    with col2:
+        date_of_transaction = st.date_input("Date of Transaction", value=default_date)
+        nav_date = st.date_input("NAV Date", value=default_date)
+    nav_actual_date, nav = mf_scheme_obj.get_nav_on_date(nav_date)
+
+    # Units held on the NAV date, less what later redemptions still need
+    units_held = round(redeemable_units(scheme_investments, nav_actual_date), 3)
+    if units_held <= 0:
+        st.info(f"No units can be redeemed on {nav_actual_date}.")
+        return
+    with col1:
+        units_redeemed = st.number_input("Units Redeemed", 0.0, units_held, units_held, 1.0, format="%.3f")
+        exit_load = st.number_input("Exit Load (%)", 0.0, 5.0, 0.0, 0.5)
+
+    amount_redeemed = round(units_redeemed * nav * (100 - exit_load) / 100, 4)
+
+    if nav_date != nav_actual_date:
+        st.warning(f"Selected NAV date {nav_date} does not match actual NAV date {nav_actual_date}. Using actual NAV date for calculations.")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(label="Units Held", value=units_held)
+    col2.metric(label="Units Redeemed", value=units_redeemed)
+    col3.metric(label=f"📅 NAV as on {nav_actual_date}", value=f"₹{nav:,.4f}")
+    col4.metric(label="💰 Amount Redeemed", value=f"₹{amount_redeemed:,.4f}")
+
+    redemption_params = {
+        "scheme_code": scheme_code,
+        "scheme_name": scheme_name,
+        "amount_invested": amount_redeemed,
+        "units_bought": units_redeemed,
+        "nav": nav,
+        "nav_date": nav_actual_date.strftime("%Y-%m-%d"),
+        "date_of_transaction": date_of_transaction.strftime("%Y-%m-%d"),
+    }
+
+    if st.button("Redeem Units", disabled=units_redeemed <= 0):
+        try:
+            invest_manager.add_redemption(redemption_params)
+        except ValueError as exc:
+            st.error(str(exc))
+            return
+        st.success("Redemption added successfully!")
+
+
 def main():
-    add_or_delete = st.radio("Choose an action:", ["Add Investment", "Delete Investment"], index=0)
+    add_or_delete = st.radio("Choose an action:", ["Add Investment", "Redeem Units", "Delete Investment"], index=0)
     st.divider()
     if add_or_delete == "Delete Investment":
         show_delete_investment_tab()
+    elif add_or_delete == "Redeem Units":
+        show_redeem_units_tab()
     else:
         show_add_investment_tab()
 
@@ -3,47 +3,64 @@ import pandas as pd
 
 from utils.data_loader import MyInvestmentsManager
 from streamlit_components.dataframe import show_dataframe
-from mftools_wrapper import MFScheme
+from streamlit_components.line_chart_plotter import LineChartPlotter
+from src.portfolio import PortfolioValuation
+from src.portfolio_timeseries import PortfolioHistory
+
+
+def show_portfolio_history(all_investments: pd.DataFrame, valuation: PortfolioValuation):
+    st.divider()
+    st.subheader("Portfolio Value History")
+
+    # Built once per day and session, then only updated with added/removed transactions;
+    # a single key holding the build date, so earlier days' histories are dropped
+    today = pd.Timestamp.today().normalize()
+    cached = st.session_state.get("portfolio_history")
+    if cached is None or cached["date"] != today:
+        history = PortfolioHistory(all_investments, nav_histories=valuation.nav_histories())
+        st.session_state["portfolio_history"] = {"date": today, "history": history}
+    else:
+        history = cached["history"]
+        history.sync(all_investments)  # added, removed and edited transactions
+
+    plotter = LineChartPlotter(history.to_frame())
+    plotter.plot(
+        value_cols=["portfolio_value", "invested"]
+    )
+    st.caption("Invested: FIFO cost of the units held (redemptions remove the cost of the units sold)")
+    st.caption("Drawdown from peak portfolio value (%)")
+    plotter.plot(
+        value_cols=["drawdown"]
+    )
+
 
 def show_all_investments(invest_manager_obj : MyInvestmentsManager):
-    all_investments = pd.DataFrame(invest_manager_obj.load_data())
+    transactions = invest_manager_obj.load_data()
+    all_investments = pd.DataFrame(transactions)
     if all_investments.empty:
         st.info("No investments found.")
         return
-    df = (
-        all_investments
-        .groupby(["scheme_code", "scheme_name"])
-        .agg({
-            "amount_invested": "sum",
-            "units_bought" : "sum"
-        })
-        .reset_index()
-    )
+
+    # Materialized per-scheme aggregate + one batch of latest quotes values every holding
+    holdings = invest_manager_obj.load_holdings(transactions)
+    valuation = PortfolioValuation(all_investments, holdings=holdings)
+    df = valuation.holdings()
     show_dataframe(df)
 
     # ---------------------------------------------
     st.divider()
     st.subheader("Overall Investment Performance")
-    all_metrics = {
-        "total_invested" : 0,
-        "current_value" : 0,
-    }
-    for index, row in df.iterrows():
-        latest_nav = MFScheme(row['scheme_code']).get_details()['current_nav']
-        all_metrics['total_invested'] += row['amount_invested']
-        all_metrics['current_value'] += row['units_bought'] * latest_nav
-
-    all_metrics['profit'] = all_metrics['current_value'] - all_metrics['total_invested']
-    all_metrics['roi'] = (all_metrics['profit'] / all_metrics['total_invested'] * 100) if all_metrics['total_invested'] != 0 else 0
-
-    
+    all_metrics = valuation.totals()
     
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3, col4, col5 = st.columns(5)
 
     col1.metric(label="💰 Total Invested", value=f"₹{all_metrics['total_invested']:,.2f}")
-    col2.metric(label="📈 Current Value", value=f"₹{all_metrics['current_value']:,.2f}")
+    col2.metric(label="📈 Current Value", value=f"₹{all_metrics['final_value']:,.2f}")
     col3.metric(label="💸 Profit", value=f"₹{all_metrics['profit']:,.2f}")
     col4.metric(label="📉 ROI", value=f"{all_metrics['roi']:.2f}%")
+    col5.metric(label="📊 XIRR", value=f"{all_metrics['xirr']:.2f}%")
+
+    show_portfolio_history(all_investments, valuation)
 
 def main():
     invest_manager = MyInvestmentsManager()
@@ -1,10 +1,15 @@
 import streamlit as st
 import pandas as pd
 
+from config.settings import MY_INVESTMENTS_FILE_PATH
+from utils import caching
 from utils.data_loader import MyInvestmentsManager
 from streamlit_components.dataframe import show_dataframe
+from streamlit_components.paged_table import show_paged_table
 from streamlit_components.line_chart_plotter import LineChartPlotter
-from src.investment_metrics import merge_investment_with_nav, get_investment_metrics
+from src.investment_metrics import merge_investment_with_nav
+from src.portfolio import PortfolioValuation
+from src.tax_lots import TaxLotEngine
 from plotly import graph_objects as go
 from plotly.subplots import make_subplots
 from streamlit_components.metrics import show_investment_metrics
@@ -79,39 +84,105 @@ def show_plots(main_df, scheme_code):
     elif plot_type == "Custom":
         custom_plot(main_df)
 
-def show_scheme_wise_investments(scheme_code, invest_manager_obj : MyInvestmentsManager):
-    all_investments = pd.DataFrame(invest_manager_obj.load_data())
-    scheme_investments = all_investments[all_investments['scheme_code'] == scheme_code]
-
+def show_tax_lots(scheme_code, tax_lots: TaxLotEngine):
+    scheme_code = str(scheme_code)
+    lots = tax_lots.lots()
+    lots = lots[lots["scheme_code"] == scheme_code]
+    realized = tax_lots.realized()
+    realized = realized[realized["scheme_code"] == scheme_code]
+
+    with st.expander("Tax Lots (FIFO)"):
+        summary = tax_lots.summary()
+        summary = summary[summary["scheme_code"] == scheme_code].set_index("term")
+        gains = summary.reindex(["short_term", "long_term"]).fillna(0.0)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric(label="✅ Realized Short Term", value=f"₹{gains.at['short_term', 'realized_gain']:,.2f}")
+        col2.metric(label="⏳ Unrealized Short Term", value=f"₹{gains.at['short_term', 'unrealized_gain']:,.2f}")
+        col3.metric(label="✅ Realized Long Term", value=f"₹{gains.at['long_term', 'realized_gain']:,.2f}")
+        col4.metric(label="⏳ Unrealized Long Term", value=f"₹{gains.at['long_term', 'unrealized_gain']:,.2f}")
+
+        st.write("Open Lots")
+        show_dataframe(lots[lots["units_remaining"] > 0].drop(columns=["scheme_code", "scheme_name"]))
+        if not realized.empty:
+            st.write("Realized Gains")
+            show_dataframe(realized.drop(columns=["scheme_code"]))
+
+
+def show_scheme_wise_investments(
+        scheme_code,
+        scheme_investments: pd.DataFrame,
+        valuation: PortfolioValuation,
+        nav_df: pd.DataFrame = None,
+        tax_lots: TaxLotEngine = None):
     if scheme_investments.empty:
         st.write("No investments found for this scheme.")
         return
     
-    main_df = merge_investment_with_nav(scheme_investments, scheme_code)
+    main_df = merge_investment_with_nav(scheme_investments, scheme_code, nav_df=nav_df)
     show_plots(main_df, scheme_code)
 
     st.divider()
-    metrics = get_investment_metrics(scheme_code, scheme_investments)
+    metrics = valuation.metrics_for(scheme_code)
     show_investment_metrics(metrics)
 
+    if tax_lots is not None:
+        show_tax_lots(scheme_code, tax_lots)
+
+
+@caching.cache_resource((MY_INVESTMENTS_FILE_PATH, "mf_nav"), ttl=caching.QUOTE_TTL_SECONDS, max_entries=4)
+def load_portfolio(transactions: list, holdings: list):
+    """Valuation, NAV histories and FIFO lots of the portfolio (read-only, shared).
+
+    Dropped when an investment is written (the manager invalidates its namespace) or the
+    quotes expire, so widget reruns reuse them without any network call.
+    """
+    all_investments = pd.DataFrame(transactions)
+    # Latest quotes in one batch, NAV histories fetched concurrently
+    valuation = PortfolioValuation(all_investments, holdings=holdings)
+    nav_histories = valuation.nav_histories()
+
+    # FIFO lots of every scheme in one pass, valued at the same quotes
+    valued = valuation.holdings()
+    try:
+        tax_lots = TaxLotEngine(all_investments, current_navs=dict(zip(valued["scheme_code"], valued["latest_nav"])))
+    except ValueError:  # oversold history (stored before redemptions were validated)
+        tax_lots = None
+    return valuation, nav_histories, tax_lots
+
 
 def show_all_investments(invest_manager_obj : MyInvestmentsManager):
     st.subheader("My Investments")
-    all_investments = pd.DataFrame(invest_manager_obj.load_data())
+    transactions = invest_manager_obj.load_data()
+    all_investments = pd.DataFrame(transactions)
     if all_investments.empty:
         st.info("No investments found.")
         return
 
-    show_dataframe(all_investments)
+    show_paged_table(all_investments, key="my_investments_table")
 
-    tabs = st.tabs([f"{code}" for code in all_investments['scheme_code'].unique()])
-    for i, scheme_code in enumerate(all_investments['scheme_code'].unique()):
-        scheme_name = all_investments[all_investments['scheme_code'] == scheme_code]['scheme_name'].iloc[0]
-        with tabs[i]:
+    holdings = invest_manager_obj.load_holdings(transactions)
+    if not holdings:
+        st.info("No holdings found.")
+        return
+    valuation, nav_histories, tax_lots = load_portfolio(transactions, holdings)
+
+    # Tabs and per-scheme transactions come from the materialized holdings
+    investments_by_id = all_investments.set_index('investment_id', drop=False)
+    tabs = st.tabs([f"{holding['scheme_code']}" for holding in holdings])
+    for tab, holding in zip(tabs, holdings):
+        scheme_code, scheme_name = holding['scheme_code'], holding['scheme_name']
+        scheme_investments = investments_by_id[investments_by_id.index.isin(holding['transaction_ids'])].reset_index(drop=True)
+        with tab:
             st.subheader(f"{scheme_name} | {scheme_code}")
             GrowwLinkManager().add_groww_link(scheme_name=scheme_name)
 
-            show_scheme_wise_investments(scheme_code, invest_manager_obj)
+            show_scheme_wise_investments(
+                scheme_code,
+                scheme_investments,
+                valuation,
+                nav_df=nav_histories.get(str(scheme_code)),
+                tax_lots=tax_lots
+            )
 
 
 def main():
@@ -1,10 +1,12 @@
 import streamlit as st
 import pandas as pd
 from mftools_wrapper import MFScheme
-from streamlit_components.line_chart_plotter import LineChartPlotter
 from streamlit_components.dataframe import show_dataframe
+from streamlit_components.paged_table import show_paged_table
 from streamlit_components.plots import render_nav_chart
-from src.nav_metrics import compute_nav_metrics
+from streamlit_components.chart_data import render_cached_chart
+from streamlit_components.lazy_tabs import render_lazy_tabs
+from src.nav_metrics import nav_metrics_table
 from streamlit_components.groww_link_manager import GrowwLinkManager
 from streamlit_components.buttons import add_both_favourites_and_blacklist_buttons
 from config.page_mapping import PAGE_MAPPING
@@ -38,40 +40,34 @@ def main():
     st.divider()
     # Complete NAV Data
     st.subheader("Complete NAV Data")
-    show_dataframe(df)
+    show_paged_table(df, key=f"nav_table_{scheme_code}")
 
     st.divider()
     # NAV Plots
     # st.subheader("NAV Plots")
     chart_days = [7, 30, 60, 90, 180, 365]
-    tab_labels = [f"Last {days} days" for days in chart_days] + ["Complete NAV Plot"]
-    tabs = st.tabs(tab_labels)
-    for tab, days in zip(tabs[:-1], chart_days):  # All tabs except last one
-        with tab:
-            render_nav_chart(
-                df=df,
-                days=days
-            )
-    # Last tab for complete NAV plot
-    with tabs[-1]:
+    # Only the selected chart is built on a rerun; the others when first viewed (cached)
+    panels = {
+        f"Last {days} days": (lambda days=days: render_nav_chart(df=df, days=days, scheme_code=scheme_code))
+        for days in chart_days
+    }
+
+    def show_complete_nav_plot():
         st.subheader("Complete NAV Plot")
-        line_chart_plotter = LineChartPlotter(df)
-        line_chart_plotter.plot(
-            value_cols=["Nav"]
+        render_cached_chart(
+            scheme_code,
+            df,
+            value_cols=["Nav"],
+            zoom_key=f"complete_nav_zoom_{scheme_code}"
         )
+    panels["Complete NAV Plot"] = show_complete_nav_plot
+    render_lazy_tabs(panels, key=f"nav_chart_tab_{scheme_code}")
 
     # Drop Metrics
     st.divider()
     st.subheader("Drop Metrics")
-    lookback_days = [7, 30, 60, 90, 180, 365]
-    metrics_df = (
-        pd.DataFrame(
-            [compute_nav_metrics(
-                df=df, 
-                lookback_days=days) 
-            for days in lookback_days]
-        )
-    )
+    lookback_days = (7, 30, 60, 90, 180, 365)
+    metrics_df = nav_metrics_table(df, lookback_days)
     today_nav = metrics_df["today_nav"][0]
     metrics_df.drop(columns=["today_nav"], inplace=True)
     metrics_df.columns = metrics_df.columns.str.replace('_', ' ').str.title()
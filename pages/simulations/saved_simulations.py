@@ -5,8 +5,8 @@ import time
 import config.constants as CONSTANTS
 from utils.data_loader import SimulationManager
 from src.mf_simulator import MFSimulator
-from src.dip_factor import DipFactorUtils
-from src.nav_metrics import compute_nav_metrics
+from src.dip_factor import dip_factor_for_frequency
+from src.nav_metrics import nav_metrics_table
 from mftools_wrapper import MFScheme
 from streamlit_components.metrics import show_simulation_metrics
 from streamlit_components.dataframe import show_dataframe
@@ -20,27 +20,16 @@ def show_dip_factor_section(params):
     
     st.subheader(f"NAV Metrics")
     st.caption(f"{frequency.title()}")
-    lookback_days = [7, 30, 60, 90, 180, 365]
-    metrics_df = (
-        pd.DataFrame(
-            [compute_nav_metrics(
-                df=df, 
-                lookback_days=days) 
-            for days in lookback_days]
-        )
-    )
+    lookback_days = (7, 30, 60, 90, 180, 365)
+    metrics_df = nav_metrics_table(df, lookback_days)
     metrics_df.columns = metrics_df.columns.str.replace('_', ' ').str.title()
     show_dataframe(metrics_df)
     
-    dip_factor = (
-        DipFactorUtils(
+    dip_factor = dip_factor_for_frequency(
         df=df,
         weights=params['weights'],
-        drop_threshold_range=params['drop_threshold_range']
-        )
-        .from_frequency(
-            frequency=frequency
-        )
+        drop_threshold_range=params['drop_threshold_range'],
+        frequency=frequency
     )
 
     col1, col2, col3 = st.columns(3)
@@ -79,7 +68,7 @@ def show_saved_simulations(width):
 
     if st.button("Run Simulation"):
         mf_simulator_obj = MFSimulator(nav_df=None, scheme_code=selected_sim['scheme_code'])
-        investment_history, final_metrics = mf_simulator_obj.run_simulation_from_params(selected_sim)
+        investment_history, final_metrics = mf_simulator_obj.cached("run_simulation_from_params", params=selected_sim)
         
         st.subheader("Simulation Results")
         show_simulation_metrics(investment_history, final_metrics, mf_simulator_obj)
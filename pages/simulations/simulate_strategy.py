@@ -5,6 +5,7 @@ import config.constants as CONSTANTS
 
 from streamlit_components.buttons import add_both_favourites_and_blacklist_buttons
 from streamlit_components.metrics import show_simulation_metrics
+from streamlit_components.dataframe import show_dataframe
 
 from src.mf_simulator import MFSimulator
 from utils.data_loader import SimulationManager
@@ -32,6 +33,10 @@ def add_weekly_simulation_tab(simulator_obj: MFSimulator):
     weeks = st.slider("Number of weeks to simulate", 4, 400, 150)
     selected = st.select_slider("Select Weekday for Investment", options=days, value="Friday")
     weekday = days.index(selected)
+    holiday_policy = st.selectbox(
+        "If the weekday has no NAV", CONSTANTS.HOLIDAY_POLICIES,
+        index=CONSTANTS.HOLIDAY_POLICIES.index(CONSTANTS.HOLIDAY_POLICY_WEEKLY)
+    )
     sip_amount = st.slider("Select SIP Amount per week", 0, 10000, 1000, 100)
 
     # Lumpsum Parameters
@@ -48,6 +53,7 @@ def add_weekly_simulation_tab(simulator_obj: MFSimulator):
     params = {
         'weeks': weeks,
         'weekday': weekday,
+        'holiday_policy': holiday_policy,
         'sip_amount': sip_amount,
         'carry_forward': carry_forward,
         'invest_amount_per_week': lumpsum,
@@ -57,20 +63,38 @@ def add_weekly_simulation_tab(simulator_obj: MFSimulator):
     st.session_state['params'] = params
 
     if st.button("Run Simulation"):
-        investment_history, final_metrics = simulator_obj.simulate_weekly(
+        investment_history, final_metrics = simulator_obj.cached(
+            "simulate_weekly",
             weights=weights,
             drop_threshold_range = drop_threshold_range,
             lumpsum=lumpsum,
             carry_forward=carry_forward,
             sip_amount=sip_amount,
             weeks=weeks,
-            weekday=weekday
+            weekday=weekday,
+            holiday_policy=holiday_policy
         )
 
         st.divider()
         show_simulation_metrics(investment_history, final_metrics, simulator_obj)
         return params
 
+    if st.button("Compare All Weekdays"):
+        sweep_df = simulator_obj.cached(
+            "sweep_weekly",
+            weights=weights,
+            drop_threshold_range = drop_threshold_range,
+            lumpsum=lumpsum,
+            carry_forward=carry_forward,
+            sip_amount=sip_amount,
+            weeks=weeks,
+            holiday_policy=holiday_policy
+        )
+
+        st.divider()
+        st.subheader("Weekday Comparison")
+        show_dataframe(sweep_df)
+
 def add_monthly_simulation_tab(simulator_obj: MFSimulator):
     st.header("Monthly Simulation")
 
@@ -78,6 +102,10 @@ def add_monthly_simulation_tab(simulator_obj: MFSimulator):
     st.subheader("SIP Parameters")
     months = st.slider("Number of months to simulate", 1, 200, CONSTANTS.MONTHS)
     date_of_investment = st.slider("Date of Investment", 1, 28, CONSTANTS.DATE_OF_INVESTMENT)
+    holiday_policy = st.selectbox(
+        "If the date has no NAV", CONSTANTS.HOLIDAY_POLICIES,
+        index=CONSTANTS.HOLIDAY_POLICIES.index(CONSTANTS.HOLIDAY_POLICY_MONTHLY)
+    )
     sip_amount = st.slider("Select SIP Amount per month", 0, 100000, CONSTANTS.SIP_AMOUNT_MONTHLY, 100)
 
     # Lumpsum Parameters
@@ -93,6 +121,7 @@ def add_monthly_simulation_tab(simulator_obj: MFSimulator):
     params = {
         'months': months,
         'date_of_investment': date_of_investment,
+        'holiday_policy': holiday_policy,
         'sip_amount': sip_amount,
         'carry_forward': carry_forward,
         'lumpsum': lumpsum,
@@ -102,19 +131,37 @@ def add_monthly_simulation_tab(simulator_obj: MFSimulator):
     st.session_state['params'] = params
 
     if st.button("Run Simulation"):
-        investment_history, final_metrics = simulator_obj.simulate_monthly(
+        investment_history, final_metrics = simulator_obj.cached(
+            "simulate_monthly",
             weights=weights,
             drop_threshold_range = drop_threshold_range,
             lumpsum=lumpsum,
             carry_forward=carry_forward,
             sip_amount=sip_amount,
             months=months,
-            date_of_investment=date_of_investment
+            date_of_investment=date_of_investment,
+            holiday_policy=holiday_policy
         )
 
         st.divider()
         show_simulation_metrics(investment_history, final_metrics, simulator_obj)
         return params
+
+    if st.button("Compare All Dates of Investment"):
+        sweep_df = simulator_obj.cached(
+            "sweep_monthly",
+            weights=weights,
+            drop_threshold_range = drop_threshold_range,
+            lumpsum=lumpsum,
+            carry_forward=carry_forward,
+            sip_amount=sip_amount,
+            months=months,
+            holiday_policy=holiday_policy
+        )
+
+        st.divider()
+        st.subheader("Date of Investment Comparison")
+        show_dataframe(sweep_df)
     
     pass
 
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 import config.constants as CONSTANTS
-from .nav_metrics import compute_nav_metrics
+from utils import caching
+from .nav_metrics import compute_nav_metrics, compute_nav_metrics_series
 
 class DipFactorCalculator:
     def __init__(
@@ -25,6 +27,9 @@ class DipFactorCalculator:
             drop_threshold_range (tuple, optional): (min_drop, max_drop) thresholds
                 used for normalizing dips into [0.0, 1.0].
                 Defaults to CONSTANTS.DROP_THRESHOLD_RANGE.
+
+        The drop values may be scalars or NumPy arrays / Series of equal length, in which
+        case `calculate_dip_factor` returns one dip factor per element.
         """
 
         self.recent_drops = recent_drops
@@ -32,16 +37,17 @@ class DipFactorCalculator:
         self.weights = weights or CONSTANTS.WEIGHTS
         self.drop_threshold_range = drop_threshold_range or CONSTANTS.DROP_THRESHOLD_RANGE
 
-    def _normalize_drop(self, d: float) -> float:
+    def _normalize_drop(self, d):
         min_th, max_th = self.drop_threshold_range
-        if d > -min_th: 
-            return 0.0
-        if d <= -max_th: 
-            return 1.0
-        return (-d - min_th) / (max_th - min_th)
+        d = np.asarray(d, dtype=float)
+        # Same branches as the scalar version: the ratio is only used strictly between the
+        # thresholds (never for max_th <= min_th), and NaN drops stay NaN
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = (-d - min_th) / (max_th - min_th)
+        return np.where(d > -min_th, 0.0, np.where(d <= -max_th, 1.0, ratio))[()]
 
     @staticmethod
-    def _weighted_avg(a: float, b: float, w: float) -> float:
+    def _weighted_avg(a, b, w: float):
         return w * a + (1 - w) * b
 
     def calculate_dip_factor(self) -> float:
@@ -125,6 +131,35 @@ class DipFactorUtils:
         )
         return x.calculate_dip_factor()
 
+    def compute_raw_series(
+        self,
+        recent_days: int,
+        historical_days: int,
+    ) -> pd.Series:
+        """
+        Vectorized `compute_raw` evaluated as of every date in the NAV history.
+
+        Returns:
+            pd.Series: Dip factor per NAV date (indexed by date, sorted ascending), equal to
+            calling `compute_raw` on the history truncated at that date.
+        """
+        recent = compute_nav_metrics_series(df=self.df, lookback_days=recent_days)
+        historical = compute_nav_metrics_series(df=self.df, lookback_days=historical_days)
+
+        x = DipFactorCalculator(
+            recent_drops={
+                'peak' : recent['%_vs_high'].to_numpy(),
+                'avg' : recent['%_vs_avg'].to_numpy(),
+            },
+            historical_drops={
+                'peak' : historical['%_vs_high'].to_numpy(),
+                'avg' : historical['%_vs_avg'].to_numpy(),
+            },
+            weights=self.weights,
+            drop_threshold_range=self.drop_threshold_range
+        )
+        return pd.Series(x.calculate_dip_factor(), index=recent['date'], name="dip_factor")
+
     def from_frequency(self, frequency: str = "weekly") -> float:
         frequency = frequency.lower()
         if frequency == "weekly":
@@ -132,3 +167,23 @@ class DipFactorUtils:
         if frequency == "monthly":
             return self.compute_raw(60, 90)
         return 0
+
+    def series_from_frequency(self, frequency: str = "weekly") -> pd.Series:
+        """Vectorized `from_frequency`: dip factor as of every NAV date."""
+        frequency = frequency.lower()
+        if frequency == "weekly":
+            return self.compute_raw_series(30, 60)
+        if frequency == "monthly":
+            return self.compute_raw_series(60, 90)
+        dates = self.df.sort_values("date")["date"]
+        return pd.Series(0.0, index=pd.Index(dates, name="date"), name="dip_factor")
+
+
+@caching.cache_data("analytics", max_entries=64)
+def dip_factor_for_frequency(df: pd.DataFrame, weights: dict, drop_threshold_range: tuple, frequency: str) -> float:
+    """Cached `DipFactorUtils(df, weights, drop_threshold_range).from_frequency(frequency)`."""
+    return DipFactorUtils(
+        df=df,
+        weights=weights,
+        drop_threshold_range=drop_threshold_range
+    ).from_frequency(frequency=frequency)
@@ -1,9 +1,10 @@
 from src.mf_simulator import MFSimulator
 from datetime import datetime
 from mftools_wrapper import MFScheme
+from src.tax_lots import TaxLotEngine
 import pandas as pd
 
-def merge_investment_with_nav(investment_df, scheme_code):
+def merge_investment_with_nav(investment_df, scheme_code, nav_df=None):
     """
     Merges the user's investment data with the historical NAV data of a mutual fund scheme.
 
@@ -15,6 +16,8 @@ def merge_investment_with_nav(investment_df, scheme_code):
     Args:
         investment_df (pd.DataFrame): DataFrame with columns ['nav_date', 'total_invested'] for user investments.
         scheme_code (str): The unique identifier for the mutual fund scheme.
+        nav_df (pd.DataFrame, optional): Pre-fetched NAV history with columns ['date', 'nav']
+            (e.g. from `PortfolioValuation.nav_histories`). Fetched via `MFScheme` if None.
 
     Returns:
         pd.DataFrame: Merged DataFrame with columns ['date', 'nav', 'amount_invested'].
@@ -28,9 +31,10 @@ def merge_investment_with_nav(investment_df, scheme_code):
 
     start_date = investment_df['date'].min() - pd.Timedelta(days=30)
 
-    mf_scheme_obj = MFScheme(scheme_code)
+    if nav_df is None:
+        nav_df = MFScheme(scheme_code).get_nav_data()
     nav_df = (
-        mf_scheme_obj.get_nav_data()
+        nav_df
         [['date', 'nav']]
         .loc[lambda df: (df['date'] >= start_date)]
     )
@@ -56,7 +60,7 @@ def get_investment_metrics(
 
     Returns:
         dict: Dictionary containing:
-            - total_invested: Total invested amount
+            - total_invested: Cost of the units held (FIFO after redemptions)
             - current_value: Latest value of holdings
             - profit: Absolute profit/loss
             - roi: Return on Investment (%)
@@ -71,9 +75,15 @@ def get_investment_metrics(
     latest_date = pd.to_datetime(details["current_date"])
     latest_nav = details["current_nav"]
 
-    # Basic investment stats
+    # Basic investment stats; after redemptions the invested amount is the FIFO cost of
+    # the units still held (the proceeds only enter XIRR)
     total_invested = investment_df["amount_invested"].sum()
     total_units = investment_df["units_bought"].sum()
+    if (investment_df["units_bought"].astype(float) < 0).any():
+        total_invested = (
+            TaxLotEngine(investment_df.assign(scheme_code=str(scheme_code)), current_navs={})
+            .cost_basis()["remaining_cost"].sum()
+        )
     final_value = latest_nav * total_units
 
     # Vectorized cashflows
@@ -1,11 +1,15 @@
 from datetime import timedelta
 from pyxirr import xirr
+import numpy as np
 import pandas as pd
 import config.constants as CONSTANTS
 # from archive.helpers import get_dip_factor
 import streamlit as st
 from mftools_wrapper import MFScheme
 from src.dip_factor import DipFactorUtils
+from src.trading_calendar import TradingCalendar
+from src.simulation_result import SimulationResult
+from utils import caching, tracing
 
 
 class MFSimulator:
@@ -37,6 +41,7 @@ class MFSimulator:
             nav_df = MFScheme(scheme_code).get_nav_data()
 
         self.nav_df = nav_df.sort_values("date").reset_index(drop=True)
+        self.calendar = TradingCalendar(self.nav_df["date"])
     
     
     def _add_metrics(self, detail_dict: dict) -> dict:
@@ -48,6 +53,11 @@ class MFSimulator:
         }
         return {**detail_dict, **add_ons}
 
+    def cached(self, method: str, **kwargs):
+        """Run `method` (e.g. "simulate_weekly", "sweep_monthly", "run_simulation_from_params")
+        through the shared result cache; see `run_simulation`."""
+        return run_simulation(self.nav_df, method, kwargs)
+
     def run_simulation_from_params(self, params: dict):
         if params['frequency'] == "Weekly":
             required_keys = ["weights", 
@@ -56,7 +66,8 @@ class MFSimulator:
                              "carry_forward",
                              "sip_amount", 
                              "weeks", 
-                             "weekday"]
+                             "weekday",
+                             "holiday_policy"]
             filtered_params = {k: v for k, v in params.items() if k in required_keys}
 
             return self.simulate_weekly(**filtered_params)
@@ -68,7 +79,8 @@ class MFSimulator:
                              "carry_forward",
                              "sip_amount", 
                              "months", 
-                             "date_of_investment"]
+                             "date_of_investment",
+                             "holiday_policy"]
 
             filtered_params = {k: v for k, v in params.items() if k in required_keys}
             
@@ -76,6 +88,7 @@ class MFSimulator:
 
 
 
+    @tracing.traced("simulator.simulate_weekly")
     def simulate_weekly(
             self,
             weights: dict = None,
@@ -85,9 +98,16 @@ class MFSimulator:
             sip_amount: int = None,
             weeks: int = None,
             weekday: int = None,
+            holiday_policy: str = None,
         ):
         """
         Runs simulation weekly
+
+        `holiday_policy` ("previous", "next" or "skip") decides what happens when the
+        chosen weekday has no NAV; see `TradingCalendar`.
+
+        Returns:
+            tuple[SimulationResult, dict]: Columnar investment history and final metrics.
         """
 
         weights = weights or CONSTANTS.WEIGHTS
@@ -97,16 +117,30 @@ class MFSimulator:
         sip_amount = sip_amount or CONSTANTS.SIP_AMOUNT_WEEKLY
         weeks = weeks or CONSTANTS.WEEKS
         weekday = weekday or CONSTANTS.WEEKDAY
+        holiday_policy = holiday_policy or CONSTANTS.HOLIDAY_POLICY_WEEKLY
         
         end_date = self.nav_df["date"].max()
         start_date = end_date - timedelta(weeks=weeks)
         df = self.nav_df.reset_index(drop=True)
+        nav_values = df["nav"].to_numpy()
+        # Dip factor as of every NAV date, computed once instead of per scheduled date
+        dip_series = (
+            DipFactorUtils(
+                df=df,
+                weights=weights,
+                drop_threshold_range=drop_threshold_range
+            )
+            .series_from_frequency(
+                frequency="Weekly"
+            )
+            .to_numpy()
+        )
 
         # Initialise variables
         lumpsum_remain_each_week = lumpsum
         total_units = 0.0
         total_invested = 0.0
-        investment_history = []
+        investment_history = SimulationResult(capacity=weeks + 1)
         
         cashflows = []
 
@@ -114,25 +148,11 @@ class MFSimulator:
             if curr_date.weekday() != weekday:
                 continue
             
-            
-            row = df[df["date"] == curr_date]
-            if row['nav'].values.size == 0: continue
-            nav_curr_date = row['nav'].values[0]
-            past_df = df[df["date"] <= curr_date]
-
-            curr_date = curr_date.date()
-            curr_day_str = CONSTANTS.WEEKDAY_MAPPING[curr_date.weekday()]
-
-            dip_factor = (
-                DipFactorUtils(
-                    df=past_df,
-                    weights=weights,
-                    drop_threshold_range=drop_threshold_range
-                )
-                .from_frequency(
-                    frequency="Weekly"
-                )
-            )
+            idx = self.calendar.resolve_one(curr_date, holiday_policy)
+            if idx is None: continue
+            nav_curr_date = nav_values[idx]
+            curr_date = df["date"].iloc[idx].date()
+            dip_factor = dip_series[idx]
 
             dip_buy = dip_factor * lumpsum_remain_each_week
             amount_to_invest = dip_buy + sip_amount
@@ -142,23 +162,21 @@ class MFSimulator:
                 total_invested += amount_to_invest
                 cashflows.append((curr_date, -amount_to_invest))
 
-                investment_history.append({
-                    "date": curr_date,
-                    "weekday": curr_day_str,
-                    "nav": nav_curr_date,
-                    "dip_factor": dip_factor,
-                    "dip_buy": dip_buy,
-                    "sip": sip_amount,
-                    "total_investment": amount_to_invest,
-                    "units": (amount_to_invest / nav_curr_date) if nav_curr_date else 0
-                })
+                investment_history.append(
+                    date=curr_date,
+                    nav=nav_curr_date,
+                    dip_factor=dip_factor,
+                    dip_buy=dip_buy,
+                    sip=sip_amount,
+                    total_investment=amount_to_invest,
+                    units=(amount_to_invest / nav_curr_date) if nav_curr_date else 0
+                )
             if carry_forward : 
                 lumpsum_remain_each_week += (lumpsum - dip_buy)
 
         latest_nav = df['nav'].iloc[-1]
         final_value = total_units * latest_nav
         cashflows.append((df["date"].iloc[-1], final_value))
-        investment_history = pd.DataFrame(investment_history)
         
         xirr_value = self.calculate_xirr(cashflows)
         final_metrics = {
@@ -172,6 +190,7 @@ class MFSimulator:
 
         return investment_history, final_metrics
 
+    @tracing.traced("simulator.simulate_monthly")
     def simulate_monthly(
             self,
             weights: dict = None,
@@ -180,7 +199,8 @@ class MFSimulator:
             carry_forward: bool = None,
             sip_amount: int = None,
             months: int = None,
-            date_of_investment: int = None
+            date_of_investment: int = None,
+            holiday_policy: str = None
         ):
 
         """
@@ -205,10 +225,12 @@ class MFSimulator:
             sip_amount (int, optional): Monthly SIP amount to invest.
             months (int, optional): Number of months to simulate.
             date_of_investment (int, optional): Day of the month when investments are executed.
+            holiday_policy (str, optional): "previous", "next" or "skip" - how to handle a
+                date of investment without NAV (see `TradingCalendar`).
 
         Returns:
-            pd.DataFrame: DataFrame containing simulated investment details per month,
-            including invested amount, units bought, and cumulative NAV metrics.
+            tuple[SimulationResult, dict]: Columnar investment details per month (invested
+            amount, units bought, NAV, dip factor) and the final metrics.
         """ 
 
         weights = weights or CONSTANTS.WEIGHTS
@@ -218,40 +240,43 @@ class MFSimulator:
         sip_amount = sip_amount or CONSTANTS.SIP_AMOUNT_MONTHLY
         months = months or CONSTANTS.MONTHS
         date_of_investment = date_of_investment or CONSTANTS.DATE_OF_INVESTMENT
+        holiday_policy = holiday_policy or CONSTANTS.HOLIDAY_POLICY_MONTHLY
         
         end_date = self.nav_df["date"].max()
         start_date = end_date - pd.DateOffset(months=months)
         df = self.nav_df.reset_index(drop=True)
+        nav_values = df["nav"].to_numpy()
+        # Dip factor as of every NAV date, computed once instead of per scheduled date
+        dip_series = (
+            DipFactorUtils(
+                df=df,
+                weights=weights,
+                drop_threshold_range=drop_threshold_range
+            )
+            .series_from_frequency(
+                frequency="Monthly"
+            )
+            .to_numpy()
+        )
 
         # Initialise variables
         lumpsum_remain_each_month = lumpsum
         total_units = 0.0
         total_invested = 0.0
-        investment_history = []
+        investment_history = SimulationResult(capacity=months + 1)
         cashflows = []
 
         for curr_date in pd.date_range(start_date, end_date, freq='D'):
             # Invest only on specified date_of_investment
             if curr_date.day != date_of_investment:
                 continue
-            row = df[df["date"] <= curr_date].nlargest(1, "date")
-            if row.empty:
+            idx = self.calendar.resolve_one(curr_date, holiday_policy)
+            if idx is None:
                 continue
             
-            nav_curr_date = row.iloc[0]['nav']
-            curr_date = row.iloc[0]['date']
-            curr_day_str = CONSTANTS.WEEKDAY_MAPPING[curr_date.weekday()]
-            past_df = df[df["date"] <= curr_date]
-            dip_factor = (
-                DipFactorUtils(
-                    df=past_df,
-                    weights=weights,
-                    drop_threshold_range=drop_threshold_range
-                )
-                .from_frequency(
-                    frequency="Monthly"
-                )
-            )
+            nav_curr_date = nav_values[idx]
+            curr_date = df["date"].iloc[idx]
+            dip_factor = dip_series[idx]
 
             dip_buy = dip_factor * lumpsum_remain_each_month
             amount_to_invest = dip_buy + sip_amount
@@ -261,16 +286,15 @@ class MFSimulator:
                 total_invested += amount_to_invest
                 cashflows.append((curr_date, -amount_to_invest))
 
-                investment_history.append({
-                    "date": curr_date,
-                    "weekday": curr_day_str,
-                    "nav": nav_curr_date,
-                    "dip_factor": dip_factor,
-                    "dip_buy": dip_buy,
-                    "sip": sip_amount,
-                    "total_investment": amount_to_invest,
-                    "units": (amount_to_invest / nav_curr_date) if nav_curr_date else 0
-                })
+                investment_history.append(
+                    date=curr_date,
+                    nav=nav_curr_date,
+                    dip_factor=dip_factor,
+                    dip_buy=dip_buy,
+                    sip=sip_amount,
+                    total_investment=amount_to_invest,
+                    units=(amount_to_invest / nav_curr_date) if nav_curr_date else 0
+                )
             
             if carry_forward:
                 lumpsum_remain_each_month += (lumpsum - dip_buy)
@@ -279,7 +303,6 @@ class MFSimulator:
         final_value = total_units * latest_nav
         cashflows.append((df["date"].iloc[-1], final_value))
         
-        investment_history = pd.DataFrame(investment_history)
         xirr_value = self.calculate_xirr(cashflows) 
         final_metrics = {
             "total_invested": total_invested,
@@ -293,6 +316,215 @@ class MFSimulator:
         return investment_history, final_metrics
 
 
+    @tracing.traced("simulator.sweep_weekly")
+    def sweep_weekly(
+            self,
+            weights: dict = None,
+            drop_threshold_range: tuple = None,
+            lumpsum: int = None,
+            carry_forward: bool = None,
+            sip_amount: int = None,
+            weeks: int = None,
+            holiday_policy: str = None,
+        ) -> pd.DataFrame:
+        """
+        Runs the weekly simulation for every trading weekday in a single pass.
+
+        Takes the same arguments as `simulate_weekly` (minus `weekday`) and returns one
+        row per weekday on which the scheme publishes NAVs (Monday-Friday in practice), so
+        the best investment day can be picked without separate runs.
+
+        Returns:
+            pd.DataFrame: Comparison table with columns ['weekday', 'investments',
+            'total_invested', 'final_value', 'profit', 'roi', 'xirr', 'total_units',
+            'average_nav', 'latest_nav'].
+        """
+        weights = weights or CONSTANTS.WEIGHTS
+        drop_threshold_range = drop_threshold_range or CONSTANTS.DROP_THRESHOLD_RANGE
+        lumpsum = lumpsum if lumpsum is not None else CONSTANTS.LUMPSUM_PER_WEEK
+        carry_forward = carry_forward if carry_forward is not None else CONSTANTS.CARRY_FORWARD_WEEKLY
+        sip_amount = sip_amount or CONSTANTS.SIP_AMOUNT_WEEKLY
+        weeks = weeks or CONSTANTS.WEEKS
+        holiday_policy = holiday_policy or CONSTANTS.HOLIDAY_POLICY_WEEKLY
+
+        end_date = self.nav_df["date"].max()
+        start_date = end_date - timedelta(weeks=weeks)
+        days = pd.date_range(start_date, end_date).values.astype("datetime64[D]")
+
+        # One row per weekday with NAVs, holding every calendar day falling on it
+        # (1970-01-01 was a Thursday)
+        nav_days = self.nav_df["date"].to_numpy().astype("datetime64[D]")
+        weekdays = np.unique((nav_days.astype(np.int64) + 3) % 7)
+        first_weekday = (days[0].astype(np.int64) + 3) % 7
+        offsets = (weekdays - first_weekday) % 7
+        positions = offsets[:, None] + 7 * np.arange(-(-len(days) // 7))[None, :]
+        in_range = positions < len(days)
+        candidates = days[np.where(in_range, positions, 0)]
+
+        nav_idx = self.calendar.resolve(candidates, holiday_policy)
+        valid = in_range & (nav_idx >= 0)
+        nav_idx = np.where(valid, nav_idx, 0)
+
+        table = self._sweep_schedules(
+            nav_idx=nav_idx,
+            valid=valid,
+            frequency="Weekly",
+            weights=weights,
+            drop_threshold_range=drop_threshold_range,
+            lumpsum=lumpsum,
+            carry_forward=carry_forward,
+            sip_amount=sip_amount,
+        )
+        table.insert(0, "weekday", [CONSTANTS.WEEKDAY_MAPPING[w] for w in weekdays])
+        return table
+
+    @tracing.traced("simulator.sweep_monthly")
+    def sweep_monthly(
+            self,
+            weights: dict = None,
+            drop_threshold_range: tuple = None,
+            lumpsum: int = None,
+            carry_forward: bool = None,
+            sip_amount: int = None,
+            months: int = None,
+            holiday_policy: str = None,
+        ) -> pd.DataFrame:
+        """
+        Runs the monthly simulation for every date of investment (1-28) in a single pass.
+
+        Takes the same arguments as `simulate_monthly` (minus `date_of_investment`) and
+        returns one row per day of the month.
+
+        Returns:
+            pd.DataFrame: Comparison table with columns ['date_of_investment', 'investments',
+            'total_invested', 'final_value', 'profit', 'roi', 'xirr', 'total_units',
+            'average_nav', 'latest_nav'].
+        """
+        weights = weights or CONSTANTS.WEIGHTS
+        drop_threshold_range = drop_threshold_range or CONSTANTS.DROP_THRESHOLD_RANGE
+        lumpsum = lumpsum if lumpsum is not None else CONSTANTS.LUMPSUM_PER_MONTH
+        carry_forward = carry_forward if carry_forward is not None else CONSTANTS.CARRY_FORWARD_MONTHLY
+        sip_amount = sip_amount or CONSTANTS.SIP_AMOUNT_MONTHLY
+        months = months or CONSTANTS.MONTHS
+        holiday_policy = holiday_policy or CONSTANTS.HOLIDAY_POLICY_MONTHLY
+
+        end_date = self.nav_df["date"].max()
+        start_date = end_date - pd.DateOffset(months=months)
+
+        # Row d-1 holds the d-th of every month in the simulated range
+        month_starts = (
+            pd.period_range(start_date.to_period("M"), end_date.to_period("M"), freq="M")
+            .to_timestamp()
+            .values.astype("datetime64[D]")
+        )
+        day_numbers = np.arange(1, 29)
+        candidates = month_starts[None, :] + (day_numbers - 1)[:, None].astype("timedelta64[D]")
+        in_range = (
+            (candidates >= np.datetime64(start_date.date(), "D"))
+            & (candidates <= np.datetime64(end_date.date(), "D"))
+        )
+
+        nav_idx = self.calendar.resolve(candidates, holiday_policy)
+        valid = in_range & (nav_idx >= 0)
+        nav_idx = np.where(valid, nav_idx, 0)
+
+        table = self._sweep_schedules(
+            nav_idx=nav_idx,
+            valid=valid,
+            frequency="Monthly",
+            weights=weights,
+            drop_threshold_range=drop_threshold_range,
+            lumpsum=lumpsum,
+            carry_forward=carry_forward,
+            sip_amount=sip_amount,
+        )
+        table.insert(0, "date_of_investment", day_numbers)
+        return table
+
+    def _sweep_schedules(
+            self,
+            nav_idx: np.ndarray,
+            valid: np.ndarray,
+            frequency: str,
+            weights: dict,
+            drop_threshold_range: tuple,
+            lumpsum: int,
+            carry_forward: bool,
+            sip_amount: int,
+        ) -> pd.DataFrame:
+        """
+        Evaluates a (variants x periods) matrix of NAV row indices as independent schedules.
+
+        `nav_idx[v, p]` is the row of `self.nav_df` used for period `p` of variant `v`;
+        cells where `valid` is False are skipped, exactly like a non-NAV day in the loop.
+        """
+        nav_values = self.nav_df["nav"].to_numpy(dtype=float)
+        nav_dates = self.nav_df["date"].to_numpy()
+        dip_series = (
+            DipFactorUtils(
+                df=self.nav_df,
+                weights=weights,
+                drop_threshold_range=drop_threshold_range
+            )
+            .series_from_frequency(
+                frequency=frequency
+            )
+            .to_numpy()
+        )
+
+        dip_factor = np.where(valid, dip_series[nav_idx], 0.0)
+        nav = nav_values[nav_idx]
+
+        if carry_forward:
+            dip_buy = np.zeros_like(dip_factor)
+            lumpsum_remain = np.full(dip_factor.shape[0], float(lumpsum))
+            for period in range(dip_factor.shape[1]):
+                dip_buy[:, period] = dip_factor[:, period] * lumpsum_remain
+                lumpsum_remain = np.where(
+                    valid[:, period],
+                    lumpsum_remain + (lumpsum - dip_buy[:, period]),
+                    lumpsum_remain
+                )
+        else:
+            dip_buy = dip_factor * lumpsum
+
+        amount_to_invest = dip_buy + sip_amount
+        invested = valid & (amount_to_invest > 0)
+        amount_to_invest = np.where(invested, amount_to_invest, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            units = np.where(invested, amount_to_invest / nav, 0.0)
+
+        latest_nav = nav_values[-1]
+        total_invested = amount_to_invest.sum(axis=1)
+        total_units = units.sum(axis=1)
+        final_value = total_units * latest_nav
+
+        # Schedules without a single investment have no XIRR (as `calculate_xirr` would report)
+        xirr_values = [
+            self.calculate_xirr(
+                list(zip(nav_dates[nav_idx[v][invested[v]]], -amount_to_invest[v][invested[v]]))
+                + [(nav_dates[-1], final_value[v])]
+            ) if invested[v].any() else 0.0
+            for v in range(nav_idx.shape[0])
+        ]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi = np.where(total_invested != 0, (final_value - total_invested) / total_invested * 100, 0.0)
+            average_nav = np.where(total_units != 0, total_invested / total_units, 0.0)
+
+        return pd.DataFrame({
+            "investments": invested.sum(axis=1),
+            "total_invested": total_invested,
+            "final_value": final_value,
+            "profit": final_value - total_invested,
+            "roi": roi,
+            "xirr": xirr_values,
+            "total_units": total_units,
+            "average_nav": average_nav,
+            "latest_nav": latest_nav,
+        })
+
+
     @staticmethod
     def calculate_xirr(cashflows):
         """Calculate XIRR from self.cashflows (list of (date, amount) tuples)."""
@@ -303,3 +535,15 @@ class MFSimulator:
         except Exception:
             print("Error calculating XIRR.")
             return 0.0
+
+
+@caching.cache_data("analytics", max_entries=32)
+def run_simulation(nav_df: pd.DataFrame, method: str, kwargs: dict):
+    """Result of `MFSimulator(nav_df).<method>(**kwargs)`, cached on the NAV data and the parameters.
+
+    Re-running a simulation with unchanged inputs (a repeated click, a rerun, re-opening a
+    saved simulation) returns the stored result instead of simulating again; a new NAV or
+    any changed parameter is a new key.
+    """
+    with tracing.span("simulator.run_simulation", method=method):
+        return getattr(MFSimulator(nav_df=nav_df), method)(**kwargs)
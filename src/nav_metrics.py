@@ -1,4 +1,5 @@
 import pandas as pd
+from utils import caching
 
 
 def compute_nav_metrics(
@@ -70,6 +71,63 @@ def compute_nav_metrics(
     }
 
 
+@caching.cache_data("analytics", max_entries=64)
+def nav_metrics_table(df: pd.DataFrame, lookback_days: tuple = (7, 30, 60, 90, 180, 365)) -> pd.DataFrame:
+    """
+    `compute_nav_metrics` for several lookback windows, one row per window.
+
+    Cached on the content of `df` (a new NAV gives a new key), so reruns that do not
+    change the scheme cost one hash of the frame.
+
+    Args:
+        df: DataFrame containing columns ['date', 'nav'].
+        lookback_days: Lookback windows in days.
+
+    Returns:
+        pd.DataFrame: One row per window with the keys of `compute_nav_metrics` as columns.
+    """
+    return pd.DataFrame([compute_nav_metrics(df=df, lookback_days=days) for days in lookback_days])
+
 
+def compute_nav_metrics_series(
+    df: pd.DataFrame,
+    lookback_days: int
+) -> pd.DataFrame:
+    """
+    Calculate the numeric NAV metrics of `compute_nav_metrics` for every date in the history at once.
 
+    Row `i` of the result holds the metrics `compute_nav_metrics(df[df["date"] <= date_i], lookback_days,
+    as_string=False)` would return, computed with a single trailing time-based rolling window instead of
+    one filter per date.
+
+    Args:
+        df: DataFrame containing columns ['date', 'nav'].
+        lookback_days: Number of trailing days (inclusive) to include in each window.
 
+    Returns:
+        pd.DataFrame: One row per NAV date (sorted ascending) with columns
+            ['date', 'nav', 'high_nav', 'avg_nav', 'low_nav', '%_vs_high', '%_vs_avg', '%_vs_low'].
+    """
+    if 'date' not in df.columns or 'nav' not in df.columns:
+        raise ValueError("DataFrame must contain 'date' and 'nav' columns")
+
+    nav = (
+        df[["date", "nav"]]
+        .sort_values("date")
+        .set_index("date")["nav"]
+        .astype(float)
+    )
+    window = nav.rolling(f"{lookback_days}D", closed="both")
+    high_nav, avg_nav, low_nav = window.max(), window.mean(), window.min()
+
+    percentage = lambda current, reference: ((current - reference) / reference * 100).round(3)
+
+    return pd.DataFrame({
+        "nav": nav,
+        "high_nav": high_nav,
+        "avg_nav": avg_nav,
+        "low_nav": low_nav,
+        "%_vs_high": percentage(nav, high_nav),
+        "%_vs_avg": percentage(nav, avg_nav),
+        "%_vs_low": percentage(nav, low_nav),
+    }).reset_index()
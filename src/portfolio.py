@@ -0,0 +1,240 @@
+import numpy as np
+import pandas as pd
+from mftools_wrapper import MFClient
+from src.mf_simulator import MFSimulator
+from src.tax_lots import TaxLotEngine
+
+
+def nav_history_frame(records: list) -> pd.DataFrame:
+    """Convert raw `MFClient.get_historical_nav` records into a ['date', 'nav'] frame."""
+    df = pd.DataFrame(records, columns=["date", "nav"])
+    return df.assign(
+        date=pd.to_datetime(df["date"], format="%d-%m-%Y"),
+        nav=df["nav"].astype(float),
+    )
+
+
+class PortfolioValuation:
+    """
+    Values every holding of a portfolio from a single batch of latest quotes.
+
+    Transactions are grouped per scheme and valued against one download of the latest
+    NAVs (`MFClient.get_scheme_quotes`) instead of building an `MFScheme` (and downloading
+    its whole NAV history) per holding.
+
+    'total_invested' is the FIFO cost of the units still held (`TaxLotEngine`), so after a
+    redemption ROI and average NAV describe the remaining units; the redemption proceeds
+    only enter XIRR, as cash inflows.
+
+    Parameters:
+        investments (pd.DataFrame | list[dict]): Transactions as stored by
+            `MyInvestmentsManager`, with at least ['scheme_code', 'scheme_name',
+            'amount_invested', 'units_bought', 'nav_date'].
+        client (MFClient, optional): Client used for quotes and histories.
+        quotes (dict, optional): Pre-fetched quotes (scheme_code -> quote dict); skips the
+            quote download.
+        holdings (list[dict], optional): Materialized per-scheme aggregate
+            (`MyInvestmentsManager.load_holdings`). Totals and the XIRR cash flows are then
+            read from it and the transactions are never regrouped.
+
+    Public Methods:
+        holdings() -> pd.DataFrame
+            Per-scheme invested, units, latest NAV, current value, profit, ROI and XIRR.
+        totals() -> dict
+            The same metrics for the whole portfolio.
+        metrics_for(scheme_code) -> dict
+            Metrics of one holding in the format of `get_investment_metrics`.
+        nav_histories() -> dict[str, pd.DataFrame]
+            NAV history of every held scheme, fetched concurrently.
+    """
+
+    def __init__(self, investments, client: MFClient = None, quotes: dict = None, holdings: list = None):
+        self.investments = pd.DataFrame(investments)
+        self._aggregates = holdings
+        self.client = client
+        if not self.investments.empty:
+            self.investments = self.investments.assign(
+                scheme_code=self.investments["scheme_code"].astype(str),
+                nav_date=pd.to_datetime(self.investments["nav_date"], format="%Y-%m-%d"),
+            )
+        self._quotes = quotes
+        self._holdings = None
+
+    def _get_client(self) -> MFClient:
+        if self.client is None:
+            self.client = MFClient()
+        return self.client
+
+    def _scheme_codes(self) -> list:
+        if self._aggregates is not None:
+            return [str(holding["scheme_code"]) for holding in self._aggregates]
+        return self.investments["scheme_code"].unique().tolist() if not self.investments.empty else []
+
+    def _cashflows(self) -> dict:
+        """scheme_code -> ['nav_date', 'amount_invested'] cash flows of the scheme."""
+        if self._aggregates is not None:
+            return {
+                str(holding["scheme_code"]): pd.DataFrame({
+                    "nav_date": pd.to_datetime(holding["transaction_dates"], format="%Y-%m-%d"),
+                    "amount_invested": holding["transaction_amounts"],
+                })
+                for holding in self._aggregates
+            }
+        return dict(tuple(self.investments[["scheme_code", "nav_date", "amount_invested"]].groupby("scheme_code", sort=False)))
+
+    def _latest_quotes(self) -> pd.DataFrame:
+        if self._quotes is None:
+            codes = self._scheme_codes()
+            self._quotes = self._get_client().get_scheme_quotes(codes)
+        quotes = pd.DataFrame.from_dict(self._quotes, orient="index")
+        if quotes.empty:
+            return pd.DataFrame(columns=["latest_nav", "latest_date"])
+        return pd.DataFrame({
+            "latest_nav": quotes["nav"].astype(float),
+            "latest_date": pd.to_datetime(quotes["last_updated"], format="%d-%b-%Y", errors="coerce"),
+        }, index=quotes.index.astype(str))
+
+    def _with_cost_basis(self, grouped: pd.DataFrame) -> pd.DataFrame:
+        """Replace the net cash flow of schemes with redemptions by the FIFO cost of the units held."""
+        redeemed = self.investments.loc[self.investments["units_bought"].astype(float) < 0, "scheme_code"].unique()
+        if len(redeemed) == 0:
+            return grouped
+        try:
+            cost_basis = TaxLotEngine(
+                self.investments[self.investments["scheme_code"].isin(redeemed)], current_navs={}
+            ).cost_basis()
+        except ValueError:  # oversold history: keep the net cash flow
+            return grouped
+        grouped.loc[cost_basis.index, "total_invested"] = cost_basis["remaining_cost"]
+        return grouped
+
+    @staticmethod
+    def _with_ratios(df: pd.DataFrame) -> pd.DataFrame:
+        invested, units = df["total_invested"], df["total_units"]
+        return df.assign(
+            profit=df["final_value"] - invested,
+            roi=np.where(invested != 0, (df["final_value"] - invested) / invested * 100, 0.0),
+            average_nav=np.where(units != 0, invested / units, 0.0),
+        )
+
+    def holdings(self) -> pd.DataFrame:
+        """Per-scheme valuation.
+
+        Returns:
+            pd.DataFrame: One row per scheme with columns ['scheme_code', 'scheme_name',
+            'total_invested', 'total_units', 'latest_nav', 'latest_date', 'final_value',
+            'profit', 'roi', 'xirr', 'average_nav']. Schemes without a quote get NaN values.
+        """
+        if self._holdings is not None:
+            return self._holdings
+        if not self._scheme_codes():
+            return pd.DataFrame(columns=[
+                "scheme_code", "scheme_name", "total_invested", "total_units", "latest_nav",
+                "latest_date", "final_value", "profit", "roi", "xirr", "average_nav"
+            ])
+
+        if self._aggregates is not None:
+            grouped = (
+                pd.DataFrame(self._aggregates, columns=["scheme_code", "scheme_name", "total_invested", "total_units"])
+                .astype({"scheme_code": str})
+                .set_index("scheme_code")
+            )
+        else:
+            grouped = (
+                self.investments
+                .groupby("scheme_code", sort=False)
+                .agg(
+                    scheme_name=("scheme_name", "first"),
+                    total_invested=("amount_invested", "sum"),
+                    total_units=("units_bought", "sum"),
+                )
+            )
+            grouped = self._with_cost_basis(grouped)
+        grouped = grouped.join(self._latest_quotes(), how="left")
+        grouped["final_value"] = grouped["total_units"] * grouped["latest_nav"]
+        grouped = self._with_ratios(grouped)
+
+        cashflows = self._cashflows()
+        no_cashflows = pd.DataFrame(columns=["nav_date", "amount_invested"])
+        grouped["xirr"] = [
+            self._xirr(cashflows.get(code, no_cashflows), latest_date, final_value)
+            for code, latest_date, final_value in zip(grouped.index, grouped["latest_date"], grouped["final_value"])
+        ]
+
+        self._holdings = grouped.rename_axis("scheme_code").reset_index()[[
+            "scheme_code", "scheme_name", "total_invested", "total_units", "latest_nav",
+            "latest_date", "final_value", "profit", "roi", "xirr", "average_nav"
+        ]]
+        return self._holdings
+
+    @staticmethod
+    def _xirr(transactions: pd.DataFrame, latest_date, final_value) -> float:
+        if pd.isna(latest_date) or pd.isna(final_value):
+            return np.nan
+        cashflows = tuple(
+            zip(transactions["nav_date"], transactions["amount_invested"])
+        ) + ((latest_date, -final_value),)
+        return MFSimulator.calculate_xirr(cashflows)
+
+    def totals(self) -> dict:
+        """Whole-portfolio metrics.
+
+        Returns:
+            dict: total_invested, final_value, profit, roi and xirr over all holdings with
+            a quote.
+        """
+        holdings = self.holdings().dropna(subset=["final_value"])
+        total_invested = holdings["total_invested"].sum()
+        final_value = holdings["final_value"].sum()
+
+        cashflows = self._cashflows()
+        xirr = (
+            self._xirr(
+                pd.concat([cashflows[code] for code in holdings["scheme_code"] if code in cashflows]),
+                holdings["latest_date"].max(),
+                final_value,
+            )
+            if not holdings.empty else 0.0
+        )
+        return {
+            "total_invested": total_invested,
+            "final_value": final_value,
+            "profit": final_value - total_invested,
+            "roi": (final_value - total_invested) / total_invested * 100 if total_invested else 0,
+            "xirr": xirr,
+        }
+
+    def metrics_for(self, scheme_code: str) -> dict:
+        """Metrics of one holding, keyed like `get_investment_metrics`."""
+        holdings = self.holdings()
+        row = holdings[holdings["scheme_code"] == str(scheme_code)]
+        if row.empty:
+            raise KeyError(f"No holding for scheme {scheme_code}")
+        row = row.iloc[0]
+        return {
+            "total_invested": row["total_invested"],
+            "final_value": row["final_value"],
+            "profit": row["profit"],
+            "roi": row["roi"],
+            "xirr": row["xirr"],
+            "total_units": row["total_units"],
+            "latest_nav": row["latest_nav"],
+            "average_nav": row["average_nav"],
+        }
+
+    def nav_histories(self) -> dict:
+        """NAV history ['date', 'nav'] of every held scheme, fetched concurrently.
+
+        Like `MFScheme.get_nav_data`, the latest quote is prepended when it is newer than
+        the last historical NAV.
+        """
+        records = self._get_client().get_historical_navs(self._scheme_codes())
+        latest = self._latest_quotes()
+        histories = {}
+        for code, rows in records.items():
+            df = nav_history_frame(rows)
+            if code in latest.index and latest.at[code, "latest_date"] > df["date"].max():
+                quote = pd.DataFrame({"date": [latest.at[code, "latest_date"]], "nav": [latest.at[code, "latest_nav"]]})
+                df = pd.concat([quote, df], ignore_index=True)
+            histories[code] = df
+        return histories
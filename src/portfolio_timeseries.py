@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+from mftools_wrapper import MFClient
+from src.portfolio import nav_history_frame
+from src.tax_lots import TaxLotEngine
+
+
+def _default_nav_loader(scheme_codes: list) -> dict:
+    records = MFClient().get_historical_navs(scheme_codes)
+    return {code: nav_history_frame(rows) for code, rows in records.items()}
+
+
+class PortfolioHistory:
+    """
+    Daily value of the whole portfolio across all holdings.
+
+    Internally keeps (dates x holdings) matrices of cumulative units, of NAVs and of the
+    invested amount. NAVs are as-of joined onto the daily calendar (the latest NAV on or
+    before each day), so a transaction on a weekend or holiday counts from its own date and
+    is valued at the last published NAV until the next one appears. The invested amount is
+    the FIFO cost of the units held (`src.tax_lots.TaxLotEngine`), as in
+    `PortfolioValuation`: a redemption removes the cost of the units it sold, not its
+    proceeds.
+
+    The matrices are updated incrementally: adding or removing a transaction only touches
+    a single holding column (the units from its date onwards); a new scheme adds one
+    column. Keep the instance (e.g. in `st.session_state`) and call `sync` with the
+    current transactions on every render.
+
+    Parameters:
+        investments (pd.DataFrame | list[dict]): Transactions with ['investment_id',
+            'scheme_code', 'amount_invested', 'units_bought', 'nav_date'].
+        nav_histories (dict, optional): scheme_code -> ['date', 'nav'] frame for (some of)
+            the held schemes, e.g. `PortfolioValuation.nav_histories()`.
+        nav_loader (Callable[[list[str]], dict], optional): Fetches missing NAV histories.
+            Defaults to concurrent `MFClient.get_historical_navs`.
+        end_date (optional): Last day of the series. Defaults to the latest NAV date.
+
+    Public Methods:
+        to_frame() -> pd.DataFrame
+            Daily ['date', 'portfolio_value', 'invested', 'profit', 'drawdown'].
+        holdings_value() -> pd.DataFrame
+            Daily value per holding (dates x scheme codes).
+        add_transaction(txn) / remove_transaction(txn) -> None
+            Incremental updates.
+        sync(investments) -> bool
+            Apply the difference (added, removed or edited records) between the cached
+            and the given transactions.
+    """
+
+    def __init__(self, investments, nav_histories: dict = None, nav_loader=None, end_date=None):
+        self.nav_loader = nav_loader or _default_nav_loader
+        self._nav_histories = {str(k): v for k, v in (nav_histories or {}).items()}
+        self._end_date = end_date
+        self._build(self._normalize(investments))
+
+    @staticmethod
+    def _normalize(investments) -> pd.DataFrame:
+        df = pd.DataFrame(investments)
+        if df.empty:
+            return pd.DataFrame(columns=["investment_id", "scheme_code", "amount_invested", "units_bought", "nav_date"])
+        return df.assign(
+            scheme_code=df["scheme_code"].astype(str),
+            nav_date=pd.to_datetime(df["nav_date"], format="%Y-%m-%d").dt.normalize(),
+        )
+
+    def _ensure_histories(self, scheme_codes) -> None:
+        missing = [code for code in scheme_codes if code not in self._nav_histories]
+        if missing:
+            self._nav_histories.update({str(k): v for k, v in self.nav_loader(missing).items()})
+
+    def _nav_column(self, scheme_code: str) -> np.ndarray:
+        """NAV of one scheme as-of every day in `self.dates` (NaN before its first NAV)."""
+        history = self._nav_histories[scheme_code].sort_values("date")
+        nav_dates = history["date"].to_numpy(dtype="datetime64[D]")
+        idx = np.searchsorted(nav_dates, self.dates, side="right") - 1
+        return np.where(idx >= 0, history["nav"].to_numpy(dtype=float)[np.maximum(idx, 0)], np.nan)
+
+    @staticmethod
+    def _signature(txn: dict) -> tuple:
+        """The fields of a transaction the series depends on, in normalized form."""
+        return (
+            str(txn["scheme_code"]), pd.Timestamp(txn["nav_date"]).normalize(),
+            float(txn["units_bought"]), float(txn["amount_invested"]),
+        )
+
+    def _cost_columns(self, scheme_codes: list) -> np.ndarray:
+        """Remaining FIFO cost of the units of each scheme held on every day (dates x schemes)."""
+        cost = np.zeros((len(self.dates), len(scheme_codes)))
+        txns = self._normalize([t for t in self._transactions.values() if str(t["scheme_code"]) in scheme_codes])
+        if txns.empty:
+            return cost
+        if "scheme_name" not in txns:
+            txns = txns.assign(scheme_name=txns["scheme_code"])
+        units = txns["units_bought"].astype(float)
+        buys, sells = txns[units > 0], txns[units < 0]
+        flows = [(buys["nav_date"], buys["scheme_code"], buys["amount_invested"])]
+        try:
+            realized = TaxLotEngine(txns, current_navs={}).realized()
+            flows.append((realized["sell_date"], realized["scheme_code"], -realized["cost"]))
+        except ValueError:  # oversold history: fall back to the net cash flow
+            flows.append((sells["nav_date"], sells["scheme_code"], sells["amount_invested"]))
+        cols = pd.Index(scheme_codes)
+        for dates, codes, amounts in flows:
+            rows = np.searchsorted(self.dates, dates.to_numpy(dtype="datetime64[D]"))
+            np.add.at(cost, (rows, cols.get_indexer(codes)), amounts.to_numpy(dtype=float))
+        return np.cumsum(cost, axis=0)
+
+    def _build(self, transactions: pd.DataFrame) -> None:
+        self._transactions = {
+            str(txn["investment_id"]): txn for txn in transactions.to_dict("records")
+        }
+        self.scheme_codes = list(dict.fromkeys(transactions["scheme_code"]))
+        self._ensure_histories(self.scheme_codes)
+
+        if transactions.empty:
+            self.dates = np.array([], dtype="datetime64[D]")
+        else:
+            end_date = self._end_date or max(self._nav_histories[c]["date"].max() for c in self.scheme_codes)
+            end_date = max(pd.Timestamp(end_date), transactions["nav_date"].max())
+            self.dates = pd.date_range(transactions["nav_date"].min(), end_date).to_numpy(dtype="datetime64[D]")
+
+        n_days, n_holdings = len(self.dates), len(self.scheme_codes)
+        self._nav = np.column_stack([self._nav_column(c) for c in self.scheme_codes]) if n_holdings else np.empty((n_days, 0))
+        self._units = np.zeros((n_days, n_holdings))
+
+        if not transactions.empty:
+            rows = np.searchsorted(self.dates, transactions["nav_date"].to_numpy(dtype="datetime64[D]"))
+            cols = pd.Index(self.scheme_codes).get_indexer(transactions["scheme_code"])
+            np.add.at(self._units, (rows, cols), transactions["units_bought"].to_numpy(dtype=float))
+            self._units = np.cumsum(self._units, axis=0)
+        self._cost = self._cost_columns(self.scheme_codes)
+
+        self._value = np.zeros(n_days)
+        self._peak = np.zeros(n_days)
+        self._revalue(0)
+
+    def _revalue(self, start_row: int) -> None:
+        """Recompute portfolio value and running peak from `start_row` onwards."""
+        if start_row >= len(self.dates):
+            return
+        units, nav = self._units[start_row:], self._nav[start_row:]
+        self._value[start_row:] = np.where(units != 0, units * np.nan_to_num(nav), 0.0).sum(axis=1)
+        previous_peak = self._peak[start_row - 1] if start_row > 0 else 0.0
+        self._peak[start_row:] = np.maximum.accumulate(np.maximum(self._value[start_row:], previous_peak))
+
+    def _apply(self, txn: dict, sign: int) -> None:
+        scheme_code = str(txn["scheme_code"])
+        nav_date = np.datetime64(pd.Timestamp(txn["nav_date"]).date(), "D")
+
+        outside = len(self.dates) == 0 or not self.dates[0] <= nav_date <= self.dates[-1]
+        if outside or (sign < 0 and nav_date == self.dates[0]):
+            # Outside the current calendar (or it may start later now): rebuild from the full transaction set
+            transactions = list(self._transactions.values())
+            if sign > 0:
+                transactions.append(txn)
+            else:
+                transactions = [t for t in transactions if str(t["investment_id"]) != str(txn["investment_id"])]
+            self._build(self._normalize(transactions))
+            return
+
+        if scheme_code not in self.scheme_codes:
+            self._ensure_histories([scheme_code])
+            self.scheme_codes.append(scheme_code)
+            self._nav = np.column_stack([self._nav, self._nav_column(scheme_code)])
+            self._units = np.column_stack([self._units, np.zeros(len(self.dates))])
+            self._cost = np.column_stack([self._cost, np.zeros(len(self.dates))])
+
+        if sign > 0:
+            self._transactions[str(txn["investment_id"])] = txn
+        else:
+            self._transactions.pop(str(txn["investment_id"]), None)
+
+        row = int(np.searchsorted(self.dates, nav_date))
+        col = self.scheme_codes.index(scheme_code)
+        self._units[row:, col] += sign * float(txn["units_bought"])
+        # FIFO matching of the scheme's later redemptions may change too: redo its column
+        self._cost[:, col] = self._cost_columns([scheme_code])[:, 0]
+        if not any(str(t["scheme_code"]) == scheme_code for t in self._transactions.values()):
+            # Last transaction of the scheme: drop its column
+            self.scheme_codes.pop(col)
+            self._nav, self._units, self._cost = (
+                np.delete(matrix, col, axis=1) for matrix in (self._nav, self._units, self._cost)
+            )
+        self._revalue(row)
+
+    def add_transaction(self, txn: dict) -> None:
+        """Add one transaction, updating only the rows from its NAV date onwards."""
+        if str(txn["investment_id"]) in self._transactions:
+            return
+        self._apply(txn, +1)
+
+    def remove_transaction(self, txn: dict) -> None:
+        """Remove one previously added transaction."""
+        txn = self._transactions.get(str(txn["investment_id"]))
+        if txn is not None:
+            self._apply(txn, -1)
+
+    def sync(self, investments) -> bool:
+        """Bring the series in line with `investments` by applying only the differences.
+
+        Returns:
+            bool: True if anything changed.
+        """
+        current = {str(txn["investment_id"]): txn for txn in self._normalize(investments).to_dict("records")}
+        edited = [
+            txn_id for txn_id, txn in current.items()
+            if txn_id in self._transactions and self._signature(txn) != self._signature(self._transactions[txn_id])
+        ]
+        removed = [txn for txn_id, txn in self._transactions.items() if txn_id not in current or txn_id in edited]
+        added = [txn for txn_id, txn in current.items() if txn_id not in self._transactions or txn_id in edited]
+        for txn in removed:
+            self.remove_transaction(txn)
+        for txn in added:
+            self.add_transaction(txn)
+        return bool(removed or added)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Daily portfolio series.
+
+        Returns:
+            pd.DataFrame: Columns ['date', 'portfolio_value', 'invested', 'profit', 'drawdown'],
+            where invested is the FIFO cost of the units held and drawdown is the percentage
+            drop of the portfolio value from its running peak.
+        """
+        invested = self._cost.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = np.where(self._peak > 0, self._value / self._peak - 1, 0.0)
+        return pd.DataFrame({
+            "date": self.dates.astype("datetime64[ns]"),
+            "portfolio_value": self._value,
+            "invested": invested,
+            "profit": self._value - invested,
+            "drawdown": drawdown * 100,
+        })
+
+    def holdings_value(self) -> pd.DataFrame:
+        """Daily value of each holding (dates x scheme codes)."""
+        return pd.DataFrame(
+            np.where(self._units != 0, self._units * np.nan_to_num(self._nav), 0.0),
+            index=pd.DatetimeIndex(self.dates.astype("datetime64[ns]"), name="date"),
+            columns=self.scheme_codes,
+        )
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+import config.constants as CONSTANTS
+
+
+class SimulationResult:
+    """
+    Columnar investment history produced by `MFSimulator`.
+
+    Each column is a typed NumPy array; rows are appended into preallocated buffers
+    (grown geometrically if needed) instead of building one dict per investment. The
+    weekday is stored as an int8 code (0 = Monday) and only expanded to names as a
+    categorical when exported.
+
+    Columns:
+        - date (datetime64[ns]): NAV date of the investment.
+        - weekday (int8): Weekday code of `date`.
+        - nav (float64): NAV used for the investment.
+        - dip_factor (float64): Dip factor on that date.
+        - dip_buy (float64): Lumpsum part of the investment.
+        - sip (float64): SIP part of the investment.
+        - total_investment (float64): Amount invested.
+        - units (float64): Units bought.
+
+    Public Methods:
+        append(...) -> None
+            Add one investment row.
+        to_pandas() -> pd.DataFrame
+            DataFrame view over the column arrays (no copy of numeric columns).
+        to_arrow() -> pyarrow.Table
+            Arrow table over the column arrays.
+        to_parquet(path) / to_feather(path) -> None
+            Persist the result, e.g. for saved runs.
+        from_parquet(path) / from_feather(path) / from_pandas(df) -> SimulationResult
+            Load a persisted or legacy (list-of-dicts) result.
+    """
+
+    COLUMNS = {
+        "date": "datetime64[ns]",
+        "weekday": np.int8,
+        "nav": np.float64,
+        "dip_factor": np.float64,
+        "dip_buy": np.float64,
+        "sip": np.float64,
+        "total_investment": np.float64,
+        "units": np.float64,
+    }
+    WEEKDAYS = [CONSTANTS.WEEKDAY_MAPPING[i] for i in range(7)]
+
+    def __init__(self, capacity: int = 0, columns: dict = None):
+        if columns is not None:
+            self._columns = {
+                name: np.asarray(columns[name], dtype=dtype) for name, dtype in self.COLUMNS.items()
+            }
+            self._size = len(self._columns["date"])
+        else:
+            self._columns = {
+                name: np.empty(max(capacity, 1), dtype=dtype) for name, dtype in self.COLUMNS.items()
+            }
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Return a read-only view of one column."""
+        view = self._columns[column][:self._size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def columns(self) -> list:
+        return list(self.COLUMNS)
+
+    @property
+    def empty(self) -> bool:
+        return self._size == 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self[name].nbytes for name in self.COLUMNS)
+
+    def append(self, date, nav, dip_factor, dip_buy, sip, total_investment, units) -> None:
+        """Add one investment row, growing the buffers if they are full."""
+        if self._size == len(self._columns["date"]):
+            self._columns = {
+                name: np.resize(array, 2 * len(array)) for name, array in self._columns.items()
+            }
+        date = pd.Timestamp(date)
+        row = self._size
+        self._columns["date"][row] = date.to_datetime64()
+        self._columns["weekday"][row] = date.weekday()
+        self._columns["nav"][row] = nav
+        self._columns["dip_factor"][row] = dip_factor
+        self._columns["dip_buy"][row] = dip_buy
+        self._columns["sip"][row] = sip
+        self._columns["total_investment"][row] = total_investment
+        self._columns["units"][row] = units
+        self._size += 1
+
+    # Export
+    def to_pandas(self) -> pd.DataFrame:
+        """Return the result as a DataFrame sharing memory with the column arrays.
+
+        The weekday column is exported as a categorical of weekday names.
+        """
+        data = {name: self._columns[name][:self._size] for name in self.COLUMNS}
+        data["weekday"] = pd.Categorical.from_codes(data["weekday"], categories=self.WEEKDAYS)
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """Return the result as a `pyarrow.Table` (numeric columns are not copied)."""
+        import pyarrow as pa
+
+        arrays = {name: pa.array(self._columns[name][:self._size]) for name in self.COLUMNS}
+        arrays["weekday"] = pa.DictionaryArray.from_arrays(arrays["weekday"], pa.array(self.WEEKDAYS))
+        return pa.table(arrays)
+
+    def to_parquet(self, path) -> None:
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path)
+
+    def to_feather(self, path) -> None:
+        import pyarrow.feather as feather
+
+        feather.write_feather(self.to_arrow(), path)
+
+    # Import
+    @classmethod
+    def from_pandas(cls, df: pd.DataFrame) -> "SimulationResult":
+        """Build a result from a DataFrame with the simulator's column names.
+
+        Accepts both this class's export and the legacy list-of-dicts history, where
+        `weekday` holds weekday names.
+        """
+        if df.empty:
+            return cls()
+        columns = {name: df[name].to_numpy() for name in cls.COLUMNS if name != "weekday"}
+        columns["date"] = pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]")
+        columns["weekday"] = pd.DatetimeIndex(columns["date"]).weekday.to_numpy()
+        return cls(columns=columns)
+
+    @classmethod
+    def from_arrow(cls, table) -> "SimulationResult":
+        return cls.from_pandas(table.to_pandas())
+
+    @classmethod
+    def from_parquet(cls, path) -> "SimulationResult":
+        import pyarrow.parquet as pq
+
+        return cls.from_arrow(pq.read_table(path))
+
+    @classmethod
+    def from_feather(cls, path) -> "SimulationResult":
+        import pyarrow.feather as feather
+
+        return cls.from_arrow(feather.read_table(path))
+
+    def __repr__(self) -> str:
+        return f"SimulationResult(rows={self._size}, nbytes={self.nbytes})"
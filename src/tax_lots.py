@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+import config.constants as CONSTANTS
+from mftools_wrapper import MFClient
+
+UNITS_TOLERANCE = 1e-6  # rounding slack when comparing unit balances
+
+
+def _normalize(transactions) -> pd.DataFrame:
+    """Typed transactions in holding order: per scheme by NAV date, purchases before redemptions of the same day."""
+    df = pd.DataFrame(transactions)
+    if df.empty:
+        df = pd.DataFrame(columns=["investment_id", "scheme_code", "scheme_name", "amount_invested", "units_bought", "nav_date"])
+    df = df.assign(
+        scheme_code=df["scheme_code"].astype(str),
+        nav_date=pd.to_datetime(df["nav_date"], format="%Y-%m-%d"),
+        units_bought=df["units_bought"].astype(float),
+        amount_invested=df["amount_invested"].astype(float),
+    )
+    return (
+        df.assign(_is_sell=df["units_bought"] < 0)
+        .sort_values(["scheme_code", "nav_date", "_is_sell"], kind="stable")
+        .drop(columns="_is_sell")
+        .reset_index(drop=True)
+    )
+
+
+def oversold(transactions) -> pd.DataFrame:
+    """Redemptions that exceed the units held on their NAV date.
+
+    Returns:
+        pd.DataFrame: The offending redemptions (in holding order) with an extra
+        'units_held' column - the balance after them, negative by the oversold units.
+    """
+    txns = _normalize(transactions)
+    units_held = txns.groupby("scheme_code", sort=False)["units_bought"].cumsum()
+    return txns.assign(units_held=units_held)[(txns["units_bought"] < 0) & (units_held < -UNITS_TOLERANCE)]
+
+
+def redeemable_units(transactions, nav_date) -> float:
+    """Units of one scheme that can be redeemed on `nav_date`.
+
+    That is the balance on that date, capped so that no later redemption is left without
+    units to match.
+
+    Args:
+        transactions (pd.DataFrame | list[dict]): Transactions of a single scheme.
+        nav_date: Date of the redemption.
+    """
+    txns = _normalize(transactions)
+    if txns.empty:
+        return 0.0
+    balance = txns["units_bought"].cumsum()
+    from_date = balance[txns["nav_date"] >= pd.Timestamp(nav_date)]
+    held_on_date = balance[txns["nav_date"] <= pd.Timestamp(nav_date)]
+    held = held_on_date.iloc[-1] if len(held_on_date) else 0.0
+    return max(0.0, min([held, *from_date]))
+
+
+class TaxLotEngine:
+    """
+    FIFO lot accounting for purchases and redemptions.
+
+    Every purchase is a lot. Redemptions (transactions with negative `units_bought`, as
+    stored by `MyInvestmentsManager.add_redemption`) consume lots first-in-first-out in
+    NAV-date order (purchases of a day before its redemptions). As no redemption may exceed
+    the units held on its date, it only ever matches lots bought on or before that date.
+    The matching is done on cumulative-unit axes: the union of lot and redemption
+    boundaries splits the redeemed units into segments, and `np.searchsorted` finds the
+    lot and redemption of every segment at once. All schemes are matched in the same pass
+    on disjoint ranges of one global axis - no per-lot or per-scheme Python loop.
+
+    Parameters:
+        transactions (pd.DataFrame | list[dict]): Transactions with ['investment_id',
+            'scheme_code', 'scheme_name', 'amount_invested', 'units_bought', 'nav_date'].
+        current_navs (dict, optional): scheme_code -> latest NAV, used for unrealized gains.
+            Fetched in one batch via `MFClient.get_scheme_quotes` if None.
+        as_of (optional): Date used for holding periods of open lots. Defaults to today.
+        long_term_days (int, optional): Holding period (days) above which a gain is long
+            term. Defaults to `CONSTANTS.LONG_TERM_HOLDING_DAYS`.
+
+    Raises:
+        ValueError: If a redemption exceeds the units held on its date (see `oversold`).
+
+    Public Methods:
+        lots() -> pd.DataFrame
+            Every purchase lot with redeemed/remaining units and unrealized gain.
+        realized() -> pd.DataFrame
+            Every (redemption, lot) match with cost, proceeds and realized gain.
+        cost_basis() -> pd.DataFrame
+            Remaining units, remaining cost and realized gain per scheme.
+        summary() -> pd.DataFrame
+            Realized and unrealized gains per scheme and holding-period bucket.
+    """
+
+    def __init__(self, transactions, current_navs: dict = None, as_of=None, long_term_days: int = None):
+        self.long_term_days = long_term_days or CONSTANTS.LONG_TERM_HOLDING_DAYS
+        self.as_of = pd.Timestamp(as_of or pd.Timestamp.today()).normalize()
+        self.transactions = _normalize(transactions)
+        invalid = oversold(self.transactions)
+        if not invalid.empty:
+            first = invalid.iloc[0]
+            raise ValueError(
+                f"Redemption {first['investment_id']} of scheme {first['scheme_code']} on "
+                f"{first['nav_date']:%Y-%m-%d} exceeds the units held by {-first['units_held']:.4f}"
+            )
+        if current_navs is None and not self.transactions.empty:
+            quotes = MFClient().get_scheme_quotes(self.transactions["scheme_code"].unique())
+            current_navs = {code: float(quote["nav"]) for code, quote in quotes.items()}
+        self.current_navs = {str(k): float(v) for k, v in (current_navs or {}).items()}
+        self._lots, self._realized = self._match()
+
+    def _bucket(self, holding_days: np.ndarray) -> np.ndarray:
+        return np.where(holding_days > self.long_term_days, "long_term", "short_term")
+
+    def _match(self):
+        txns = self.transactions
+        scheme_ids, scheme_codes = pd.factorize(txns["scheme_code"], sort=True)
+        units = txns["units_bought"].to_numpy()
+        amounts = txns["amount_invested"].to_numpy()
+        dates = txns["nav_date"].to_numpy(dtype="datetime64[D]")
+        ids = txns["investment_id"].to_numpy()
+        is_buy = units > 0
+        is_sell = units < 0
+        n_schemes = len(scheme_codes)
+
+        # Every scheme gets its own disjoint range of one global cumulative-unit axis
+        bought = np.bincount(scheme_ids[is_buy], units[is_buy], minlength=n_schemes)
+        sold = np.bincount(scheme_ids[is_sell], -units[is_sell], minlength=n_schemes)
+        matched = np.minimum(bought, sold)
+        span = np.maximum(bought, sold)
+        offset = np.cumsum(span) - span
+
+        lot_scheme, lot_units = scheme_ids[is_buy], units[is_buy]
+        lot_end = offset[lot_scheme] + np.cumsum(lot_units) - (np.cumsum(bought) - bought)[lot_scheme]
+        lot_start = lot_end - lot_units
+        sell_scheme, sell_units = scheme_ids[is_sell], -units[is_sell]
+        sell_end = offset[sell_scheme] + np.cumsum(sell_units) - (np.cumsum(sold) - sold)[sell_scheme]
+
+        # Split the matched part of every scheme's range at all lot / redemption boundaries
+        bounds = np.unique(np.concatenate([offset, offset + matched, lot_end, sell_end]))
+        seg_start, seg_units = bounds[:-1], np.diff(bounds)
+        seg_scheme = np.searchsorted(offset, seg_start, side="right") - 1
+        keep = (seg_units > 1e-9) & (seg_start < offset[seg_scheme] + matched[seg_scheme] - 1e-9)
+        seg_start, seg_units = seg_start[keep], seg_units[keep]
+
+        lot_idx = np.searchsorted(lot_end, seg_start, side="right")
+        sell_idx = np.searchsorted(sell_end, seg_start, side="right")
+
+        cost_per_unit = amounts[is_buy] / lot_units
+        proceeds_per_unit = -amounts[is_sell] / sell_units if len(sell_units) else np.empty(0)
+        buy_dates, sell_dates = dates[is_buy], dates[is_sell]
+        holding_days = (sell_dates[sell_idx] - buy_dates[lot_idx]).astype(int)
+
+        realized = pd.DataFrame({
+            "scheme_code": np.asarray(scheme_codes)[lot_scheme[lot_idx]],
+            "lot_id": ids[is_buy][lot_idx],
+            "redemption_id": ids[is_sell][sell_idx],
+            "buy_date": buy_dates[lot_idx].astype("datetime64[ns]"),
+            "sell_date": sell_dates[sell_idx].astype("datetime64[ns]"),
+            "units": seg_units,
+            "cost": seg_units * cost_per_unit[lot_idx],
+            "proceeds": seg_units * proceeds_per_unit[sell_idx],
+            "holding_days": holding_days,
+        })
+        realized["gain"] = realized["proceeds"] - realized["cost"]
+        realized["term"] = self._bucket(holding_days)
+
+        units_redeemed = np.clip((offset + matched)[lot_scheme] - lot_start, 0.0, lot_units)
+        units_remaining = lot_units - units_redeemed
+        current_nav = np.array([self.current_navs.get(code, np.nan) for code in scheme_codes])[lot_scheme]
+        open_days = (np.datetime64(self.as_of.date(), "D") - buy_dates).astype(int)
+
+        lots = pd.DataFrame({
+            "scheme_code": np.asarray(scheme_codes)[lot_scheme],
+            "scheme_name": txns["scheme_name"].to_numpy()[is_buy],
+            "lot_id": ids[is_buy],
+            "buy_date": buy_dates.astype("datetime64[ns]"),
+            "units": lot_units,
+            "cost": amounts[is_buy],
+            "cost_per_unit": cost_per_unit,
+            "units_redeemed": units_redeemed,
+            "units_remaining": units_remaining,
+            "remaining_cost": units_remaining * cost_per_unit,
+            "current_value": units_remaining * current_nav,
+            "holding_days": open_days,
+            "term": self._bucket(open_days),
+        })
+        lots["unrealized_gain"] = lots["current_value"] - lots["remaining_cost"]
+        return lots, realized
+
+    def lots(self) -> pd.DataFrame:
+        """Purchase lots.
+
+        Returns:
+            pd.DataFrame: One row per purchase with columns ['scheme_code', 'scheme_name',
+            'lot_id', 'buy_date', 'units', 'cost', 'cost_per_unit', 'units_redeemed',
+            'units_remaining', 'remaining_cost', 'current_value', 'holding_days', 'term',
+            'unrealized_gain'], where `term` is 'short_term' or 'long_term' as of `as_of`.
+        """
+        return self._lots
+
+    def realized(self) -> pd.DataFrame:
+        """FIFO matches of redemptions to lots.
+
+        Returns:
+            pd.DataFrame: One row per (redemption, lot) segment with columns ['scheme_code',
+            'lot_id', 'redemption_id', 'buy_date', 'sell_date', 'units', 'cost', 'proceeds',
+            'holding_days', 'gain', 'term'].
+        """
+        return self._realized
+
+    def cost_basis(self) -> pd.DataFrame:
+        """Remaining (FIFO) cost of the units still held, per scheme.
+
+        Returns:
+            pd.DataFrame: Indexed by 'scheme_code' with columns ['units_remaining',
+            'remaining_cost', 'realized_gain'].
+        """
+        open_lots = self._lots.groupby("scheme_code")[["units_remaining", "remaining_cost"]].sum()
+        realized = self._realized.groupby("scheme_code")["gain"].sum().rename("realized_gain")
+        return open_lots.join(realized, how="left").fillna({"realized_gain": 0.0})
+
+    def summary(self) -> pd.DataFrame:
+        """Realized and unrealized gains per scheme and holding-period bucket."""
+        realized = self._realized.groupby(["scheme_code", "term"])["gain"].sum().rename("realized_gain")
+        unrealized = (
+            self._lots[self._lots["units_remaining"] > 0]
+            .groupby(["scheme_code", "term"])["unrealized_gain"].sum()
+        )
+        return (
+            pd.concat([realized, unrealized], axis=1)
+            .fillna(0.0)
+            .reset_index()
+        )
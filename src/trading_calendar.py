@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+
+class TradingCalendar:
+    """
+    Dense day-offset index mapping any calendar date to a row of a NAV history.
+
+    The index is built once per scheme from the (ascending) NAV dates: for every calendar
+    day between the first and the last NAV date it stores the position of the nearest NAV
+    row on or before that day and on or after that day. Resolving a date is then a single
+    array lookup instead of a scan of the NAV frame.
+
+    Holiday policies (what to do when a scheduled date has no NAV):
+        - "previous": use the latest NAV on or before the date.
+        - "next": use the earliest NAV on or after the date.
+        - "skip": only accept dates that have a NAV; otherwise the date is skipped.
+
+    Parameters:
+        dates (array-like): NAV dates sorted in ascending order. Returned indices are
+            positions in this sequence.
+
+    Public Methods:
+        resolve(dates, policy) -> np.ndarray
+            Vectorized lookup; -1 marks dates that cannot be resolved.
+        resolve_one(date, policy) -> int | None
+            Scalar lookup; None marks a date that cannot be resolved.
+    """
+
+    POLICIES = ("previous", "next", "skip")
+
+    def __init__(self, dates):
+        self.dates = pd.to_datetime(pd.Series(dates)).to_numpy().astype("datetime64[D]")
+        if len(self.dates) == 0:
+            raise ValueError("TradingCalendar requires at least one NAV date")
+        if np.any(np.diff(self.dates) < np.timedelta64(0, "D")):
+            raise ValueError("NAV dates must be sorted in ascending order")
+
+        self.start = self.dates[0]
+        self.n_days = int((self.dates[-1] - self.start).astype(np.int64)) + 1
+        # A date listed more than once resolves to its first row (as a scan of the frame would)
+        offsets, positions = np.unique((self.dates - self.start).astype(np.int64), return_index=True)
+
+        self._is_trading = np.zeros(self.n_days, dtype=bool)
+        self._is_trading[offsets] = True
+
+        prev_idx = np.full(self.n_days, -1, dtype=np.int64)
+        prev_idx[offsets] = positions
+        self._prev_idx = np.maximum.accumulate(prev_idx)
+
+        next_idx = np.full(self.n_days, len(self.dates), dtype=np.int64)
+        next_idx[offsets] = positions
+        self._next_idx = np.minimum.accumulate(next_idx[::-1])[::-1]
+
+    @classmethod
+    def _check_policy(cls, policy: str) -> str:
+        policy = policy.lower()
+        if policy not in cls.POLICIES:
+            raise ValueError(f"Unknown holiday policy '{policy}', expected one of {cls.POLICIES}")
+        return policy
+
+    def resolve(self, dates, policy: str = "previous") -> np.ndarray:
+        """Resolve calendar dates to NAV row positions.
+
+        Args:
+            dates (array-like): Calendar dates of any shape.
+            policy (str): One of "previous", "next" or "skip".
+
+        Returns:
+            np.ndarray: Integer positions with the same shape as `dates`; -1 where the date
+            cannot be resolved under the policy.
+        """
+        policy = self._check_policy(policy)
+        offsets = (np.asarray(dates, dtype="datetime64[D]") - self.start).astype(np.int64)
+        before, after = offsets < 0, offsets >= self.n_days
+        clipped = np.clip(offsets, 0, self.n_days - 1)
+
+        if policy == "previous":
+            idx = np.where(before, -1, self._prev_idx[clipped])
+        elif policy == "next":
+            idx = np.where(after, -1, self._next_idx[clipped])
+        else:
+            idx = np.where(before | after | ~self._is_trading[clipped], -1, self._prev_idx[clipped])
+        return idx
+
+    def resolve_one(self, date, policy: str = "previous"):
+        """Scalar version of `resolve`.
+
+        Returns:
+            int | None: NAV row position, or None if the date cannot be resolved.
+        """
+        idx = int(self.resolve(np.datetime64(pd.Timestamp(date).date(), "D"), policy))
+        return idx if idx >= 0 else None
+
+    def is_trading_day(self, date) -> bool:
+        """Return True if a NAV exists on exactly this date."""
+        return self.resolve_one(date, "skip") is not None
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import tracing
+from .downsampling import downsample_frame
+from .line_chart_plotter import LineChartPlotter
+
+
+def nav_version(df: pd.DataFrame) -> str:
+    """Cheap fingerprint of a NAV history: row count plus latest date and NAV."""
+    if df.empty:
+        return "empty"
+    date_col = "date" if "date" in df.columns else "Date"
+    nav_col = "nav" if "nav" in df.columns else "Nav"
+    latest = df[date_col].idxmax() if pd.api.types.is_datetime64_any_dtype(df[date_col]) else df.index[0]
+    return f"{len(df)}:{df.at[latest, date_col]}:{df.at[latest, nav_col]}"
+
+
+class ChartData:
+    """
+    Time series prepared once in the chart-ready long format used by `LineChartPlotter`.
+
+    Columns are relabeled, the dates parsed and sorted, the weekday computed and the frame
+    melted to ['Date', 'Weekday', 'Metric', 'Value'] a single time. Each metric occupies a
+    contiguous, date-sorted block, so any date window is a positional slice found with
+    `np.searchsorted` - no copy, filter or melt per chart.
+
+    Parameters:
+        df (pd.DataFrame): Frame with a 'date'/'Date' column and numeric columns.
+
+    Public Methods:
+        window(value_cols=None, start_date=None, end_date=None, max_points=None) -> pd.DataFrame
+            Long-format rows of the given metrics within the date range, optionally downsampled.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        wide = pd.DataFrame({col.replace('_', ' ').title(): df[col] for col in df.columns})
+        wide["Date"] = pd.to_datetime(wide["Date"])
+        wide = wide.sort_values("Date", kind="stable").reset_index(drop=True)
+
+        self.metrics = [c for c in wide.select_dtypes(include="number").columns if c != "Date"]
+        self.dates = wide["Date"].to_numpy(dtype="datetime64[ns]")
+        n = len(wide)
+        weekday = pd.Categorical(wide["Date"].dt.strftime("%A"))
+        self.long = pd.DataFrame({
+            "Date": np.tile(self.dates, len(self.metrics)),
+            "Weekday": pd.Categorical.from_codes(np.tile(weekday.codes, len(self.metrics)), weekday.categories),
+            "Metric": pd.Categorical(np.repeat(self.metrics, n), categories=self.metrics),
+            "Value": np.concatenate([wide[m].to_numpy(dtype=float) for m in self.metrics]) if self.metrics else [],
+        })
+        self._block = {metric: i * n for i, metric in enumerate(self.metrics)}
+        self._n = n
+
+    def _bounds(self, start_date=None, end_date=None) -> tuple:
+        lo = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date)), side="left") if start_date else 0
+        hi = np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date)), side="right") if end_date else self._n
+        return int(lo), int(hi)
+
+    def window(self, value_cols=None, start_date=None, end_date=None, max_points=None) -> pd.DataFrame:
+        """Long-format slice of `value_cols` (default: all metrics) between the dates (inclusive).
+
+        When downsampled, one set of dates is selected for the window (the union of the
+        points kept for each metric) and used for every metric, so the lines stay aligned.
+        """
+        value_cols = [c.replace('_', ' ').title() for c in value_cols] if value_cols else self.metrics
+        lo, hi = self._bounds(start_date, end_date)
+        positions = np.arange(lo, hi)
+        if max_points and hi - lo > max_points:
+            wide = pd.DataFrame({"Date": self.dates[lo:hi]})
+            for metric in value_cols:
+                wide[metric] = self.long["Value"].to_numpy()[self._block[metric] + lo:self._block[metric] + hi]
+            selected = downsample_frame(wide, "Date", value_cols, max_points, method=LineChartPlotter.DOWNSAMPLE_METHOD)
+            positions = lo + selected.index.to_numpy()
+        blocks = []
+        for metric in value_cols:
+            if len(positions) == hi - lo:
+                blocks.append(self.long.iloc[self._block[metric] + lo:self._block[metric] + hi])
+            else:
+                blocks.append(self.long.iloc[self._block[metric] + positions])
+        if len(blocks) == 1:
+            return blocks[0]
+        return pd.concat(blocks, ignore_index=True) if blocks else self.long.iloc[:0]
+
+
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_chart_data(scheme_code: str, version: str, _df: pd.DataFrame) -> ChartData:
+    """`ChartData` of a scheme's NAV history, built once per (scheme, NAV version) and shared."""
+    with tracing.span("chart.prepare", scheme_code=scheme_code, rows=len(_df)):
+        return ChartData(_df)
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def get_chart_spec(scheme_code: str, version: str, window: tuple, _chart_data: ChartData) -> dict:
+    """Vega-Lite spec (data included) of one window of a scheme's chart.
+
+    Args:
+        window (tuple): (value_cols, start_date, end_date, max_points); part of the cache key.
+    """
+    value_cols, start_date, end_date, max_points = window
+    with tracing.span("chart.build_spec", scheme_code=scheme_code):
+        df_melt = _chart_data.window(list(value_cols), start_date, end_date, max_points)
+        if df_melt.empty:
+            return {}
+        return LineChartPlotter.build_chart(df_melt).to_dict()
+
+
+@tracing.traced("chart.render_cached")
+def render_cached_chart(
+        scheme_code: str,
+        df: pd.DataFrame,
+        value_cols: list,
+        start_date=None,
+        end_date=None,
+        max_points="auto",
+        zoom_key: str = None) -> None:
+    """Render one window of a scheme's chart from the cached data and spec.
+
+    Args:
+        scheme_code (str): Scheme the data belongs to (cache key together with `nav_version`).
+        df (pd.DataFrame): The scheme's NAV history; only read on a cache miss.
+        value_cols (list): Columns to plot.
+        start_date / end_date (optional): Date range (inclusive).
+        max_points (int | "auto" | None): As in `LineChartPlotter.plot`.
+        zoom_key (str, optional): As in `LineChartPlotter.plot`; the zoomed window is
+            sliced from the cached data at full resolution when it fits `max_points`.
+    """
+    if max_points == "auto":
+        max_points = LineChartPlotter.CHART_WIDTH
+    version = nav_version(df)
+    start_date = str(pd.Timestamp(start_date).date()) if start_date else None
+    end_date = str(pd.Timestamp(end_date).date()) if end_date else None
+    chart_data = get_chart_data(str(scheme_code), version, df)
+    lo, hi = chart_data._bounds(start_date, end_date)
+    if zoom_key and max_points and hi - lo > max_points:
+        first, last = pd.Timestamp(chart_data.dates[lo]).to_pydatetime(), pd.Timestamp(chart_data.dates[hi - 1]).to_pydatetime()
+        zoom_start, zoom_end = st.slider(
+            "Zoom", min_value=first, max_value=last, value=(first, last), format="YYYY-MM-DD", key=zoom_key
+        )
+        start_date, end_date = str(zoom_start.date()), str(zoom_end.date())
+    spec = get_chart_spec(str(scheme_code), version, (tuple(value_cols), start_date, end_date, max_points), chart_data)
+    if not spec:
+        st.warning("No data available for given filters.")
+        return
+    st.vega_lite_chart(spec, use_container_width=True)
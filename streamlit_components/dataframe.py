@@ -2,11 +2,15 @@ import pandas as pd
 import streamlit as st
 
 def show_dataframe(df: pd.DataFrame, transpose = False):
-    """Display a styled DataFrame in Streamlit."""
-    df = df.copy()
-    df.columns = [col.replace("_", " ").title() for col in df.columns]
+    """Display a styled DataFrame in Streamlit.
+
+    Column titles are prettified through `column_config` labels, so the frame itself
+    is not copied (only the transposed view is materialized).
+    """
+    labels = {col: str(col).replace("_", " ").title() for col in df.columns}
 
     if transpose:
-        df = df.T
-    st.dataframe(df)
-    st.caption(f"Total Values: {len(df)}")
+        st.dataframe(df.rename(columns=labels).T)
+    else:
+        st.dataframe(df, column_config=labels)
+    st.caption(f"Total Values: {len(df.columns) if transpose else len(df)}")
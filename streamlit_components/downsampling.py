@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `n_out` points that preserve the shape of (x, y).
+
+    The first and last points are always kept. The rest is split into `n_out - 2` buckets
+    and from each bucket the point forming the largest triangle with the previously kept
+    point and the average of the next bucket is chosen.
+
+    Args:
+        x (np.ndarray): Increasing x values (e.g. dates as int64 / float).
+        y (np.ndarray): Values.
+        n_out (int): Number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices into x / y.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype(float)
+    y = y.astype(float)
+    # Bucket boundaries for the n - 2 inner points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Average point of every bucket (used as the third vertex of the previous bucket)
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+        area = np.abs(
+            (x[a] - cx) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (cy - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each of `n_buckets` equal buckets (plus both ends)."""
+    n = len(y)
+    if 2 * n_buckets + 2 >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    order = np.lexsort((y, bucket))  # by bucket, then value
+    first = order[edges[:-1]]
+    last = order[edges[1:] - 1]
+    return np.unique(np.concatenate([[0, n - 1], first, last]))
+
+
+def downsample_frame(
+        df: pd.DataFrame,
+        x_col: str,
+        value_cols: list,
+        max_points: int,
+        method: str = "lttb") -> pd.DataFrame:
+    """
+    Reduce `df` to about `max_points` rows per value column, keeping the line shapes.
+
+    Rows selected for any value column are kept for all of them, so multi-line charts stay
+    aligned on the x axis. Frames that already fit are returned unchanged.
+
+    Args:
+        df (pd.DataFrame): Data sorted by `x_col`.
+        x_col (str): Datetime or numeric x column.
+        value_cols (list): Columns whose shape must be preserved.
+        max_points (int): Target number of points per line.
+        method (str): "lttb" or "minmax".
+
+    Returns:
+        pd.DataFrame: The selected rows.
+    """
+    if max_points is None or len(df) <= max_points:
+        return df
+    x = df[x_col].to_numpy()
+    x = x.astype("datetime64[ns]").astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+
+    keep = []
+    for col in value_cols:
+        y = df[col].to_numpy(dtype=float)
+        valid = np.flatnonzero(~np.isnan(y))
+        if method == "minmax":
+            idx = minmax_indices(y[valid], max(1, max_points // 2))
+        else:
+            idx = lttb_indices(x[valid], y[valid], max_points)
+        keep.append(valid[idx])
+    return df.iloc[np.unique(np.concatenate(keep))] if keep else df
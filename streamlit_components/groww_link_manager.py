@@ -1,52 +1,41 @@
-import os
-import json
-from googlesearch import search
 import streamlit as st
+from utils import groww_links
+
+
+@st.fragment(run_every=2)
+def _pending_link(scheme_name: str):
+    """Placeholder that polls the shared store until the background search has finished.
+
+    Once it has, the app is rerun: `GrowwLinkManager.add_groww_link` then renders the
+    result directly and this fragment (and its timer) is gone.
+    """
+    state, _ = groww_links.lookup(scheme_name)
+    if state != groww_links.PENDING:
+        st.rerun()
+    groww_links.request([scheme_name])  # no-op while queued; re-queues an expired miss
+    st.caption("Looking up Groww link...")
 
 
 class GrowwLinkManager:
-    def __init__(self, cache_file="data/groww_links.json"):
-        self.cache_file = cache_file
-        self._cache = self._load_cache()   # private cache
-
-    def _load_cache(self):
-        if os.path.exists(self.cache_file):
-            with open(self.cache_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {}
-
-    def _save_cache(self):
-        with open(self.cache_file, "w", encoding="utf-8") as f:
-            json.dump(self._cache, f, ensure_ascii=False, indent=2)
-
-    def _find_groww_link(self, scheme_name: str) -> str:
-        # First check cache
-        if scheme_name in self._cache:
-            return self._cache[scheme_name]
-
-        # Otherwise search via Google
-        query = f'site:groww.in/mutual-funds "{scheme_name}"'
-        try:
-            for url in search(query, num_results=5):
-                if "groww.in/mutual-funds" in url:
-                    self._cache[scheme_name] = url
-                    self._save_cache()
-                    return url
-        except Exception as e:
-            st.write(f"Search error: {e}")
-
-        # Cache the miss as None
-        self._cache[scheme_name] = None
-        self._save_cache()
-        return None
+    """
+    Renders Groww links without blocking the page.
+
+    Links come from the shared `utils.groww_links` store. A scheme that has not been
+    looked up yet is queued for the background resolver and shown as a placeholder,
+    which fills in once the link is found.
+
+    Public Methods:
+        add_groww_link(scheme_name)
+            Adds the scheme's Groww link (or a placeholder) to the Streamlit UI.
+    """
 
     def add_groww_link(self, scheme_name: str):
         """Public method — adds a Groww link to the Streamlit UI."""
-        try:
-            link = self._find_groww_link(scheme_name)
-            if link:
-                st.markdown(f"[Groww Link]({link})")
-            else:
-                st.write("No Groww link found.")
-        except Exception as e:
-            st.write(f"Error finding Groww link: {e}")
+        state, link = groww_links.lookup(scheme_name)
+        if state == groww_links.FOUND:
+            st.markdown(f"[Groww Link]({link})")
+        elif state == groww_links.NOT_FOUND:
+            st.write("No Groww link found.")
+        else:
+            groww_links.request([scheme_name])
+            _pending_link(scheme_name)
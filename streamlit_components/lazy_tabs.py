@@ -0,0 +1,31 @@
+import streamlit as st
+from typing import Callable, Dict, Optional
+
+
+def render_lazy_tabs(panels: Dict[str, Callable[[], None]], key: str, default: Optional[str] = None) -> str:
+    """
+    Tab-like selector that builds only the active panel.
+
+    Unlike `st.tabs`, which runs every tab body on each rerun, only the callable of the
+    selected label is executed. Combined with cached panel content (e.g.
+    `chart_data.render_cached_chart`), a panel is built the first time it is viewed and
+    served from the cache afterwards.
+
+    Args:
+        panels (dict[str, Callable]): Tab label -> function rendering the panel.
+        key (str): Widget key (keeps the selection across reruns).
+        default (str, optional): Initially selected label. Defaults to the first one.
+
+    Returns:
+        str: The active label.
+    """
+    labels = list(panels)
+    default = default or labels[0]
+    if hasattr(st, "segmented_control"):
+        active = st.segmented_control("View", labels, default=default, key=key, label_visibility="collapsed")
+    else:
+        active = st.radio("View", labels, index=labels.index(default), key=key, horizontal=True, label_visibility="collapsed")
+    # A segmented control can be deselected; fall back to the default panel
+    active = active or default
+    panels[active]()
+    return active
@@ -1,6 +1,8 @@
 import pandas as pd
 import altair as alt
 import streamlit as st
+from utils import tracing
+from .downsampling import downsample_frame
 
 
 class LineChartPlotter:
@@ -9,18 +11,32 @@ class LineChartPlotter:
     
     Attributes:
         df (pd.DataFrame): DataFrame containing 'Date' column and numeric columns to plot.
+
+    Long series are downsampled (LTTB by default) to about one point per horizontal pixel
+    of the chart before they are sent to the browser; see `plot`.
     """
+    CHART_WIDTH = 1500
+    DOWNSAMPLE_METHOD = "lttb"  # or "minmax"
 
     def __init__(self, df: pd.DataFrame):
         if "Date" not in df.columns and 'date' not in df.columns:
             raise ValueError("DataFrame must contain a 'Date' column.")
-        self.df = df.copy()
-        self.df.columns = self.df.columns.str.replace('_', ' ').str.title()
-        self.df["Date"] = pd.to_datetime(self.df["Date"])
+        # Re-label columns without copying the underlying arrays
+        self.df = pd.DataFrame(
+            {col.replace('_', ' ').title(): df[col] for col in df.columns},
+            copy=False
+        )
+        if not pd.api.types.is_datetime64_any_dtype(self.df["Date"]):
+            self.df["Date"] = pd.to_datetime(self.df["Date"])
+
+    def _zoom_range(self, df: pd.DataFrame, zoom_key: str):
+        """Date range slider shown for downsampled charts; the selected range is drawn at full resolution."""
+        dates = df["Date"].sort_values()
+        lo, hi = dates.iloc[0].to_pydatetime(), dates.iloc[-1].to_pydatetime()
+        return st.slider("Zoom", min_value=lo, max_value=hi, value=(lo, hi), format="YYYY-MM-DD", key=zoom_key)
 
-    def _preprocess(self, value_cols=None, start_date=None, end_date=None) -> pd.DataFrame:
-        df = self.df.copy()
-        df["Weekday"] = df["Date"].dt.strftime("%A")
+    def _preprocess(self, value_cols=None, start_date=None, end_date=None, max_points=None, zoom_key=None) -> pd.DataFrame:
+        df = self.df
         if start_date:
             df = df[df["Date"] >= start_date]
         if end_date:
@@ -31,6 +47,15 @@ class LineChartPlotter:
             c for c in df.select_dtypes(include="number").columns if c != "Date"
         ]
 
+        if max_points and len(df) > max_points:
+            if zoom_key:
+                zoom_start, zoom_end = self._zoom_range(df, zoom_key)
+                df = df[(df["Date"] >= zoom_start) & (df["Date"] <= zoom_end)]
+            df = downsample_frame(
+                df.sort_values("Date"), "Date", value_cols, max_points, method=self.DOWNSAMPLE_METHOD
+            )
+
+        df = df.assign(Weekday=df["Date"].dt.strftime("%A"))
         return df.melt(
             id_vars=["Date", "Weekday"],
             value_vars=value_cols,
@@ -38,17 +63,37 @@ class LineChartPlotter:
             value_name="Value"
         )
 
-    def plot(self, value_cols=None, start_date=None, end_date=None):
-        """Plot interactive line chart with crosshairs and hover tooltips."""
+    @tracing.traced("chart.plot")
+    def plot(self, value_cols=None, start_date=None, end_date=None, max_points="auto", zoom_key=None):
+        """Plot interactive line chart with crosshairs and hover tooltips.
+
+        Args:
+            value_cols (list, optional): Columns to plot. Defaults to all numeric columns.
+            start_date / end_date (optional): Date range to plot.
+            max_points (int | "auto" | None): Points per line sent to the browser; longer
+                ranges are downsampled. "auto" uses one point per pixel of `CHART_WIDTH`,
+                None plots every row.
+            zoom_key (str, optional): Widget key of a date-range slider shown for
+                downsampled charts. The zoomed range is downsampled only if it still
+                exceeds `max_points`, so narrow ranges are drawn at full resolution.
+        """
         if self.df.empty:
             st.warning("No data available for the selected date range.")
             return
-        value_cols = [col.replace('_', ' ').title() for col in value_cols]
-        df_melt = self._preprocess(value_cols, start_date, end_date)
+        if value_cols:
+            value_cols = [col.replace('_', ' ').title() for col in value_cols]
+        if max_points == "auto":
+            max_points = self.CHART_WIDTH
+        df_melt = self._preprocess(value_cols, start_date, end_date, max_points, zoom_key)
         if df_melt.empty:
             st.warning("No data available for given filters.")
             return
+        st.altair_chart(self.build_chart(df_melt), use_container_width=True)
 
+    @classmethod
+    def build_chart(cls, df_melt: pd.DataFrame) -> alt.Chart:
+        """Layered Altair chart (line, hover points/labels and crosshair rules) of long-format
+        ['Date', 'Weekday', 'Metric', 'Value'] data."""
         hover = alt.selection_point(
             fields=["Date"], 
             nearest=True, 
@@ -79,7 +124,7 @@ class LineChartPlotter:
             ),
             tooltip=["Date:T", "Weekday:N", "Metric:N", alt.Tooltip("Value:Q", format=".2f")]
         ).properties(
-            width=1500,
+            width=cls.CHART_WIDTH,
             height=400,
         )
 
@@ -104,7 +149,7 @@ class LineChartPlotter:
         ).transform_filter(hover)
 
         chart = (line + points + text + vline + hline).interactive()
-        chart = (
+        return (
             chart
             .configure_view(stroke=None)
             .configure_axis(
@@ -116,8 +161,6 @@ class LineChartPlotter:
                 padding={"left": 60, "right": 20, "top": 20, "bottom": 30}  # force equal margins
             )
         )
-                
-        st.altair_chart(chart, use_container_width=True)
 
 
 
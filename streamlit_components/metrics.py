@@ -3,13 +3,17 @@ from streamlit_components.line_chart_plotter import LineChartPlotter
 from streamlit_components.dataframe import show_dataframe
 from mftools_wrapper import MFScheme
 from src.mf_simulator import MFSimulator
+from src.simulation_result import SimulationResult
 import pandas as pd
 
 
 def show_simulation_metrics(
-        investment_history: pd.DataFrame, 
+        investment_history: SimulationResult, 
         final_metrics: dict,
         simulator_obj: MFSimulator):
+    # Single zero-copy conversion shared by the table and the charts
+    history_df = investment_history.to_pandas()
+
     # Showing Final Metrics 
     col1, col2, col3, col4 = st.columns(4)
 
@@ -25,10 +29,10 @@ def show_simulation_metrics(
 
     # Detailed Simulation Data
     st.subheader("Detailed Simulation Data")
-    show_dataframe(investment_history)
+    show_dataframe(history_df)
 
     # Plots
-    line_chart_plotter = LineChartPlotter(investment_history)
+    line_chart_plotter = LineChartPlotter(history_df)
 
     st.subheader("Investment Strategy Simulation")
     line_chart_plotter.plot(
@@ -41,8 +45,8 @@ def show_simulation_metrics(
     )
 
     st.subheader("Daily Nav Chart")
-    start_date = pd.to_datetime(investment_history['date'].min())
-    end_date = pd.to_datetime(investment_history['date'].max())
+    start_date = history_df['date'].min()
+    end_date = history_df['date'].max()
     LineChartPlotter(simulator_obj.nav_df).plot(
         value_cols=['nav'],
         start_date=start_date,
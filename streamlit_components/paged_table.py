@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils import tracing
+
+
+def _filter_mask(df: pd.DataFrame, column: str, query: str) -> np.ndarray:
+    """Case-insensitive substring match of `query` in `column` (all columns if None)."""
+    columns = [column] if column else list(df.columns)
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        mask |= df[col].astype(str).str.contains(query, case=False, regex=False).to_numpy()
+    return mask
+
+
+@tracing.traced("table.page")
+def show_paged_table(df: pd.DataFrame, key: str, page_size: int = 50, sort_by: str = None, ascending: bool = True):
+    """Display a large DataFrame one page at a time, with server-side sort and filter.
+
+    Sorting, filtering and paging run on the full frame in the app; only the visible page
+    is serialized and sent to the browser. Column titles are prettified as in
+    `show_dataframe`.
+
+    Args:
+        df (pd.DataFrame): Data to display (not modified or copied).
+        key (str): Prefix of the widget keys (must be unique on the page).
+        page_size (int): Initial rows per page.
+        sort_by (str, optional): Initial sort column. Defaults to the frame order.
+        ascending (bool): Initial sort direction.
+    """
+    labels = {col: str(col).replace("_", " ").title() for col in df.columns}
+    columns = list(df.columns)
+
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+    query = col1.text_input("Filter", key=f"{key}_filter", placeholder="Contains...")
+    filter_col = col2.selectbox(
+        "in column", [None] + columns, key=f"{key}_filter_col",
+        format_func=lambda c: "All columns" if c is None else labels[c]
+    )
+    sort_col = col3.selectbox(
+        "Sort by", [None] + columns, key=f"{key}_sort",
+        index=columns.index(sort_by) + 1 if sort_by in columns else 0,
+        format_func=lambda c: "Default order" if c is None else labels[c]
+    )
+    descending = col4.toggle("Desc", value=not ascending, key=f"{key}_desc")
+
+    positions = np.arange(len(df))
+    if query:
+        positions = positions[_filter_mask(df, filter_col, query)]
+    if sort_col is not None:
+        values = df[sort_col].to_numpy()[positions]
+        order = np.argsort(values, kind="stable") if values.dtype != object else np.argsort(values.astype(str), kind="stable")
+        positions = positions[order[::-1] if descending else order]
+
+    total = len(positions)
+    nav1, nav2, _ = st.columns([1, 1, 4])
+    page_size = nav2.selectbox("Rows per page", [25, 50, 100, 250], key=f"{key}_page_size",
+                               index=[25, 50, 100, 250].index(page_size) if page_size in (25, 50, 100, 250) else 1)
+    n_pages = max(1, -(-total // page_size))
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages  # e.g. after a narrower filter
+    page = nav1.number_input("Page", min_value=1, max_value=n_pages, step=1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    page_df = df.iloc[positions[start:start + page_size]]
+    st.dataframe(page_df, column_config=labels)
+
+    filtered = f" (filtered from {len(df)})" if total != len(df) else ""
+    st.caption(f"Rows {start + 1 if total else 0}–{min(start + page_size, total)} of {total}{filtered} · page {page} of {n_pages}")
@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from .line_chart_plotter import LineChartPlotter
+from .chart_data import render_cached_chart
 from typing import Optional
 
-def render_nav_chart(df: pd.DataFrame, days: int, section_index: Optional[int] = None) -> None:
+def render_nav_chart(
+        df: pd.DataFrame,
+        days: int,
+        section_index: Optional[int] = None,
+        scheme_code: Optional[str] = None) -> None:
     """
     Render a NAV line chart for the last `days` days.
 
@@ -13,13 +18,13 @@ def render_nav_chart(df: pd.DataFrame, days: int, section_index: Optional[int] =
         days (int): Number of trailing days to display.
         section_index (int, optional): Section number for ordering in Streamlit layout.
                                        If None, no numbering is shown.
+        scheme_code (str, optional): If given, the chart is served from the per-scheme
+                                     chart data / spec cache (see `chart_data`).
     """
-    df = df.copy()
-    df.columns = df.columns.str.replace('_', ' ').str.title()
-
+    date_col = "Date" if "Date" in df.columns else "date"
     start_date = max(
         (datetime.today() - pd.DateOffset(days=days)),
-        pd.to_datetime(df["Date"]).min()
+        pd.to_datetime(df[date_col]).min()
     ).strftime("%Y-%m-%d")
     
     end_date = datetime.today().strftime("%Y-%m-%d")
@@ -28,6 +33,10 @@ def render_nav_chart(df: pd.DataFrame, days: int, section_index: Optional[int] =
     title = f"{section_index}. NAV Trend (last {days} days)" if section_index is not None else f"NAV Trend (last {days} days)"
     st.subheader(title)
 
+    if scheme_code is not None:
+        render_cached_chart(scheme_code, df, ["Nav"], start_date=start_date, end_date=end_date)
+        return
+
     LineChartPlotter(df).plot(
         value_cols=["Nav"],
         start_date=start_date,
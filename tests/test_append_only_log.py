@@ -0,0 +1,115 @@
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+
+from utils import data_loader, gcs_client
+from utils.data_loader import AppendOnlyJSONManager
+from utils.gcs_emulator import EmulatedBlob, EmulatedBucket
+
+
+class Manager(AppendOnlyJSONManager):
+    def __init__(self):
+        super().__init__("test_log.json")
+
+
+@pytest.fixture
+def bucket():
+    bucket = EmulatedBucket(AppendOnlyJSONManager.BUCKET_NAME)
+    gcs_client.set_bucket_factory(lambda name: bucket)
+    data_loader.clear_caches()
+    yield bucket
+    gcs_client.set_bucket_factory(None)
+    data_loader.clear_caches()
+
+
+def test_mutating_loaded_items_does_not_touch_the_cache(bucket):
+    manager = Manager()
+    item = {"id": "a", "weeks": 100}
+    manager.put_item(item)
+    item["weeks"] = 1  # the caller's object is not the logged one
+
+    loaded = manager.load_data()
+    loaded[0]["weeks"] = 200  # e.g. SimulationManager.save_simulation updating in place
+    assert manager.load_data() == [{"id": "a", "weeks": 100}]
+
+
+def test_listing_is_reused_within_ttl(bucket):
+    manager = Manager()
+    manager.put_item({"id": "a"})
+    manager.load_data()
+    bucket.reset_counts()
+
+    manager.put_item({"id": "b"})  # local writes are added to the cached listing
+    assert sorted(d["id"] for d in manager.load_data()) == ["a", "b"]
+    assert bucket.request_counts().get("list", 0) == 0
+
+
+def segment_names(bucket, manager):
+    return [blob.name for blob in sorted(bucket.list_blobs(prefix=manager.log_prefix), key=lambda b: b.generation)]
+
+
+def test_reads_never_compact(bucket):
+    manager = Manager()
+    manager.COMPACT_AFTER = 3
+    for key in "abc":
+        bucket.blob(f"{manager.log_prefix}{key}.json").upload_from_string(
+            f'{{"op": "put", "key": "{key}", "item": {{"id": "{key}"}}}}'
+        )
+    bucket.reset_counts()
+    assert len(manager.load_data()) == 3
+    assert "upload" not in bucket.request_counts() and "delete" not in bucket.request_counts()
+
+    manager.put_item({"id": "d"})  # the write past COMPACT_AFTER folds the log
+    assert segment_names(bucket, manager) == []
+    data_loader.clear_caches()
+    assert sorted(d["id"] for d in manager.load_data()) == ["a", "b", "c", "d"]
+
+
+def test_order_does_not_depend_on_writer_clocks(bucket, monkeypatch):
+    manager = Manager()
+    manager.put_item({"id": "a"})
+    monkeypatch.setattr("time.time_ns", lambda: 0)  # a writer whose clock is far behind
+    manager.delete_item("a")
+    data_loader.clear_caches()
+    assert manager.load_data() == []
+
+
+def test_partial_compaction_does_not_resurrect_deleted_items(bucket, monkeypatch):
+    manager = Manager()
+    manager.COMPACT_AFTER = 3
+    manager.put_item({"id": "a"})
+    manager.put_item({"id": "b"})
+    manager.load_data()
+    failing = segment_names(bucket, manager)[1]
+
+    delete = EmulatedBlob.delete
+
+    def flaky_delete(blob):
+        if blob.name == failing:
+            raise ServiceUnavailable("flaky")
+        delete(blob)
+    monkeypatch.setattr(EmulatedBlob, "delete", flaky_delete)
+
+    manager.delete_item("a")  # compacts; only the oldest segment goes
+    assert len(segment_names(bucket, manager)) == 2
+    assert manager.load_data() == [{"id": "b"}]
+
+    data_loader.clear_caches()
+    assert manager.load_data() == [{"id": "b"}]
+
+
+def test_read_racing_a_compaction_rereads_the_snapshot(bucket):
+    reader, writer = Manager(), Manager()
+    reader.put_item({"id": "a"})
+    reader.delete_item("a")
+    reader.put_item({"id": "b"})
+    assert reader.load_data() == [{"id": "b"}]
+
+    # Another process compacts; this process still has the old listing and snapshot cached
+    with data_loader._CACHE_LOCK:
+        saved = dict(data_loader._CACHE), dict(data_loader._LISTING_CACHE)
+        data_loader._SEGMENT_CACHE.clear()
+    writer.compact()
+    with data_loader._CACHE_LOCK:
+        data_loader._CACHE.update(saved[0])
+        data_loader._LISTING_CACHE.update(saved[1])
+    assert reader.load_data() == [{"id": "b"}]
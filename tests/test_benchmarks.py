@@ -0,0 +1,50 @@
+import json
+
+import pandas as pd
+
+from benchmarks import run
+from benchmarks.synthetic import generate_nav_history
+
+
+def test_synthetic_history_is_deterministic():
+    first = generate_nav_history(500, seed=42)
+    pd.testing.assert_frame_equal(first, generate_nav_history(500, seed=42))
+    assert not first["nav"].equals(generate_nav_history(500, seed=43)["nav"])
+
+
+def test_synthetic_history_shape():
+    df = generate_nav_history(500, seed=1)
+    assert len(df) == 500
+    assert list(df.columns) == ["date", "nav", "day", "month", "year"]
+    assert df["date"].is_monotonic_decreasing and df["date"].is_unique
+    assert (df["date"].dt.dayofweek < 5).all()
+
+
+def test_save_baseline_then_compare(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["--sizes", "300", "--repeat", "1", "--only", "simulator_init", "--baseline", str(baseline)]
+
+    assert run.main(args + ["--save-baseline"]) == 0
+    saved = json.loads(baseline.read_text())
+    assert set(saved["results"]) == {"simulator_init@300"}
+    assert set(saved["results"]["simulator_init@300"]) == {"time_s", "peak_mb"}
+
+    # A generous threshold: only the workflow is under test, not the timings
+    assert run.main(args + ["--threshold", "1000"]) == 0
+    assert "No regressions" in capsys.readouterr().out
+
+
+def test_missing_baseline_only_verifies(tmp_path, capsys):
+    args = ["--sizes", "300", "--repeat", "1", "--only", "simulator_init", "--baseline", str(tmp_path / "none.json")]
+    assert run.main(args) == 0
+    assert "--save-baseline" in capsys.readouterr().out
+
+
+def test_compare_flags_regressions():
+    baseline = {"a@1": {"time_s": 1.0, "peak_mb": 1.0}, "b@1": {"time_s": 1.0, "peak_mb": 1.0}}
+    results = {
+        "a@1": {"time_s": 1.1, "peak_mb": 1.0},
+        "b@1": {"time_s": 2.0, "peak_mb": 1.0},
+        "c@1": {"time_s": 9.0, "peak_mb": 9.0},  # not in the baseline
+    }
+    assert run.compare(results, baseline, 0.2) == ["b@1 time_s: 1.0000 -> 2.0000"]
@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+from utils import cache_warmer, caching
+
+
+class StopLoop(Exception):
+    pass
+
+
+@pytest.fixture
+def state_path(tmp_path, monkeypatch):
+    path = tmp_path / "state" / "cache_warmer.json"
+    monkeypatch.setattr(cache_warmer, "CACHE_WARMER_STATE_PATH", str(path))
+    return path
+
+
+@pytest.fixture
+def loop(monkeypatch):
+    """Run one iteration of the scheduler loop; returns the `run` calls."""
+    calls = []
+
+    def run():
+        calls.append(True)
+        return {"schemes": 1, "nav_date": cache_warmer.last_publication().date(), "errors": 0}
+
+    def sleep(seconds):
+        raise StopLoop
+
+    monkeypatch.setattr(cache_warmer, "run", run)
+    monkeypatch.setattr(cache_warmer.time, "sleep", sleep)
+
+    def iterate():
+        with pytest.raises(StopLoop):
+            cache_warmer._schedule_loop()
+        return calls
+    return iterate
+
+
+def test_warmed_publication_round_trip(state_path):
+    assert cache_warmer._warmed_publication() is None
+    published = cache_warmer.last_publication()
+    cache_warmer._save_warmed_publication(published, {"nav_date": published.date()})
+    assert cache_warmer._warmed_publication() == published
+
+
+def test_unreadable_state_is_ignored(state_path):
+    state_path.parent.mkdir()
+    state_path.write_text("{not json")
+    assert cache_warmer._warmed_publication() is None
+
+
+def test_start_up_skips_a_warmed_publication(state_path, loop):
+    cache_warmer._save_warmed_publication(cache_warmer.last_publication(), {})
+    assert loop() == []
+
+
+def test_start_up_runs_an_unwarmed_publication(state_path, loop):
+    previous = cache_warmer.last_publication() - datetime.timedelta(days=1)
+    cache_warmer._save_warmed_publication(previous, {})
+    assert loop() == [True]
+    assert cache_warmer._warmed_publication() == cache_warmer.last_publication()
+
+
+def test_no_warm_up_without_a_shared_cache(monkeypatch):
+    assert not caching.shared_storage()  # pytest runs without a Streamlit runtime
+    monkeypatch.setattr(cache_warmer, "CACHE_WARMER_ENABLED", True)
+    monkeypatch.setattr(cache_warmer, "_user_schemes", lambda: pytest.fail("must not load schemes"))
+    assert cache_warmer.run() == {"skipped": True}
+    assert cache_warmer.start() is False
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streamlit_components.chart_data import ChartData
+
+
+@pytest.fixture
+def chart_data():
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2020-01-01", periods=600)
+    df = pd.DataFrame({
+        "date": dates.strftime("%Y-%m-%d")[::-1],  # unsorted input
+        "nav": np.cumsum(rng.normal(size=600))[::-1],
+        "invested": np.cumsum(rng.normal(size=600))[::-1],
+    })
+    return ChartData(df)
+
+
+def test_window_bounds_are_inclusive(chart_data):
+    dates = pd.DatetimeIndex(chart_data.dates)
+    out = chart_data.window(["nav"], str(dates[10].date()), str(dates[20].date()))
+    assert out["Date"].iloc[0] == dates[10] and out["Date"].iloc[-1] == dates[20]
+    assert len(out) == 11
+    assert out["Date"].is_monotonic_increasing
+
+
+def test_window_bounds_between_dates(chart_data):
+    # 2020-01-04 is a Saturday: the window starts on the following Monday
+    out = chart_data.window(["nav"], "2020-01-04", "2020-01-10")
+    assert list(out["Date"].dt.strftime("%Y-%m-%d")) == [
+        "2020-01-06", "2020-01-07", "2020-01-08", "2020-01-09", "2020-01-10"
+    ]
+
+
+def test_window_without_bounds_covers_every_metric(chart_data):
+    out = chart_data.window()
+    assert list(out["Metric"].cat.categories) == ["Nav", "Invested"]
+    assert len(out) == 2 * 600
+
+
+def test_downsampled_window_shares_dates_across_metrics(chart_data):
+    out = chart_data.window(["nav", "invested"], "2020-03-01", None, max_points=50)
+    nav = out[out["Metric"] == "Nav"]["Date"].to_numpy()
+    invested = out[out["Metric"] == "Invested"]["Date"].to_numpy()
+    assert np.array_equal(nav, invested)
+    assert len(nav) < 600 and len(nav) <= 2 * 50
+    assert nav[0] == np.datetime64("2020-03-02") and nav[-1] == chart_data.dates[-1]
+    assert np.all(np.diff(nav) > np.timedelta64(0))
+
+
+def test_window_that_fits_is_not_downsampled(chart_data):
+    out = chart_data.window(["nav", "invested"], "2020-01-01", "2020-01-31", max_points=50)
+    assert len(out) == 2 * 23
@@ -0,0 +1,52 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.dip_factor import DipFactorCalculator
+
+DROPS = [-40.0, -15.0, -10.0, -7.5, -5.0, -2.0, 0.0, 3.0, float("nan")]
+
+
+def baseline_normalize(d: float, min_th: float, max_th: float) -> float:
+    """The original scalar `_normalize_drop` (which raised for a NaN drop with equal thresholds)."""
+    if d > -min_th:
+        return 0.0
+    if d <= -max_th:
+        return 1.0
+    if max_th == min_th:
+        return float("nan")
+    return (-d - min_th) / (max_th - min_th)
+
+
+def _calculator(drop_threshold_range):
+    return DipFactorCalculator({"peak": 0.0, "avg": 0.0}, {"peak": 0.0, "avg": 0.0}, drop_threshold_range=drop_threshold_range)
+
+
+@pytest.mark.parametrize("drop_threshold_range", [(5, 15), (0, 10), (10, 10), (15, 5)])
+def test_normalize_matches_baseline_for_scalars(drop_threshold_range):
+    calculator = _calculator(drop_threshold_range)
+    for d in DROPS:
+        expected = baseline_normalize(d, *drop_threshold_range)
+        result = calculator._normalize_drop(d)
+        assert np.ndim(result) == 0
+        assert (math.isnan(result) and math.isnan(expected)) or result == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("drop_threshold_range", [(5, 15), (10, 10), (15, 5)])
+def test_normalize_matches_baseline_for_arrays(drop_threshold_range):
+    expected = [baseline_normalize(d, *drop_threshold_range) for d in DROPS]
+    result = _calculator(drop_threshold_range)._normalize_drop(np.array(DROPS))
+    np.testing.assert_allclose(result, expected)
+
+
+def test_dip_factor_is_weighted_average():
+    calculator = DipFactorCalculator(
+        recent_drops={"peak": -15.0, "avg": -5.0},
+        historical_drops={"peak": -10.0, "avg": 0.0},
+        weights={"recent_vs_historical": 0.6, "peak_vs_average": 0.7},
+        drop_threshold_range=(5, 15),
+    )
+    recent = 0.7 * 1.0 + 0.3 * 0.0
+    historical = 0.7 * 0.5 + 0.3 * 0.0
+    assert calculator.calculate_dip_factor() == pytest.approx(0.6 * recent + 0.4 * historical)
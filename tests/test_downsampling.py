@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streamlit_components.downsampling import downsample_frame, lttb_indices, minmax_indices
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    x = np.arange(1000, dtype=float)
+    y = np.cumsum(rng.normal(size=1000))
+    return x, y
+
+
+def test_lttb_keeps_endpoints_and_count(series):
+    x, y = series
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+@pytest.mark.parametrize("n_out", [2, 5, 10])
+def test_lttb_short_series_pass_through(n_out):
+    x = np.arange(5, dtype=float)
+    assert np.array_equal(lttb_indices(x, x ** 2, n_out), np.arange(5))
+
+
+def test_minmax_keeps_endpoints_and_extremes(series):
+    _, y = series
+    idx = minmax_indices(y, 50)
+    assert len(idx) <= 2 * 50 + 2
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert np.argmin(y) in idx and np.argmax(y) in idx
+    # Every bucket keeps its own minimum and maximum
+    edges = np.linspace(0, len(y), 51).astype(int)
+    for start, end in zip(edges[:-1], edges[1:]):
+        assert start + np.argmin(y[start:end]) in idx
+        assert start + np.argmax(y[start:end]) in idx
+
+
+def test_minmax_short_series_pass_through():
+    y = np.array([3.0, 1.0, 2.0, 5.0])
+    assert np.array_equal(minmax_indices(y, 10), np.arange(4))
+
+
+def _frame(n=500):
+    rng = np.random.default_rng(3)
+    return pd.DataFrame({
+        "Date": pd.date_range("2020-01-01", periods=n, freq="D"),
+        "a": np.cumsum(rng.normal(size=n)),
+        "b": np.cumsum(rng.normal(size=n)),
+    })
+
+
+def test_downsample_frame_returns_fitting_frames_unchanged():
+    df = _frame(50)
+    assert downsample_frame(df, "Date", ["a", "b"], 50) is df
+    assert downsample_frame(df, "Date", ["a", "b"], None) is df
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_frame_shared_sorted_rows(method):
+    df = _frame()
+    out = downsample_frame(df, "Date", ["a", "b"], 60, method=method)
+    positions = out.index.to_numpy()
+    assert positions[0] == 0 and positions[-1] == len(df) - 1
+    assert np.all(np.diff(positions) > 0)
+    # At most max_points rows per line, shared by both lines
+    assert len(out) <= 2 * 60
+    assert out["Date"].is_monotonic_increasing
+
+
+def test_downsample_frame_single_column_respects_max_points():
+    df = _frame()
+    assert len(downsample_frame(df, "Date", ["a"], 80)) <= 80
+
+
+def test_downsample_frame_skips_nan_rows():
+    df = _frame()
+    df.loc[:99, "b"] = np.nan  # "b" starts later
+    df.loc[250, "a"] = np.nan
+    out = downsample_frame(df, "Date", ["b"], 40)
+    assert out["b"].notna().all()
+    assert out.index[0] == 100 and out.index[-1] == len(df) - 1
+
+    out = downsample_frame(df, "Date", ["a"], 40, method="minmax")
+    assert out["a"].notna().all()
+    assert df["a"].idxmin() in out.index and df["a"].idxmax() in out.index
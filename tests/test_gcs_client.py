@@ -0,0 +1,46 @@
+import gzip
+import json
+
+import pytest
+
+from utils import gcs_client
+from utils.gcs_client import GCSClient, decode_payload, encode_payload
+from utils.gcs_emulator import EmulatedBucket
+
+DATA = [{"scheme_code": "100", "name": "Scheme 100 – Direct", "units": 1.5}, {"nested": {"a": [1, 2, None]}}]
+
+
+def test_gzip_round_trip():
+    body, encoding = encode_payload(DATA, "json-gzip")
+    assert encoding == "gzip"
+    assert body[:2] == gcs_client.GZIP_MAGIC
+    assert json.loads(gzip.decompress(body)) == DATA
+    assert decode_payload(body) == DATA
+
+
+def test_gzip_payload_is_deterministic():
+    assert encode_payload(DATA, "json-gzip")[0] == encode_payload(DATA, "json-gzip")[0]
+
+
+def test_plain_json_round_trip():
+    body, encoding = encode_payload(DATA, "json")
+    assert encoding is None
+    assert decode_payload(body) == DATA
+
+
+def test_reads_legacy_plain_json_object():
+    bucket = EmulatedBucket("legacy")
+    bucket.blob("watchlist.json").upload_from_string(json.dumps({"a": 1}, indent=4), content_type="application/json")
+    blob = bucket.get_blob("watchlist.json")
+    assert blob.content_encoding is None
+    assert GCSClient.download_json(blob) == {"a": 1}
+
+
+@pytest.mark.parametrize("storage_format, encoding", [("json-gzip", "gzip"), ("json", None)])
+def test_upload_sets_content_encoding(monkeypatch, storage_format, encoding):
+    monkeypatch.setattr(gcs_client, "STORAGE_FORMAT", storage_format)
+    bucket = EmulatedBucket("upload")
+    GCSClient.upload_json(bucket.blob("data.json"), DATA)
+    blob = bucket.get_blob("data.json")
+    assert blob.content_encoding == encoding
+    assert GCSClient.download_json(blob) == DATA
@@ -0,0 +1,53 @@
+import pytest
+
+from utils import data_loader, gcs_client
+from utils.data_loader import GCSJSONManager, HoldingsManager, MyInvestmentsManager
+from utils.gcs_emulator import EmulatedBucket
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    bucket = EmulatedBucket(GCSJSONManager.BUCKET_NAME)
+    gcs_client.set_bucket_factory(lambda name: bucket)
+    data_loader.clear_caches()
+    monkeypatch.setattr(data_loader.time, "sleep", lambda seconds: None)
+    yield bucket
+    gcs_client.set_bucket_factory(None)
+    data_loader.clear_caches()
+
+
+def investment(scheme_code, units, amount, nav_date="2024-01-01"):
+    return {"scheme_code": scheme_code, "scheme_name": f"Scheme {scheme_code}", "nav_date": nav_date,
+            "units_bought": units, "amount_invested": amount}
+
+
+def test_failed_aggregate_write_is_retried(bucket, monkeypatch):
+    mutate, failures = HoldingsManager.mutate, []
+
+    def flaky_mutate(self, fn, **kwargs):
+        if not failures:
+            failures.append(1)
+            raise ConnectionError("write failed")
+        return mutate(self, fn, **kwargs)
+    monkeypatch.setattr(HoldingsManager, "mutate", flaky_mutate)
+
+    manager = MyInvestmentsManager()
+    manager.add_investment(investment("100", 10, 1000))
+    assert [h["total_units"] for h in HoldingsManager().load_data()] == [10]
+
+
+def test_stale_aggregate_falls_back_to_the_transactions(bucket, monkeypatch):
+    manager = MyInvestmentsManager()
+    manager.add_investment(investment("100", 10, 1000))
+    monkeypatch.setattr(HoldingsManager, "mutate", lambda self, fn, **kwargs: (_ for _ in ()).throw(ConnectionError()))
+    manager.add_investment(investment("200", 5, 500))
+    monkeypatch.undo()
+
+    transactions = manager.load_data()
+    assert [h["scheme_code"] for h in manager.load_holdings()] == ["100"]  # stored, stale
+    holdings = manager.load_holdings(transactions)
+    assert sorted(h["scheme_code"] for h in holdings) == ["100", "200"]
+    assert [h["scheme_code"] for h in HoldingsManager().load_data()] == ["100"]  # reads never write
+
+    assert manager.migrate_holdings()
+    assert manager.load_holdings(transactions) == HoldingsManager.build(transactions)
@@ -0,0 +1,59 @@
+import pytest
+
+from utils import data_loader, gcs_client
+from utils.data_loader import MOVE_FIELD, GCSJSONManager
+from utils.gcs_emulator import EmulatedBucket
+
+
+@pytest.fixture
+def bucket():
+    bucket = EmulatedBucket(GCSJSONManager.BUCKET_NAME)
+    gcs_client.set_bucket_factory(lambda name: bucket)
+    data_loader.clear_caches()
+    yield bucket
+    gcs_client.set_bucket_factory(None)
+    data_loader.clear_caches()
+
+
+def managers():
+    source, target = GCSJSONManager("source.json"), GCSJSONManager("target.json")
+    source.save_data([{"scheme_code": "100", "scheme_name": "A"}, {"scheme_code": "200", "scheme_name": "B"}])
+    target.save_data([{"scheme_code": "100", "scheme_name": "old"}])
+    return source, target
+
+
+def test_transaction_is_one_write(bucket):
+    _, target = managers()
+    bucket.reset_counts()
+    with target.transaction() as batch:
+        batch.remove_item("scheme_code", "100")
+        batch.add_item({"scheme_code": "300", "scheme_name": "C"}, unique_key="scheme_code")
+    assert bucket.request_counts()["upload"] == 1
+    assert [d["scheme_code"] for d in target.load_data()] == ["300"]
+
+
+def test_move_item(bucket):
+    source, target = managers()
+    source.move_item(target, {"scheme_code": "100", "scheme_name": "A"}, unique_key="scheme_code")
+    assert source.load_data() == [{"scheme_code": "200", "scheme_name": "B"}]
+    assert target.load_data() == [{"scheme_code": "100", "scheme_name": "A"}]
+
+
+def test_move_torn_between_writes_is_finished_on_read(bucket, monkeypatch):
+    source, target = managers()
+
+    def fail(*args, **kwargs):
+        raise ConnectionError("process died")
+    monkeypatch.setattr(source, "remove_item", fail)
+    with pytest.raises(ConnectionError):
+        source.move_item(target, {"scheme_code": "100", "scheme_name": "A"}, unique_key="scheme_code")
+    monkeypatch.undo()
+
+    data_loader.clear_caches()
+    stored, _ = target._load_with_generation()
+    assert stored[0][MOVE_FIELD] == {"file": "source.json", "key": "scheme_code"}
+
+    assert target.load_data() == [{"scheme_code": "100", "scheme_name": "A"}]  # repairs
+    assert [d["scheme_code"] for d in source.load_data()] == ["200"]
+    stored, _ = target._load_with_generation()
+    assert MOVE_FIELD not in stored[0]
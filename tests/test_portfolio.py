@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from src.portfolio import PortfolioValuation
+
+QUOTES = {
+    "100": {"nav": "300", "last_updated": "01-Jan-2025", "scheme_name": "Scheme 100"},
+    "200": {"nav": "50", "last_updated": "01-Jan-2025", "scheme_name": "Scheme 200"},
+}
+TRANSACTIONS = [
+    {"investment_id": "a1", "scheme_code": "100", "scheme_name": "Scheme 100", "nav_date": "2024-01-01", "units_bought": 10.0, "amount_invested": 1000.0},
+    {"investment_id": "a2", "scheme_code": "100", "scheme_name": "Scheme 100", "nav_date": "2024-03-01", "units_bought": -4.0, "amount_invested": -800.0},
+    {"investment_id": "b1", "scheme_code": "200", "scheme_name": "Scheme 200", "nav_date": "2024-06-03", "units_bought": 20.0, "amount_invested": 800.0},
+]
+HOLDINGS = [
+    {
+        "scheme_code": "100", "scheme_name": "Scheme 100", "total_units": 6.0, "total_invested": 600.0,
+        "first_date": "2024-01-01", "last_date": "2024-03-01", "transaction_ids": ["a1", "a2"],
+        "transaction_dates": ["2024-01-01", "2024-03-01"], "transaction_units": [10.0, -4.0],
+        "transaction_amounts": [1000.0, -800.0],
+    },
+    {
+        "scheme_code": "200", "scheme_name": "Scheme 200", "total_units": 20.0, "total_invested": 800.0,
+        "first_date": "2024-06-03", "last_date": "2024-06-03", "transaction_ids": ["b1"],
+        "transaction_dates": ["2024-06-03"], "transaction_units": [20.0], "transaction_amounts": [800.0],
+    },
+]
+COLUMNS = ["scheme_code", "total_invested", "total_units", "final_value", "roi", "xirr"]
+
+
+def test_aggregate_matches_transactions():
+    from_transactions = PortfolioValuation(pd.DataFrame(TRANSACTIONS), quotes=QUOTES)
+    from_aggregate = PortfolioValuation(pd.DataFrame(TRANSACTIONS), quotes=QUOTES, holdings=HOLDINGS)
+    pd.testing.assert_frame_equal(
+        from_aggregate.holdings()[COLUMNS].sort_values("scheme_code").reset_index(drop=True),
+        from_transactions.holdings()[COLUMNS].sort_values("scheme_code").reset_index(drop=True),
+    )
+    assert from_aggregate.totals() == pytest.approx(from_transactions.totals())
+
+
+def test_aggregate_needs_no_transactions():
+    # XIRR cash flows come from the stored aggregate, the transactions are never regrouped
+    valuation = PortfolioValuation(pd.DataFrame(), quotes=QUOTES, holdings=HOLDINGS)
+    holdings = valuation.holdings().set_index("scheme_code")
+    assert holdings.at["100", "final_value"] == pytest.approx(1800)
+    assert holdings.at["200", "xirr"] > 0
+    assert valuation.totals()["total_invested"] == pytest.approx(1400)
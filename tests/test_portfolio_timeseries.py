@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio_timeseries import PortfolioHistory
+
+END_DATE = "2024-06-28"
+
+
+def nav_history(start_nav, step):
+    dates = pd.bdate_range("2023-12-01", END_DATE)
+    return pd.DataFrame({"date": dates, "nav": start_nav + step * np.arange(len(dates))})
+
+
+NAV_HISTORIES = {"100": nav_history(100.0, 0.5), "200": nav_history(50.0, -0.05), "300": nav_history(10.0, 0.01)}
+
+
+def nav_loader(scheme_codes):
+    return {code: NAV_HISTORIES[code] for code in scheme_codes}
+
+
+def txn(investment_id, scheme_code, nav_date, units, amount):
+    return {"investment_id": investment_id, "scheme_code": scheme_code, "scheme_name": f"Scheme {scheme_code}",
+            "nav_date": nav_date, "units_bought": units, "amount_invested": amount}
+
+
+TRANSACTIONS = [
+    txn("a1", "100", "2024-01-02", 10.0, 1000.0),
+    txn("a2", "100", "2024-02-01", 10.0, 1200.0),
+    txn("a3", "100", "2024-03-01", -15.0, -2400.0),
+    txn("b1", "200", "2024-01-15", 20.0, 1000.0),
+]
+
+
+def history(transactions):
+    return PortfolioHistory(transactions, nav_loader=nav_loader, end_date=END_DATE)
+
+
+def assert_same(incremental, rebuilt):
+    pd.testing.assert_frame_equal(incremental.to_frame(), rebuilt.to_frame())
+    pd.testing.assert_frame_equal(
+        incremental.holdings_value().sort_index(axis=1), rebuilt.holdings_value().sort_index(axis=1)
+    )
+
+
+def test_invested_is_fifo_cost_after_a_profitable_redemption():
+    frame = history(TRANSACTIONS).to_frame().set_index("date")
+    after = frame.loc["2024-03-01"]
+    # 15 of 20 units sold FIFO: all of a1 (1000) and half of a2 (600) -> 600 of a2 + b1's 1000 left
+    assert after["invested"] == pytest.approx(1600.0)
+    assert (frame["invested"] >= 0).all()
+    assert frame.loc["2024-02-29", "invested"] == pytest.approx(3200.0)
+
+
+@pytest.mark.parametrize("new", [
+    txn("c1", "300", "2024-04-01", 100.0, 1000.0),   # new scheme inside the calendar
+    txn("a4", "100", "2024-01-05", 5.0, 520.0),      # purchase before an existing redemption
+    txn("a0", "100", "2023-12-04", 5.0, 500.0),      # before the calendar: rebuild fallback
+])
+def test_add_matches_rebuild(new):
+    incremental = history(TRANSACTIONS)
+    incremental.add_transaction(new)
+    assert_same(incremental, history(TRANSACTIONS + [new]))
+
+
+@pytest.mark.parametrize("removed", [
+    ["a3"],
+    ["b1"],          # last transaction of a scheme
+    ["a3", "a2"],    # a redemption first, so no redemption is left oversold
+    ["a3", "a1"],    # the first day of the calendar
+])
+def test_remove_matches_rebuild(removed):
+    incremental = history(TRANSACTIONS)
+    for t in TRANSACTIONS:
+        if t["investment_id"] in removed:
+            incremental.remove_transaction(t)
+    assert_same(incremental, history([t for t in TRANSACTIONS if t["investment_id"] not in removed]))
+
+
+def test_sync_reapplies_edited_records():
+    incremental = history(TRANSACTIONS)
+    edited = [dict(t, units_bought=12.0, amount_invested=1300.0) if t["investment_id"] == "a2" else t
+              for t in TRANSACTIONS]
+    edited.append(txn("c1", "300", "2024-04-01", 100.0, 1000.0))
+    assert incremental.sync(edited)
+    assert_same(incremental, history(edited))
+    assert not incremental.sync(edited)
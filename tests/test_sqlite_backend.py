@@ -0,0 +1,112 @@
+import json
+import threading
+
+import pytest
+
+from utils import data_loader
+from utils.data_loader import SQLiteJSONManager
+
+MANAGERS = ["BlacklistManager", "FavouritesManager", "SimulationManager", "MyInvestmentsManager", "HoldingsManager"]
+
+
+@pytest.fixture
+def sqlite_loader(tmp_path, monkeypatch):
+    """`utils.data_loader` with the managers on the SQLite backend (as with
+    ``MF_STORAGE_BACKEND=sqlite``), in a temporary database."""
+    managers = [getattr(data_loader, name) for name in MANAGERS]
+    bases = [manager.__bases__ for manager in managers]
+    for manager in managers:
+        manager.__bases__ = (SQLiteJSONManager,)
+    monkeypatch.setattr(SQLiteJSONManager, "DB_PATH", str(tmp_path / "db" / "mf.db"))
+    yield data_loader
+    for manager, base in zip(managers, bases):
+        manager.__bases__ = base
+
+
+def test_managers_use_sqlite(sqlite_loader, tmp_path):
+    assert issubclass(sqlite_loader.FavouritesManager, sqlite_loader.SQLiteJSONManager)
+    assert issubclass(sqlite_loader.SimulationManager, sqlite_loader.SQLiteJSONManager)
+    manager = sqlite_loader.FavouritesManager()
+    assert manager.load_data() == []
+    assert (tmp_path / "db" / "mf.db").exists()
+    assert manager.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_favourite_blacklist_toggle(sqlite_loader):
+    favourites, blacklist = sqlite_loader.FavouritesManager(), sqlite_loader.BlacklistManager()
+    favourites.add_favourite("100", "A")
+    favourites.add_favourite("100", "A")
+    favourites.add_favourite("200", "B")
+    blacklist.add_blacklist("100", "A")
+    assert favourites.load_data() == [{"scheme_code": "200", "scheme_name": "B"}]
+    assert blacklist.load_data() == [{"scheme_code": "100", "scheme_name": "A"}]
+    blacklist.remove_blacklist("100")
+    assert blacklist.load_data() == []
+
+
+def test_move_is_one_transaction(sqlite_loader):
+    favourites, blacklist = sqlite_loader.FavouritesManager(), sqlite_loader.BlacklistManager()
+    favourites.add_favourite("100", "A")
+    with pytest.raises(TypeError):  # fails after the source row was deleted
+        favourites.move_item(blacklist, {"scheme_code": "100", "scheme_name": object()}, unique_key="scheme_code")
+    assert [d["scheme_code"] for d in favourites.load_data()] == ["100"]
+    assert blacklist.load_data() == []
+
+
+def test_transaction_and_find_items(sqlite_loader):
+    manager = sqlite_loader.FavouritesManager()
+    with manager.transaction() as batch:
+        batch.add_item({"scheme_code": "100", "scheme_name": "A"}, unique_key="scheme_code")
+        batch.add_item({"scheme_code": "200", "scheme_name": "B"}, unique_key="scheme_code")
+        batch.remove_item("scheme_code", "100")
+    assert manager.find_items("scheme_code", "200") == [{"scheme_code": "200", "scheme_name": "B"}]
+    plan = manager.conn.execute(
+        f"EXPLAIN QUERY PLAN SELECT data FROM items WHERE file = ? AND {manager._field('scheme_code')} = ?",
+        (manager.file_name, "200"),
+    ).fetchall()
+    assert "idx_items_scheme_code" in json.dumps(plan)
+    with pytest.raises(ValueError):
+        manager.find_items("scheme_code') OR 1=1 --", "x")
+
+
+def test_simulations_put_and_delete(sqlite_loader):
+    manager = sqlite_loader.SimulationManager()
+    manager.save_simulation({"id": "s1", "Scheme Code": "100", "weeks": 10})
+    manager.save_simulation({"id": "s1", "weeks": 20})
+    manager.save_simulation({"id": "s2", "weeks": 5})
+    assert manager.load_data()[0] == {"id": "s1", "scheme_code": "100", "weeks": 20}
+    manager.delete_simulation("s1")
+    assert [d["id"] for d in manager.load_data()] == ["s2"]
+
+
+def test_investments_and_holdings(sqlite_loader):
+    manager = sqlite_loader.MyInvestmentsManager()
+    base = {"scheme_code": "100", "scheme_name": "A"}
+    manager.add_investment({**base, "nav_date": "2024-01-01", "units_bought": 10, "amount_invested": 1000})
+    manager.add_investment({**base, "nav_date": "2024-02-01", "units_bought": 10, "amount_invested": 2000})
+    manager.add_redemption({**base, "nav_date": "2024-03-01", "units_bought": 15, "amount_invested": 4500})
+    with pytest.raises(ValueError):
+        manager.add_redemption({**base, "nav_date": "2024-03-02", "units_bought": 6, "amount_invested": 600})
+    [holding] = manager.load_holdings(manager.load_data())
+    assert holding["total_units"] == pytest.approx(5)
+    assert holding["total_invested"] == pytest.approx(1000)
+    assert not manager.holdings_outdated()
+
+
+def test_concurrent_writers_on_per_thread_connections(sqlite_loader):
+    manager = sqlite_loader.FavouritesManager()
+    manager.save_data([{"scheme_code": "counter", "value": 0}])
+    connections = set()
+
+    def increment(_):
+        connections.add(id(manager.conn))
+        for _ in range(20):
+            manager.mutate(lambda data: [{**data[0], "value": data[0]["value"] + 1}])
+
+    threads = [threading.Thread(target=increment, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert manager.load_data()[0]["value"] == 80
+    assert len(connections) == 4
@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+
+from src.tax_lots import TaxLotEngine, oversold, redeemable_units
+
+
+def txn(investment_id, nav_date, units, amount, scheme_code="100"):
+    return {
+        "investment_id": investment_id, "scheme_code": scheme_code, "scheme_name": f"Scheme {scheme_code}",
+        "nav_date": nav_date, "units_bought": units, "amount_invested": amount,
+    }
+
+
+def engine(transactions, **kwargs):
+    return TaxLotEngine(transactions, current_navs={"100": 300.0, "200": 50.0}, as_of="2025-01-01", **kwargs)
+
+
+def test_partial_lot():
+    lots = engine([
+        txn("b1", "2024-01-01", 10, 1000),
+        txn("b2", "2024-02-01", 10, 2000),
+        txn("s1", "2024-03-01", -15, -4500),
+    ])
+    realized = lots.realized()
+    assert realized["lot_id"].tolist() == ["b1", "b2"]
+    assert realized["units"].tolist() == pytest.approx([10, 5])
+    assert realized["cost"].tolist() == pytest.approx([1000, 1000])
+    assert realized["proceeds"].tolist() == pytest.approx([3000, 1500])
+
+    open_lots = lots.lots().set_index("lot_id")
+    assert open_lots.at["b1", "units_remaining"] == pytest.approx(0)
+    assert open_lots.at["b2", "units_remaining"] == pytest.approx(5)
+    assert open_lots.at["b2", "remaining_cost"] == pytest.approx(1000)
+
+    basis = lots.cost_basis().loc["100"]
+    assert basis["units_remaining"] == pytest.approx(5)
+    assert basis["remaining_cost"] == pytest.approx(1000)
+    assert basis["realized_gain"] == pytest.approx(2500)
+
+
+def test_multiple_sells_and_terms():
+    realized = engine([
+        txn("b1", "2023-01-02", 10, 1000),
+        txn("s1", "2023-06-01", -4, -480),
+        txn("b2", "2024-01-02", 10, 1500),
+        txn("s2", "2024-06-03", -8, -1600),
+    ]).realized()
+    assert list(zip(realized["redemption_id"], realized["lot_id"])) == [("s1", "b1"), ("s2", "b1"), ("s2", "b2")]
+    assert realized["units"].tolist() == pytest.approx([4, 6, 2])
+    assert realized["term"].tolist() == ["short_term", "long_term", "short_term"]
+    assert (realized["holding_days"] >= 0).all()
+
+
+def test_backdated_sell_matches_only_earlier_lots():
+    # The redemption is entered after a later purchase but dated between the two
+    realized = engine([
+        txn("b1", "2024-01-01", 10, 1000),
+        txn("b2", "2024-03-01", 10, 3000),
+        txn("s1", "2024-02-01", -6, -900),
+    ]).realized()
+    assert realized["lot_id"].tolist() == ["b1"]
+    assert realized["holding_days"].tolist() == [31]
+
+
+def test_sell_exceeding_units_held_on_its_date_is_rejected():
+    transactions = [
+        txn("b1", "2024-01-01", 5, 500),
+        txn("b2", "2024-03-01", 10, 3000),
+        txn("s1", "2024-02-01", -8, -1200),
+    ]
+    assert oversold(transactions)["investment_id"].tolist() == ["s1"]
+    with pytest.raises(ValueError, match="s1"):
+        engine(transactions)
+
+
+def test_same_day_purchase_is_redeemable():
+    realized = engine([
+        txn("s1", "2024-01-01", -10, -1100),
+        txn("b1", "2024-01-01", 10, 1000),
+    ]).realized()
+    assert realized["holding_days"].tolist() == [0]
+
+
+def test_schemes_are_matched_independently():
+    basis = engine([
+        txn("a1", "2024-01-01", 10, 1000, scheme_code="100"),
+        txn("c1", "2024-01-01", 4, 200, scheme_code="200"),
+        txn("a2", "2024-02-01", -10, -1200, scheme_code="100"),
+        txn("c2", "2024-02-01", -1, -60, scheme_code="200"),
+    ]).cost_basis()
+    assert basis.loc["100", "units_remaining"] == pytest.approx(0)
+    assert basis.loc["200", "remaining_cost"] == pytest.approx(150)
+
+
+def test_redeemable_units():
+    transactions = [
+        txn("b1", "2024-01-01", 10, 1000),
+        txn("s1", "2024-03-01", -8, -1600),
+        txn("b2", "2024-04-01", 5, 1000),
+    ]
+    assert redeemable_units(transactions, "2023-12-31") == 0
+    assert redeemable_units(transactions, "2024-02-01") == pytest.approx(2)  # 8 are needed on 2024-03-01
+    assert redeemable_units(transactions, "2024-03-15") == pytest.approx(2)
+    assert redeemable_units(transactions, pd.Timestamp("2024-05-01")) == pytest.approx(7)
+    assert redeemable_units([], "2024-05-01") == 0
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trading_calendar import TradingCalendar
+
+# Mon 2024-01-01 .. Fri 2024-01-12 without the weekend and a Wednesday holiday
+NAV_DATES = pd.to_datetime([
+    "2024-01-01", "2024-01-02", "2024-01-04", "2024-01-05",
+    "2024-01-08", "2024-01-09", "2024-01-10", "2024-01-11", "2024-01-12",
+])
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar(NAV_DATES)
+
+
+@pytest.mark.parametrize("date, previous, next_, skip", [
+    ("2024-01-02", 1, 1, 1),           # trading day: same row under every policy
+    ("2024-01-03", 1, 2, None),        # mid-week holiday
+    ("2024-01-06", 3, 4, None),        # Saturday
+    ("2024-01-07", 3, 4, None),        # Sunday
+    ("2023-12-31", None, 0, None),     # before the history
+    ("2024-01-13", 8, None, None),     # after the history
+])
+def test_resolve_one_policies(calendar, date, previous, next_, skip):
+    assert calendar.resolve_one(date, "previous") == previous
+    assert calendar.resolve_one(date, "next") == next_
+    assert calendar.resolve_one(date, "skip") == skip
+
+
+def test_resolve_matches_frame_scan(calendar):
+    days = pd.date_range("2023-12-30", "2024-01-14")
+    nav = pd.DataFrame({"date": NAV_DATES})
+    for policy in TradingCalendar.POLICIES:
+        expected = []
+        for day in days:
+            if policy == "previous":
+                rows = nav.index[nav["date"] <= day]
+                expected.append(rows[-1] if len(rows) else -1)
+            elif policy == "next":
+                rows = nav.index[nav["date"] >= day]
+                expected.append(rows[0] if len(rows) else -1)
+            else:
+                rows = nav.index[nav["date"] == day]
+                expected.append(rows[0] if len(rows) else -1)
+        np.testing.assert_array_equal(calendar.resolve(days.values, policy), expected)
+
+
+def test_resolve_keeps_shape(calendar):
+    dates = np.array([["2024-01-01", "2024-01-03"], ["2024-01-06", "2024-01-20"]], dtype="datetime64[D]")
+    np.testing.assert_array_equal(calendar.resolve(dates, "skip"), [[0, -1], [-1, -1]])
+
+
+def test_duplicate_dates_resolve_to_first_row():
+    calendar = TradingCalendar(pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-04"]))
+    for policy in TradingCalendar.POLICIES:
+        assert calendar.resolve_one("2024-01-02", policy) == 1
+    assert calendar.resolve_one("2024-01-03", "previous") == 1
+    assert calendar.resolve_one("2024-01-03", "next") == 3
+    assert calendar.is_trading_day("2024-01-02")
+    assert not calendar.is_trading_day("2024-01-03")
+
+
+def test_rejects_unknown_policy_and_unsorted_dates(calendar):
+    with pytest.raises(ValueError):
+        calendar.resolve_one("2024-01-02", "nearest")
+    with pytest.raises(ValueError):
+        TradingCalendar(NAV_DATES[::-1])
@@ -7,8 +7,14 @@
     Modules
     -------
 
+    - `cache_warmer`: Scheduled background refresh of user schemes after the daily NAV publication.
+    - `caching`: Namespaced Streamlit caches (TTL, size limits) with invalidation hooks for writers.
     - `data_loader`: Functions and classes for loading and processing data from various sources.
     - `formatters`: Utilities for formatting data, such as dates, numbers, and strings, for display or further processing.
+    - `groww_links`: Shared Groww link store with a background resolver (no search on the render path).
+    - `gcs_emulator`: In-process GCS bucket stand-in (generations, preconditions, latency) for offline runs and load tests.
+    - `session_bootstrap`: Parallel prefetch of all user-data files once per session.
+    - `tracing`: Lightweight span/timing instrumentation with call counts, latencies and cache hit ratios.
 
     Usage
     -----
@@ -34,9 +40,15 @@
 """
 
 __all__ = [
+    'cache_warmer',
+    'caching',
     'data_loader',
     'formatters',
-    'gcs_client'
+    'gcs_client',
+    'gcs_emulator',
+    'groww_links',
+    'session_bootstrap',
+    'tracing'
 ]
 
 
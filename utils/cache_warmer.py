@@ -0,0 +1,298 @@
+"""
+Background cache pre-warmer, scheduled after the daily NAV publication.
+
+Every scheme the user cares about (favourites, holdings and saved simulations) is
+refreshed once new NAVs are out, so the first page view of the day is served from the
+caches of `utils.caching` instead of paying for the downloads and analytics:
+
+1. the "mf_nav" namespace is invalidated, all quotes are fetched in one download and
+   the NAV histories concurrently (the bulk paths of `MFClient`);
+2. per scheme, on a thread pool: the `MFScheme` NAV frame, the drop-metrics table, the
+   dip factors and the saved simulations are recomputed through the same cached
+   functions the pages call.
+
+Worker threads (not processes) are used on purpose: the caches being warmed live in this
+process, in the runtime's storage shared by every session (see `caching.shared_storage`),
+so the warmer only runs under ``streamlit run``. The scheduler is a single daemon thread
+per process; it runs at `NAV_PUBLISH_TIME` every day, retrying every `RETRY_SECONDS` (up
+to `MAX_RETRIES` times) while the fetched NAVs are older than the publication. A retry that
+sees the same NAV date as the attempt before it ends the retries: the AMFI file is not
+changing, as on a weekday market holiday.
+
+The last completed publication is stored in `CACHE_WARMER_STATE_PATH`. A process started
+after it skips the start-up run: its caches are empty, so the pages fill them with the
+published NAVs on first use. Only a publication not yet warmed is run at start-up.
+
+Usage::
+
+    from utils import cache_warmer
+
+    cache_warmer.start()          # once per process, e.g. in app.py
+    cache_warmer.trigger()        # run now, in the background
+    cache_warmer.status()         # per-scheme warm / stale state
+"""
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
+
+from config.settings import CACHE_WARMER_ENABLED, CACHE_WARMER_STATE_PATH, NAV_PUBLISH_TIME, NAV_PUBLISH_TIMEZONE
+from mftools_wrapper import MFClient, MFScheme
+from src.dip_factor import dip_factor_for_frequency
+from src.mf_simulator import MFSimulator
+from src.nav_metrics import nav_metrics_table
+
+from . import caching, tracing
+from .data_loader import FavouritesManager, HoldingsManager, SimulationManager
+
+logger = logging.getLogger(__name__)
+
+LOOKBACK_DAYS = (7, 30, 60, 90, 180, 365)  # as on the scheme pages
+MAX_WORKERS = 4
+POLL_SECONDS = 60
+RETRY_SECONDS = 30 * 60  # NAVs not out yet at the scheduled time
+MAX_RETRIES = 6
+SCHEMES_TTL_SECONDS = 60  # how long `status` reuses the user's scheme list
+
+_STATUS = {}  # scheme_code -> per-scheme status (see `status`)
+_SCHEMES = {"schemes": None, "loaded_at": 0.0}  # last `_user_schemes` result
+_RUNS = []    # summaries of recent runs, newest last
+_LOCK = threading.Lock()
+_RUN_LOCK = threading.Lock()
+_SCHEDULER = None
+
+
+def last_publication(now: datetime.datetime = None) -> datetime.datetime:
+    """Most recent scheduled NAV publication at or before `now` (timezone-aware)."""
+    tz = ZoneInfo(NAV_PUBLISH_TIMEZONE)
+    now = (now or datetime.datetime.now(tz)).astimezone(tz)
+    hour, minute = map(int, NAV_PUBLISH_TIME.split(":"))
+    published = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return published if published <= now else published - datetime.timedelta(days=1)
+
+
+def _warmed_publication():
+    """Last publication a scheduled run completed (any process), or None."""
+    try:
+        with open(CACHE_WARMER_STATE_PATH, "r", encoding="utf-8") as f:
+            return datetime.datetime.fromisoformat(json.load(f)["publication"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _save_warmed_publication(published: datetime.datetime, summary: dict) -> None:
+    """Record `published` as warmed; written atomically, failures only logged."""
+    state = {"publication": published.isoformat(), "nav_date": str(summary.get("nav_date"))}
+    tmp_path = f"{CACHE_WARMER_STATE_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(CACHE_WARMER_STATE_PATH) or ".", exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, CACHE_WARMER_STATE_PATH)
+    except OSError as exc:
+        logger.warning("Could not store the warmed publication: %s", exc)
+
+
+def _user_schemes() -> dict:
+    """scheme_code -> {'scheme_name', 'simulations'} for favourites, holdings and saved simulations."""
+    schemes = {}
+    for item in FavouritesManager().load_data() + HoldingsManager().load_data():
+        schemes.setdefault(str(item["scheme_code"]), {"scheme_name": item.get("scheme_name"), "simulations": []})
+    for sim in SimulationManager().load_data():
+        entry = schemes.setdefault(str(sim["scheme_code"]), {"scheme_name": sim.get("scheme_name"), "simulations": []})
+        entry["simulations"].append(sim)
+    with _LOCK:
+        _SCHEMES.update(schemes=schemes, loaded_at=time.monotonic())
+    return schemes
+
+
+def _known_schemes() -> dict:
+    """`_user_schemes` of the last run or listing, reloaded after `SCHEMES_TTL_SECONDS`."""
+    with _LOCK:
+        if _SCHEMES["schemes"] is not None and time.monotonic() - _SCHEMES["loaded_at"] < SCHEMES_TTL_SECONDS:
+            return _SCHEMES["schemes"]
+    return _user_schemes()
+
+
+def _set_status(scheme_code: str, **fields) -> None:
+    with _LOCK:
+        _STATUS.setdefault(scheme_code, {}).update(fields)
+
+
+def _warm_scheme(scheme_code: str, info: dict) -> None:
+    start = time.perf_counter()
+    _set_status(scheme_code, scheme_name=info["scheme_name"], state="warming", error=None)
+    try:
+        with tracing.span("cache_warmer.scheme", scheme_code=scheme_code):
+            df = MFScheme(scheme_code).get_nav_data()
+            nav_metrics_table(df, LOOKBACK_DAYS)
+            simulator = MFSimulator(nav_df=df)
+            for sim in info["simulations"]:
+                dip_factor_for_frequency(
+                    df=df,
+                    weights=sim["weights"],
+                    drop_threshold_range=sim["drop_threshold_range"],
+                    frequency=sim["frequency"]
+                )
+                simulator.cached("run_simulation_from_params", params=sim)
+    except Exception as exc:
+        logger.warning("Cache warm-up of %s failed: %s", scheme_code, exc)
+        _set_status(scheme_code, state="error", error=str(exc), ms=(time.perf_counter() - start) * 1000)
+        return
+    _set_status(
+        scheme_code,
+        state="warm",
+        nav_date=df["date"].max().date(),
+        warmed_at=datetime.datetime.now(ZoneInfo(NAV_PUBLISH_TIMEZONE)),
+        simulations=len(info["simulations"]),
+        ms=(time.perf_counter() - start) * 1000,
+    )
+
+
+@tracing.traced("cache_warmer.run")
+def run(max_workers: int = MAX_WORKERS) -> dict:
+    """Refresh and recompute everything for the user's schemes (blocking).
+
+    Returns:
+        dict: Run summary {'started_at', 'schemes', 'errors', 'nav_date', 'ms'} ('nav_date' is
+        the latest NAV date seen); {'skipped': True} if a run is in progress or the caches
+        are not shared with the app sessions.
+    """
+    if not caching.shared_storage():
+        logger.warning("Cache warm-up skipped: no Streamlit runtime, the warmed caches would not be shared")
+        return {"skipped": True}
+    if not _RUN_LOCK.acquire(blocking=False):
+        return {"skipped": True}
+    try:
+        start = time.perf_counter()
+        started_at = datetime.datetime.now(ZoneInfo(NAV_PUBLISH_TIMEZONE))
+        schemes = _user_schemes()
+        codes = list(schemes)
+
+        caching.invalidate("mf_nav")
+        if codes:
+            client = MFClient()
+            client.get_scheme_quotes(codes)     # one download of the AMFI NAV file
+            client.get_historical_navs(codes)   # histories fetched concurrently
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-warmer") as pool:
+                list(pool.map(_warm_scheme, codes, schemes.values()))
+
+        with _LOCK:
+            errors = sum(1 for code in codes if _STATUS.get(code, {}).get("state") == "error")
+            nav_dates = [_STATUS[code]["nav_date"] for code in codes if _STATUS.get(code, {}).get("state") == "warm"]
+            summary = {"started_at": started_at, "schemes": len(codes), "errors": errors,
+                       "nav_date": max(nav_dates, default=None), "ms": (time.perf_counter() - start) * 1000}
+            _RUNS.append(summary)
+            del _RUNS[:-10]
+        return summary
+    finally:
+        _RUN_LOCK.release()
+
+
+def trigger() -> bool:
+    """Start `run` on a background thread; False if a run is already in progress."""
+    if _RUN_LOCK.locked():
+        return False
+    threading.Thread(target=run, name="cache-warmer-run", daemon=True).start()
+    return True
+
+
+def _is_current(summary: dict, published: datetime.datetime) -> bool:
+    """Whether a run saw the NAVs of `published` (always true for weekend publications and empty runs)."""
+    if summary.get("skipped"):
+        return False
+    if published.weekday() >= 5 or not summary["schemes"] or summary["nav_date"] is None:
+        return True
+    return summary["nav_date"] >= published.date()
+
+
+def _schedule_loop() -> None:
+    last_done, retries, last_nav_date = _warmed_publication(), 0, None
+    while True:
+        due = last_publication()
+        if last_done is None or last_done < due:
+            try:
+                summary = run()
+            except Exception:
+                logger.exception("Scheduled cache warm-up failed")
+                summary = {"skipped": True}
+            nav_date = summary.get("nav_date")
+            # Unchanged since the previous attempt: no NAVs today (market holiday)
+            settled = retries > 0 and nav_date is not None and nav_date == last_nav_date
+            if _is_current(summary, due) or settled or retries >= MAX_RETRIES:
+                last_done, retries, last_nav_date = due, 0, None
+                _save_warmed_publication(due, summary)
+            else:  # publication running late: warm again later
+                retries, last_nav_date = retries + 1, nav_date
+                time.sleep(RETRY_SECONDS)
+                continue
+        time.sleep(POLL_SECONDS)
+
+
+def start() -> bool:
+    """Start the scheduler thread once per process (no-op if disabled, already running or
+    outside ``streamlit run``).
+
+    Returns:
+        bool: True if the scheduler is running.
+    """
+    global _SCHEDULER
+    if not CACHE_WARMER_ENABLED or not caching.shared_storage():
+        return False
+    with _LOCK:
+        if _SCHEDULER is None or not _SCHEDULER.is_alive():
+            _SCHEDULER = threading.Thread(target=_schedule_loop, name="cache-warmer", daemon=True)
+            _SCHEDULER.start()
+    return True
+
+
+def status() -> list:
+    """Per-scheme cache state.
+
+    A scheme is 'warm' if it was refreshed after the latest NAV publication, 'stale' if
+    before (or never), 'warming' while in progress and 'error' if its last refresh failed.
+    The scheme list is reused for `SCHEMES_TTL_SECONDS`, so polling it stays cheap.
+
+    Returns:
+        list[dict]: One row per known scheme with ['scheme_code', 'scheme_name', 'state',
+        'nav_date', 'warmed_at', 'simulations', 'ms', 'error'].
+    """
+    published = last_publication()
+    try:
+        known = _known_schemes()
+    except Exception as exc:  # status must render even if storage is unreachable
+        logger.warning("Could not list user schemes: %s", exc)
+        known = {}
+    with _LOCK:
+        codes = list(dict.fromkeys([*known, *_STATUS]))
+        rows = []
+        for code in codes:
+            entry = dict(_STATUS.get(code, {}))
+            state = entry.get("state")
+            if state == "warm" and entry["warmed_at"] < published:
+                state = "stale"
+            rows.append({
+                "scheme_code": code,
+                "scheme_name": entry.get("scheme_name") or known.get(code, {}).get("scheme_name"),
+                "state": state or "stale",
+                "nav_date": entry.get("nav_date"),
+                "warmed_at": entry.get("warmed_at"),
+                "simulations": entry.get("simulations", len(known.get(code, {}).get("simulations", []))),
+                "ms": entry.get("ms"),
+                "error": entry.get("error"),
+            })
+    return rows
+
+
+def runs() -> list:
+    """Summaries of the last runs, newest last."""
+    with _LOCK:
+        return list(_RUNS)
+
+
+def is_running() -> bool:
+    return _RUN_LOCK.locked()
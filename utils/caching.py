@@ -0,0 +1,106 @@
+"""
+Streamlit-aware caching for the data-layer and analytics entry points.
+
+`cache_data` and `cache_resource` wrap ``st.cache_data`` / ``st.cache_resource`` with
+per-use TTLs and entry limits and register the cached function under one or more
+*namespaces*. Writers call `invalidate` with the namespaces their change affects, which
+clears every function registered under them; TTLs bound the staleness of anything else
+(e.g. upstream NAV publication).
+
+Arguments are hashed by Streamlit: DataFrames by content, dicts/lists/tuples (e.g.
+simulation parameter dicts) recursively. Parameters whose name starts with an
+underscore are not hashed (use them for clients and other unhashable handles).
+`cache_data` returns a fresh copy to every caller, `cache_resource` the shared object,
+so only use the latter for results nobody mutates.
+
+Namespaces in use:
+    - ``mf_registry``: scheme list and scheme details (change rarely).
+    - ``mf_nav``: quotes, NAV histories and anything derived from them.
+    - ``analytics``: NAV metric tables and simulation runs.
+    - user-data file names (e.g. ``my_investments.json``): invalidated by the managers in
+      `utils.data_loader` after every write.
+
+Usage::
+
+    from utils import caching
+
+    @caching.cache_data("mf_nav", ttl=caching.NAV_TTL_SECONDS, max_entries=64)
+    def nav_frame(scheme_code): ...
+
+    caching.invalidate("mf_nav")
+"""
+import threading
+
+import streamlit as st
+from streamlit import runtime
+
+# NAVs are published once a day; `utils.cache_warmer` invalidates "mf_nav" after each
+# publication, the TTLs only bound staleness when it is disabled.
+REGISTRY_TTL_SECONDS = 24 * 3600  # scheme list / details
+NAV_TTL_SECONDS = 24 * 3600       # NAV histories
+QUOTE_TTL_SECONDS = 6 * 3600      # latest NAV quotes
+
+_REGISTRY = {}  # namespace -> list of cached functions
+_LOCK = threading.Lock()
+
+
+def _register(namespaces, cached_fn):
+    namespaces = (namespaces,) if isinstance(namespaces, str) else tuple(namespaces)
+    with _LOCK:
+        for namespace in namespaces:
+            _REGISTRY.setdefault(namespace, []).append(cached_fn)
+    cached_fn.namespaces = namespaces
+    return cached_fn
+
+
+def cache_data(namespaces, ttl: float = None, max_entries: int = None):
+    """``st.cache_data`` registered under `namespaces` (a name or a tuple of names).
+
+    Args:
+        namespaces (str | tuple[str]): Namespaces whose invalidation clears this cache.
+        ttl (float, optional): Seconds an entry stays valid. Forever if None.
+        max_entries (int, optional): Entries kept (least recently used evicted). Unbounded if None.
+    """
+    def decorator(fn):
+        return _register(namespaces, st.cache_data(ttl=ttl, max_entries=max_entries, show_spinner=False)(fn))
+    return decorator
+
+
+def cache_resource(namespaces, ttl: float = None, max_entries: int = None):
+    """``st.cache_resource`` registered under `namespaces`; see `cache_data`."""
+    def decorator(fn):
+        return _register(namespaces, st.cache_resource(ttl=ttl, max_entries=max_entries, show_spinner=False)(fn))
+    return decorator
+
+
+def shared_storage() -> bool:
+    """Whether entries cached by any thread of this process are seen by every session.
+
+    Under ``streamlit run`` the global (non session-scoped) caches live in the runtime's
+    storage, so background threads without a script context (e.g. `utils.cache_warmer`)
+    fill the same entries the pages read. Without a runtime (plain ``python``, tests)
+    Streamlit falls back to a private in-memory store and warming would be lost.
+    """
+    return runtime.exists()
+
+
+def invalidate(*namespaces: str) -> int:
+    """Clear every cache registered under any of `namespaces`.
+
+    Returns:
+        int: Number of cached functions cleared.
+    """
+    with _LOCK:
+        cached_fns = {id(fn): fn for namespace in namespaces for fn in _REGISTRY.get(namespace, [])}
+    for fn in cached_fns.values():
+        fn.clear()
+    return len(cached_fns)
+
+
+def namespaces() -> dict:
+    """namespace -> names of the functions cached under it."""
+    with _LOCK:
+        return {
+            namespace: [getattr(fn, "__qualname__", repr(fn)) for fn in fns]
+            for namespace, fns in _REGISTRY.items()
+        }
@@ -1,88 +1,872 @@
+import contextlib
+import copy
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
 import uuid
-from config.settings import SAVED_SIMULATIONS_FILE_PATH, FAV_FILE_PATH, BLACKLIST_FILE_PATH, MY_INVESTMENTS_FILE_PATH
+from config.settings import SAVED_SIMULATIONS_FILE_PATH, FAV_FILE_PATH, BLACKLIST_FILE_PATH, MY_INVESTMENTS_FILE_PATH, MY_HOLDINGS_FILE_PATH
+from config.settings import STORAGE_BACKEND, SQLITE_DB_PATH
 
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any
 import streamlit as st  # Only needed if using Streamlit secrets
+from google.api_core.exceptions import GoogleAPICallError, NotFound, PreconditionFailed
+from src.tax_lots import TaxLotEngine, UNITS_TOLERANCE, oversold, redeemable_units
 from .gcs_client import GCSClient
+from . import caching, tracing
+
+logger = logging.getLogger(__name__)
+
+# Process-wide read-through cache: (bucket, file) -> {"generation", "data", "checked_at"}
+_CACHE: Dict[tuple, Dict[str, Any]] = {}
+_CACHE_LOCK = threading.Lock()
+# Log segments are immutable once written: (bucket, blob name) -> operation
+_SEGMENT_CACHE: Dict[tuple, Dict[str, Any]] = {}
+# Log listings, revalidated like objects:
+# (bucket, log prefix) -> {"snapshot": snapshot generation, "segments": [(generation, name)], "checked_at"}
+_LISTING_CACHE: Dict[tuple, Dict[str, Any]] = {}
+# Marks an item whose move between files (`GCSJSONManager.move_item`) is not finished
+MOVE_FIELD = "_moved_from"
+
+
+def clear_caches() -> None:
+    """Drop every cached object and log segment (e.g. after switching buckets)."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _SEGMENT_CACHE.clear()
+        _LISTING_CACHE.clear()
 
 class GCSJSONManager(GCSClient):
     """
     Child class of GCSClient with added add_item and remove_item functionality.
+
+    Reads go through a process-wide cache keyed on the object generation: within
+    `CACHE_TTL_SECONDS` of the last check a read costs nothing, after that only a metadata
+    request, and the body is downloaded again only when the generation changed. Local
+    writes update the cache with the generation they created and invalidate the
+    `utils.caching` namespace named after the file (results derived from it).
     """
     BUCKET_NAME = "mf-storage"  # Hardcoded bucket name
+    CACHE_TTL_SECONDS = 5
+    KEY = None  # Field identifying an item (used by keyed backends)
 
     def __init__(self, file_name: str):
         super().__init__(bucket_name=self.BUCKET_NAME, file_name=file_name)
 
+    @property
+    def _cache_key(self) -> tuple:
+        return (self.bucket_name, self.file_name)
+
+    def _cache_put(self, generation, data) -> None:
+        with _CACHE_LOCK:
+            entry = _CACHE.get(self._cache_key)
+            if entry is not None and entry["generation"] and generation and entry["generation"] > generation:
+                return  # a slower reader must not replace a newer object
+            _CACHE[self._cache_key] = {"generation": generation, "data": data, "checked_at": time.monotonic()}
+
+    def invalidate_cache(self) -> None:
+        with _CACHE_LOCK:
+            _CACHE.pop(self._cache_key, None)
+
+    def _load_with_generation(self, revalidate: bool = False) -> tuple:
+        """(data, generation) of the file; generation is None if the object does not exist.
+
+        With `revalidate` the TTL is ignored and the generation always checked.
+        """
+        with _CACHE_LOCK:
+            entry = _CACHE.get(self._cache_key)
+            fresh = entry is not None and time.monotonic() - entry["checked_at"] < self.CACHE_TTL_SECONDS
+        if not revalidate and fresh:
+            tracing.record_cache("gcs.load_data", hit=True)
+            return copy.deepcopy(entry["data"]), entry["generation"]
+
+        blob = self.bucket.get_blob(self.file_name)  # metadata only
+        if blob is None:
+            return [], None
+
+        if entry is not None and entry["generation"] == blob.generation:
+            tracing.record_cache("gcs.load_data", hit=True)
+            with _CACHE_LOCK:
+                # Only extend the entry still cached; another thread may have replaced it
+                if _CACHE.get(self._cache_key) is entry:
+                    entry["checked_at"] = time.monotonic()
+            return copy.deepcopy(entry["data"]), entry["generation"]
+
+        tracing.record_cache("gcs.load_data", hit=False)
+        try:
+            data = self.download_json(blob, if_generation_match=blob.generation)
+        except PreconditionFailed:
+            # Overwritten between the metadata check and the download
+            self.invalidate_cache()
+            return self._load_with_generation(revalidate=True)
+        self._cache_put(blob.generation, data)
+        return copy.deepcopy(data), blob.generation
+
+    @tracing.traced("gcs.load_data")
+    def load_data(self):
+        data, generation = self._load_with_generation()
+        if generation is None:
+            self.save_data([])
+        if any(MOVE_FIELD in item for item in data):
+            data = self._finish_moves(data)
+        return data
+
+    def save_data(self, data):
+        blob = super().save_data(data)
+        self._cache_put(blob.generation, copy.deepcopy(data))
+        caching.invalidate(self.file_name)
+        return blob
+
+    @tracing.traced("gcs.mutate")
+    def mutate(self, fn: Callable[[List[Dict[str, Any]]], Any], max_retries: int = 8) -> List[Dict[str, Any]]:
+        """Apply `fn` to the data and store the result with optimistic concurrency.
+
+        The upload is conditional on the generation the data was read at. If another session
+        wrote in between, the write is rejected, the cache dropped and `fn` re-applied to the
+        fresh data after a randomized exponential backoff. Unchanged data is not uploaded.
+
+        Args:
+            fn (Callable): Receives the list of items; mutates it in place or returns a new list.
+            max_retries (int): Conflicts tolerated before giving up.
+
+        Returns:
+            list[dict]: The stored data.
+        """
+        for attempt in range(max_retries + 1):
+            data, generation = self._load_with_generation(revalidate=attempt > 0)
+            before = copy.deepcopy(data)
+            result = fn(data)
+            data = data if result is None else result
+            if data == before and generation is not None:
+                return data
+
+            blob = self.bucket.blob(self.file_name)
+            try:
+                self.upload_json(blob, data, if_generation_match=generation or 0)
+            except PreconditionFailed:
+                self.invalidate_cache()
+                if attempt == max_retries:
+                    raise
+                time.sleep(random.uniform(0, 0.05 * 2 ** attempt))  # jitter de-synchronizes writers
+                continue
+            self._cache_put(blob.generation, copy.deepcopy(data))
+            caching.invalidate(self.file_name)
+            return data
+
+    @contextlib.contextmanager
+    def transaction(self, max_retries: int = 8):
+        """Batch several add/remove calls into a single conditional write (see `mutate`).
+
+        Usage::
+
+            with manager.transaction() as batch:
+                batch.remove_item("scheme_code", "100")
+                batch.add_item({"scheme_code": "200", ...}, unique_key="scheme_code")
+        """
+        batch = _Batch()
+        yield batch
+        if batch.ops:
+            self.mutate(batch.apply, max_retries=max_retries)
+
     def add_item(self, item: Dict[str, Any], unique_key: str = None) -> None:
         """Add a new item, optionally ensuring no duplicates."""
-        data = self.load_data()
-        if unique_key:
-            if not any(d.get(unique_key) == item.get(unique_key) for d in data):
-                data.append(item)
-        else:
-            data.append(item)
-        self.save_data(data)
+        self.mutate(lambda data: _add(data, item, unique_key))
 
     def remove_item(self, key: str, value: str) -> None:
         """Remove an item by key-value match."""
+        self.mutate(lambda data: _remove(data, key, value))
+
+    def move_item(self, target: "GCSJSONManager", item: Dict[str, Any], unique_key: str) -> None:
+        """Move `item` from this file to `target` (matched on `unique_key`).
+
+        GCS has no transaction spanning two objects, so the move is three idempotent
+        conditional writes: one `target.transaction` replaces the target's copy with the
+        item marked with its source (`MOVE_FIELD`), the item is removed here, and the mark
+        is cleared. The item is never missing from both files, and a move torn after the
+        first write is finished by the next read of the target (`_finish_moves`).
+        """
+        value = item[unique_key]
+        with target.transaction() as batch:
+            batch.remove_item(unique_key, value)
+            batch.add_item({**item, MOVE_FIELD: {"file": self.file_name, "key": unique_key}})
+        self.remove_item(unique_key, value)
+        target.mutate(lambda data: _unmark(data, unique_key, value))
+
+    def _finish_moves(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Complete the moves into this file that stopped before their source was cleaned up."""
+        for item in data:
+            move = item.get(MOVE_FIELD)
+            if move:
+                GCSJSONManager(move["file"]).remove_item(move["key"], item[move["key"]])
+                self.mutate(lambda stored, key=move["key"], value=item[move["key"]]: _unmark(stored, key, value))
+        return [{k: v for k, v in item.items() if k != MOVE_FIELD} for item in data]
+
+
+def _add(data: List[Dict[str, Any]], item: Dict[str, Any], unique_key: str = None) -> None:
+    if not unique_key or not any(d.get(unique_key) == item.get(unique_key) for d in data):
+        data.append(item)
+
+
+def _remove(data: List[Dict[str, Any]], key: str, value: str) -> List[Dict[str, Any]]:
+    return [d for d in data if d.get(key) != value]
+
+
+def _unmark(data: List[Dict[str, Any]], key: str, value: str) -> None:
+    for d in data:
+        if d.get(key) == value:
+            d.pop(MOVE_FIELD, None)
+
+
+class _Batch:
+    """Operations recorded by `transaction`, applied in order to the data of one write."""
+
+    def __init__(self):
+        self.ops = []
+
+    def add_item(self, item: Dict[str, Any], unique_key: str = None) -> None:
+        self.ops.append(lambda data: _add(data, item, unique_key) or data)
+
+    def remove_item(self, key: str, value: str) -> None:
+        self.ops.append(lambda data: _remove(data, key, value))
+
+    def apply(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for op in self.ops:
+            data = op(data)
+        return data
+
+
+class AppendOnlyJSONManager(GCSJSONManager):
+    """
+    GCSJSONManager whose writes append small log objects instead of rewriting the file.
+
+    The JSON array at `file_name` is the compacted snapshot. Every write stores one
+    operation ``{"op": "put" | "delete", "key": ..., "item": ...}`` as its own object under
+    ``<file_name>.log/``, so a write costs one small upload and two sessions writing at once
+    never overwrite each other. Reads merge the snapshot (cached by generation) with the log
+    segments (immutable, cached forever) by `KEY`, last write wins; deletes are tombstones.
+    Segments are ordered by their object generation, which the storage server assigns, so
+    clock skew between writers cannot reorder a put and its tombstone. The segment listing
+    is cached for `CACHE_TTL_SECONDS` like the snapshot, and local writes are added to it.
+
+    Reads never write. The write that brings the log to `COMPACT_AFTER` segments folds
+    them into the snapshot (`compact`, guarded by a generation precondition) and deletes
+    them oldest first, so whatever is left after a partial failure is a suffix of the log:
+    re-applying it to the snapshot gives the same result.
+    """
+    KEY = "id"
+    COMPACT_AFTER = 20
+
+    @property
+    def log_prefix(self) -> str:
+        return f"{self.file_name}.log/"
+
+    @property
+    def _listing_key(self) -> tuple:
+        return (self.bucket_name, self.log_prefix)
+
+    def _write_op(self, op: str, key: str, item: Dict[str, Any] = None) -> None:
+        name = f"{self.log_prefix}{uuid.uuid4().hex}.json"  # unique only; order comes from the generation
+        payload = {"op": op, "key": key, "item": copy.deepcopy(item)}
+        blob = self.bucket.blob(name)
+        self.upload_json(blob, payload, if_generation_match=0)
+        with _CACHE_LOCK:
+            _SEGMENT_CACHE[(self.bucket_name, name)] = payload
+            listing = _LISTING_CACHE.get(self._listing_key)
+            if listing is not None:
+                listing["segments"] = sorted([*listing["segments"], (blob.generation, name)])
+            pending = len(listing["segments"]) if listing is not None else 0
+        caching.invalidate(self.file_name)
+        if pending >= self.COMPACT_AFTER:
+            self.compact()
+
+    def _segment_names(self, snapshot_generation, refresh: bool = False) -> List[str]:
+        """Names of the log segments in write (generation) order.
+
+        The cached listing is reused for `CACHE_TTL_SECONDS`, but only with the snapshot
+        generation it was taken at: after a compaction the remaining segments are listed again.
+        """
+        with _CACHE_LOCK:
+            listing = _LISTING_CACHE.get(self._listing_key)
+            if (
+                not refresh and listing is not None and listing["snapshot"] == snapshot_generation
+                and time.monotonic() - listing["checked_at"] < self.CACHE_TTL_SECONDS
+            ):
+                tracing.record_cache("gcs.list_segments", hit=True)
+                return [name for _, name in listing["segments"]]
+        tracing.record_cache("gcs.list_segments", hit=False)
+        segments = sorted((blob.generation, blob.name) for blob in self.bucket.list_blobs(prefix=self.log_prefix))
+        with _CACHE_LOCK:
+            _LISTING_CACHE[self._listing_key] = {
+                "snapshot": snapshot_generation, "segments": segments, "checked_at": time.monotonic(),
+            }
+        return [name for _, name in segments]
+
+    def _read_segments(self, snapshot_generation, refresh: bool = False):
+        """(name, operation) of every log segment in write order, or None if one was compacted meanwhile."""
+        segments = []
+        for name in self._segment_names(snapshot_generation, refresh=refresh):
+            cache_key = (self.bucket_name, name)
+            with _CACHE_LOCK:
+                payload = _SEGMENT_CACHE.get(cache_key)
+            if payload is None:
+                try:
+                    payload = self.download_json(self.bucket.blob(name))
+                except NotFound:
+                    return None
+                with _CACHE_LOCK:
+                    _SEGMENT_CACHE[cache_key] = payload
+            segments.append((name, payload))
+        return segments
+
+    def _merge(self, snapshot: List[Dict[str, Any]], segments: List[tuple]) -> List[Dict[str, Any]]:
+        """Snapshot with the operations applied; items are copies, never the cached payloads."""
+        merged = {item.get(self.KEY): item for item in snapshot}
+        for _, payload in segments:
+            if payload["op"] == "put":
+                merged[payload["key"]] = copy.deepcopy(payload["item"])
+            else:
+                merged.pop(payload["key"], None)
+        return list(merged.values())
+
+    def _load_merged(self, revalidate: bool = False, max_retries: int = 3) -> tuple:
+        """(merged data, snapshot generation, segments) from a consistent snapshot and listing.
+
+        A missing segment means a compaction ran since the snapshot was read: its effect
+        may not be in our snapshot, so snapshot and listing are both read again.
+        """
+        for attempt in range(max_retries + 1):
+            fresh = revalidate or attempt > 0
+            snapshot, generation = self._load_with_generation(revalidate=fresh)
+            segments = self._read_segments(generation, refresh=fresh)
+            if segments is not None:
+                return self._merge(snapshot, segments), generation, segments
+        raise RuntimeError(f"{self.file_name} kept being compacted while it was read")
+
+    @tracing.traced("gcs.load_log_data")
+    def load_data(self):
+        return self._load_merged()[0]
+
+    @tracing.traced("gcs.compact")
+    def compact(self) -> bool:
+        """Fold the log segments into the snapshot and delete them.
+
+        Run by the write that brings the log to `COMPACT_AFTER` segments; reads never
+        compact. The snapshot is written only if it is still at the generation it was read
+        at, and segments are deleted oldest first, only after it is. A failed delete stops
+        the cleanup (the next compaction retries it): deleting a later tombstone while an
+        earlier `put` of the same key survived would bring the item back.
+
+        Returns:
+            bool: False if another session changed the snapshot first (nothing is deleted).
+        """
+        data, generation, segments = self._load_merged(revalidate=True)
+        blob = self.bucket.blob(self.file_name)
+        try:
+            self.upload_json(blob, data, if_generation_match=generation or 0)
+        except PreconditionFailed:
+            return False
+        self._cache_put(blob.generation, copy.deepcopy(data))
+        caching.invalidate(self.file_name)
+        deleted = set()
+        for name, _ in segments:
+            try:
+                self.bucket.blob(name).delete()
+            except NotFound:
+                pass
+            except GoogleAPICallError:
+                break
+            deleted.add(name)
+        with _CACHE_LOCK:
+            for name in deleted:
+                _SEGMENT_CACHE.pop((self.bucket_name, name), None)
+            listing = _LISTING_CACHE.get(self._listing_key)
+            if listing is not None:
+                listing["snapshot"] = blob.generation
+                listing["segments"] = [segment for segment in listing["segments"] if segment[1] not in deleted]
+        return True
+
+    def mutate(self, fn: Callable[[List[Dict[str, Any]]], Any], max_retries: int = 8) -> List[Dict[str, Any]]:
+        """Apply `fn` to the merged data and log only the changed items.
+
+        Log writes never conflict, so `max_retries` is unused.
+        """
         data = self.load_data()
-        data = [d for d in data if d.get(key) != value]
-        self.save_data(data)
+        before = {item.get(self.KEY): item for item in copy.deepcopy(data)}
+        result = fn(data)
+        data = data if result is None else result
+        after = {item.get(self.KEY): item for item in data}
+        for key in before.keys() - after.keys():
+            self.delete_item(key)
+        for key, item in after.items():
+            if before.get(key) != item:
+                self.put_item(item)
+        return data
+
+    def put_item(self, item: Dict[str, Any]) -> None:
+        """Insert or replace the item with the same `KEY` (one small upload)."""
+        self._write_op("put", item[self.KEY], item)
+
+    def delete_item(self, key: str) -> None:
+        """Delete the item with `KEY` == key by writing a tombstone."""
+        self._write_op("delete", key)
+
+    def add_item(self, item: Dict[str, Any], unique_key: str = None) -> None:
+        """Add a new item, optionally ensuring no duplicates."""
+        if unique_key and unique_key != self.KEY:
+            if any(d.get(unique_key) == item.get(unique_key) for d in self.load_data()):
+                return
+        self.put_item(item)
+
+    def remove_item(self, key: str, value: str) -> None:
+        """Remove an item by key-value match."""
+        if key == self.KEY:
+            self.delete_item(value)
+            return
+        for item in self.load_data():
+            if item.get(key) == value:
+                self.delete_item(item.get(self.KEY))
+
+
+class SQLiteJSONManager:
+    """
+    SQLite implementation of the GCSJSONManager API (load/save, add/remove, mutate,
+    transaction, move, put/delete).
+
+    Every item is one row of the `items` table (file, key, JSON data), ordered by insertion.
+    Lookups on 'scheme_code', 'investment_id' and 'id' use expression indexes, so
+    duplicate checks and removals no longer scan every item. The database runs in WAL mode:
+    readers never block and are not blocked by the single writer. Select it with
+    ``MF_STORAGE_BACKEND=sqlite`` (see `config.settings`).
+    """
+    DB_PATH = SQLITE_DB_PATH
+    INDEXED_FIELDS = ("scheme_code", "investment_id", "id")
+    KEY = None
+    _local = threading.local()
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Per-thread connection to `DB_PATH`, created (with the schema) on first use."""
+        connections = getattr(self._local, "connections", None)
+        if connections is None:
+            connections = self._local.connections = {}
+        conn = connections.get(self.DB_PATH)
+        if conn is None:
+            if os.path.dirname(self.DB_PATH):
+                os.makedirs(os.path.dirname(self.DB_PATH), exist_ok=True)
+            conn = sqlite3.connect(self.DB_PATH, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "row_id INTEGER PRIMARY KEY AUTOINCREMENT, file TEXT NOT NULL, item_key TEXT, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_items_key ON items(file, item_key) WHERE item_key IS NOT NULL")
+            for field in self.INDEXED_FIELDS:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_items_{field} ON items(file, json_extract(data, '$.{field}'))")
+            connections[self.DB_PATH] = conn
+        return conn
 
+    @staticmethod
+    def _field(key: str) -> str:
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", key):
+            raise ValueError(f"Invalid field name: {key!r}")
+        return f"json_extract(data, '$.{key}')"
 
+    def _item_key(self, item: Dict[str, Any]):
+        return None if self.KEY is None or item.get(self.KEY) is None else str(item[self.KEY])
+
+    @contextlib.contextmanager
+    def _write(self):
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        caching.invalidate(self.file_name)
+
+    def _replace_all(self, conn: sqlite3.Connection, data: List[Dict[str, Any]]) -> None:
+        conn.execute("DELETE FROM items WHERE file = ?", (self.file_name,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO items (file, item_key, data) VALUES (?, ?, ?)",
+            [(self.file_name, self._item_key(item), json.dumps(item)) for item in data],
+        )
+
+    @tracing.traced("sqlite.load_data")
+    def load_data(self):
+        rows = self.conn.execute("SELECT data FROM items WHERE file = ? ORDER BY row_id", (self.file_name,))
+        return [json.loads(data) for (data,) in rows]
+
+    def find_items(self, key: str, value) -> List[Dict[str, Any]]:
+        """Items whose `key` equals `value` (indexed for INDEXED_FIELDS)."""
+        rows = self.conn.execute(
+            f"SELECT data FROM items WHERE file = ? AND {self._field(key)} = ? ORDER BY row_id", (self.file_name, value)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def save_data(self, data):
+        with self._write() as conn:
+            self._replace_all(conn, data)
+
+    def invalidate_cache(self) -> None:
+        pass
+
+    @tracing.traced("sqlite.mutate")
+    def mutate(self, fn: Callable[[List[Dict[str, Any]]], Any], max_retries: int = 8) -> List[Dict[str, Any]]:
+        """Apply `fn` to the data inside one write transaction (SQLite serializes writers)."""
+        with self._write() as conn:
+            data = self.load_data()
+            before = copy.deepcopy(data)
+            result = fn(data)
+            data = data if result is None else result
+            if data != before:
+                self._replace_all(conn, data)
+        return data
+
+    @contextlib.contextmanager
+    def transaction(self, max_retries: int = 8):
+        """Batch several add/remove calls into a single write transaction."""
+        batch = _Batch()
+        yield batch
+        if batch.ops:
+            self.mutate(batch.apply)
+
+    def add_item(self, item: Dict[str, Any], unique_key: str = None) -> None:
+        """Add a new item, optionally ensuring no duplicates."""
+        with self._write() as conn:
+            if unique_key and conn.execute(
+                f"SELECT 1 FROM items WHERE file = ? AND {self._field(unique_key)} = ? LIMIT 1",
+                (self.file_name, item.get(unique_key)),
+            ).fetchone():
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO items (file, item_key, data) VALUES (?, ?, ?)",
+                (self.file_name, self._item_key(item), json.dumps(item)),
+            )
+
+    def remove_item(self, key: str, value: str) -> None:
+        """Remove an item by key-value match."""
+        with self._write() as conn:
+            conn.execute(f"DELETE FROM items WHERE file = ? AND {self._field(key)} = ?", (self.file_name, value))
+
+    def move_item(self, target, item: Dict[str, Any], unique_key: str) -> None:
+        """Move `item` from this file to `target` atomically (both files are in one database)."""
+        with self._write() as conn:
+            conn.execute(
+                f"DELETE FROM items WHERE file = ? AND {self._field(unique_key)} = ?", (self.file_name, item[unique_key])
+            )
+            if not conn.execute(
+                f"SELECT 1 FROM items WHERE file = ? AND {self._field(unique_key)} = ? LIMIT 1",
+                (target.file_name, item[unique_key]),
+            ).fetchone():
+                conn.execute(
+                    "INSERT INTO items (file, item_key, data) VALUES (?, ?, ?)",
+                    (target.file_name, target._item_key(item), json.dumps(item)),
+                )
+        caching.invalidate(target.file_name)
+
+    def put_item(self, item: Dict[str, Any]) -> None:
+        """Insert or replace the item with the same `KEY`."""
+        with self._write() as conn:
+            conn.execute("DELETE FROM items WHERE file = ? AND item_key = ?", (self.file_name, self._item_key(item)))
+            conn.execute(
+                "INSERT INTO items (file, item_key, data) VALUES (?, ?, ?)",
+                (self.file_name, self._item_key(item), json.dumps(item)),
+            )
+
+    def delete_item(self, key: str) -> None:
+        with self._write() as conn:
+            conn.execute("DELETE FROM items WHERE file = ? AND item_key = ?", (self.file_name, str(key)))
+
+
+# Base classes of the managers, chosen by `config.settings.STORAGE_BACKEND`
+if STORAGE_BACKEND == "sqlite":
+    JSONManager = LogJSONManager = SQLiteJSONManager
+else:
+    JSONManager, LogJSONManager = GCSJSONManager, AppendOnlyJSONManager
+
+
+class BlacklistManager(JSONManager):
+    KEY = "scheme_code"
 
-class BlacklistManager(GCSJSONManager):
     def __init__(self):
         super().__init__(BLACKLIST_FILE_PATH)
 
     def add_blacklist(self, scheme_code: str, scheme_name: str) -> None:
-        FavouritesManager().remove_favourite(scheme_code)  # avoid duplicates
-        self.add_item({"scheme_code": scheme_code, "scheme_name": scheme_name}, unique_key="scheme_code")
+        # Move out of favourites (avoid duplicates)
+        FavouritesManager().move_item(self, {"scheme_code": scheme_code, "scheme_name": scheme_name}, unique_key="scheme_code")
 
     def remove_blacklist(self, scheme_code: str) -> None:
         self.remove_item("scheme_code", scheme_code)
 
 
-class FavouritesManager(GCSJSONManager):
+class FavouritesManager(JSONManager):
+    KEY = "scheme_code"
+
     def __init__(self):
         super().__init__(FAV_FILE_PATH)
 
     def add_favourite(self, scheme_code: str, scheme_name: str) -> None:
-        BlacklistManager().remove_blacklist(scheme_code)
-        self.add_item({"scheme_code": scheme_code, "scheme_name": scheme_name}, unique_key="scheme_code")
+        BlacklistManager().move_item(self, {"scheme_code": scheme_code, "scheme_name": scheme_name}, unique_key="scheme_code")
 
     def remove_favourite(self, scheme_code: str) -> None:
         self.remove_item("scheme_code", scheme_code)
 
 
-class SimulationManager(GCSJSONManager):
+class SimulationManager(LogJSONManager):
+    KEY = "id"
+
     def __init__(self):
         super().__init__(SAVED_SIMULATIONS_FILE_PATH)
 
     def save_simulation(self, params: Dict):
         params = {k.replace(" ", "_").lower(): v for k, v in params.items()}
-        data = self.load_data()
-        existing = next((sim for sim in data if sim['id'] == params['id']), None)
+        existing = next((sim for sim in self.load_data() if sim['id'] == params['id']), None)
         if existing:
             existing.update(params)
-        else:
-            data.append(params)
-        self.save_data(data)
+            params = existing
+        self.put_item(params)
 
     def delete_simulation(self, sim_id: str):
-        self.remove_item("id", sim_id)
+        self.delete_item(sim_id)
+
 
+class HoldingsManager(JSONManager):
+    """
+    Materialized per-scheme aggregate of `MyInvestmentsManager` transactions.
+
+    One record per scheme with 'scheme_code', 'scheme_name', 'total_units',
+    'total_invested', 'first_date', 'last_date' and, per transaction, 'transaction_ids',
+    'transaction_dates', 'transaction_units' and 'transaction_amounts' (signed: purchases
+    positive, redemptions negative units and proceeds). 'total_invested' is the FIFO cost
+    of the units still held (`src.tax_lots.TaxLotEngine`), not the net cash flow. Kept up
+    to date incrementally by `MyInvestmentsManager`, so readers get the holdings without
+    regrouping every transaction.
+    """
+    KEY = "scheme_code"
+
+    def __init__(self):
+        super().__init__(MY_HOLDINGS_FILE_PATH)
+
+    @staticmethod
+    def _new_holding(txn: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "scheme_code": str(txn["scheme_code"]),
+            "scheme_name": txn["scheme_name"],
+            "total_units": 0.0,
+            "total_invested": 0.0,
+            "first_date": None,
+            "last_date": None,
+            "transaction_ids": [],
+            "transaction_dates": [],
+            "transaction_units": [],
+            "transaction_amounts": [],
+        }
+
+    @staticmethod
+    def transactions_of(holding: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """The (id, date, units, amount) of every transaction of a holding, as transaction records."""
+        return [
+            {"investment_id": txn_id, "scheme_code": holding["scheme_code"], "scheme_name": holding["scheme_name"],
+             "nav_date": nav_date, "units_bought": units, "amount_invested": amount}
+            for txn_id, nav_date, units, amount in zip(
+                holding["transaction_ids"], holding["transaction_dates"],
+                holding["transaction_units"], holding["transaction_amounts"])
+        ]
+
+    @staticmethod
+    def _cost_basis(holding: Dict[str, Any]) -> float:
+        if all(units > 0 for units in holding["transaction_units"]):
+            return sum(holding["transaction_amounts"])
+        try:
+            cost_basis = TaxLotEngine(HoldingsManager.transactions_of(holding), current_navs={}).cost_basis()
+        except ValueError:  # oversold history written before redemptions were validated
+            return sum(holding["transaction_amounts"])
+        return float(cost_basis["remaining_cost"].sum())
+
+    @staticmethod
+    def _apply(holdings: List[Dict[str, Any]], txn: Dict[str, Any], sign: int) -> List[Dict[str, Any]]:
+        """Add (sign=1) or remove (sign=-1) one transaction in place; drops emptied holdings."""
+        scheme_code = str(txn["scheme_code"])
+        holding = next((h for h in holdings if h["scheme_code"] == scheme_code), None)
+        if holding is None:
+            if sign < 0:
+                return holdings
+            holding = HoldingsManager._new_holding(txn)
+            holdings.append(holding)
+
+        txn_id = txn["investment_id"]
+        if sign > 0:
+            if txn_id in holding["transaction_ids"]:
+                return holdings
+            holding["transaction_ids"].append(txn_id)
+            holding["transaction_dates"].append(txn["nav_date"])
+            holding["transaction_units"].append(float(txn["units_bought"]))
+            holding["transaction_amounts"].append(float(txn["amount_invested"]))
+        else:
+            if txn_id not in holding["transaction_ids"]:
+                return holdings
+            idx = holding["transaction_ids"].index(txn_id)
+            for field in ("transaction_ids", "transaction_dates", "transaction_units", "transaction_amounts"):
+                del holding[field][idx]
+
+        holding["total_units"] = round(sum(holding["transaction_units"]), 6)
+        holding["total_invested"] = round(HoldingsManager._cost_basis(holding), 6)
+        holding["first_date"] = min(holding["transaction_dates"], default=None)
+        holding["last_date"] = max(holding["transaction_dates"], default=None)
+
+        if not holding["transaction_ids"]:
+            holdings.remove(holding)
+        return holdings
+
+    def add_transaction(self, txn: Dict[str, Any]) -> None:
+        self.mutate(lambda holdings: self._apply(holdings, txn, +1))
+
+    def remove_transaction(self, txn: Dict[str, Any]) -> None:
+        self.mutate(lambda holdings: self._apply(holdings, txn, -1))
+
+    @staticmethod
+    def build(transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """The aggregate of the full transaction list (not stored)."""
+        holdings = []
+        for txn in transactions:
+            HoldingsManager._apply(holdings, txn, +1)
+        return holdings
+
+    def rebuild(self, transactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Regenerate the aggregate from the full transaction list and store it."""
+        holdings = self.build(transactions)
+        self.save_data(holdings)
+        return holdings
+
+
+class MyInvestmentsManager(LogJSONManager):
+    KEY = "investment_id"
+    HOLDINGS_RETRIES = 3  # attempts at the aggregate update that follows a transaction write
 
-class MyInvestmentsManager(GCSJSONManager):
     def __init__(self):
         super().__init__(MY_INVESTMENTS_FILE_PATH)
 
+    def _update_holdings(self, txn: Dict[str, Any], sign: int) -> bool:
+        """Apply a stored transaction to the holdings aggregate, retrying failed writes.
+
+        The transaction log and the aggregate are separate objects, so this is a second
+        write. If it keeps failing the aggregate is left stale: readers detect that
+        (`load_holdings` with the transactions) and `migrate_holdings` repairs it.
+
+        Returns:
+            bool: False if the aggregate could not be updated.
+        """
+        holdings_manager = HoldingsManager()
+        for attempt in range(self.HOLDINGS_RETRIES):
+            try:
+                holdings_manager.mutate(lambda holdings: holdings_manager._apply(holdings, txn, sign))
+                return True
+            except Exception as exc:
+                logger.warning("Holdings update for %s failed (attempt %d): %s", txn["investment_id"], attempt + 1, exc)
+                holdings_manager.invalidate_cache()
+                time.sleep(random.uniform(0, 0.1 * 2 ** attempt))
+        return False
+
     def add_investment(self, investment: Dict[str, str]) -> None:
         if 'investment_id' not in investment:
             investment['investment_id'] = str(uuid.uuid4())
-        self.add_item(investment, unique_key="investment_id")
+        self.put_item(investment)
+        self._update_holdings(investment, +1)
 
     def remove_investment(self, investment_id: str) -> None:
-        self.remove_item("investment_id", investment_id)
+        removed = next((d for d in self.load_data() if d.get("investment_id") == investment_id), None)
+        if removed is None:
+            return
+        if float(removed["units_bought"]) > 0:
+            remaining = [
+                d for d in self._scheme_transactions(removed["scheme_code"]) if d["investment_id"] != investment_id
+            ]
+            if not oversold(remaining).empty:
+                raise ValueError("Cannot delete this purchase: later redemptions would exceed the units held")
+        self.delete_item(investment_id)
+        self._update_holdings(removed, -1)
+
+    def _scheme_transactions(self, scheme_code) -> List[Dict[str, Any]]:
+        return [d for d in self.load_data() if str(d["scheme_code"]) == str(scheme_code)]
+
+    def add_redemption(self, redemption: Dict[str, Any]) -> None:
+        """Store a redemption as a transaction with negative units and amount (the proceeds).
+
+        The proceeds are a cash inflow for XIRR only: invested amounts and ROI use the FIFO
+        cost of the units still held (see `HoldingsManager`), which
+        `src.tax_lots.TaxLotEngine` derives by matching redemptions to earlier purchases.
+
+        Raises:
+            ValueError: If it exceeds the units redeemable on its NAV date.
+        """
+        units = abs(float(redemption["units_bought"]))
+        available = redeemable_units(self._scheme_transactions(redemption["scheme_code"]), redemption["nav_date"])
+        if units > available + UNITS_TOLERANCE:
+            raise ValueError(
+                f"Cannot redeem {units:.4f} units on {redemption['nav_date']}: only {available:.4f} are redeemable"
+            )
+        redemption = {
+            **redemption,
+            "transaction_type": "redeem",
+            "units_bought": -units,
+            "amount_invested": -abs(float(redemption["amount_invested"])),
+        }
+        self.add_investment(redemption)
+
+    def load_holdings(self, transactions: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Per-scheme holdings from the materialized aggregate (see `HoldingsManager`).
+
+        Read-only: a stored aggregate that is missing or out of date is only regenerated by
+        `migrate_holdings`.
+
+        Args:
+            transactions (list[dict], optional): Already loaded transactions. When given and
+                the stored aggregate does not cover exactly these (e.g. its update failed),
+                the holdings are grouped from them in memory instead.
+
+        Returns:
+            list[dict]: One record per scheme.
+        """
+        holdings = HoldingsManager().load_data()
+        if transactions is not None and self.holdings_outdated(transactions, holdings):
+            logger.warning("Holdings aggregate is out of date; grouping the transactions instead")
+            return HoldingsManager.build(transactions)
+        return holdings
+
+    def holdings_outdated(self, transactions: List[Dict[str, Any]] = None, holdings: List[Dict[str, Any]] = None) -> bool:
+        """Whether the holdings aggregate needs a rebuild.
+
+        That is when it does not cover exactly the stored transactions (e.g. it predates the
+        aggregate or was edited by hand) or lacks per-transaction units and amounts.
+
+        Args:
+            transactions (list[dict], optional): Already loaded transactions.
+            holdings (list[dict], optional): Already loaded aggregate.
+        """
+        transactions = self.load_data() if transactions is None else transactions
+        holdings = HoldingsManager().load_data() if holdings is None else holdings
+        stored_ids = {txn_id for h in holdings for txn_id in h["transaction_ids"]}
+        outdated = any("transaction_amounts" not in h for h in holdings)
+        return outdated or stored_ids != {d["investment_id"] for d in transactions}
+
+    def migrate_holdings(self) -> bool:
+        """Rebuild the holdings aggregate from the transactions if it is out of date.
+
+        Returns:
+            bool: True if the aggregate was rebuilt.
+        """
+        transactions = self.load_data()
+        if not self.holdings_outdated(transactions):
+            return False
+        HoldingsManager().rebuild(transactions)
+        return True
@@ -1,33 +1,129 @@
+import functools
+import gzip
 import json
+import os
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
 from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
 import streamlit as st
 import re
+from config.settings import STORAGE_FORMAT
+from . import tracing
+
+HTTP_POOL_SIZE = 16
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def encode_payload(data, storage_format: str = None) -> tuple:
+    """Serialize `data` for upload.
+
+    Returns:
+        tuple: (body bytes, content encoding or None). "json-gzip" writes minified,
+        gzip-compressed JSON; "json" the legacy indented JSON.
+    """
+    storage_format = storage_format or STORAGE_FORMAT
+    if storage_format == "json-gzip":
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return gzip.compress(body, compresslevel=6, mtime=0), "gzip"
+    return json.dumps(data, indent=4).encode("utf-8"), None
+
+
+def decode_payload(raw: bytes):
+    """Parse a stored object in either format (gzip is detected by its magic bytes)."""
+    if raw[:2] == GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    return json.loads(raw)
+
+
+@functools.lru_cache(maxsize=None)
+def get_service_account_info() -> dict:
+    """Service account JSON from `st.secrets`, with the private-key newlines fixed. Parsed once per process."""
+    raw_json = st.secrets["gcs"]["service_account_json"]
+    fixed_json = re.sub(r'("private_key"\s*:\s*")(.+?)(")', 
+                        lambda m: m.group(1) + m.group(2).replace('\n', '\\n') + m.group(3), 
+                        raw_json, flags=re.DOTALL)
+    return json.loads(fixed_json)
+
+
+@functools.lru_cache(maxsize=None)
+@tracing.traced("gcs.init_client")
+def get_storage_client() -> storage.Client:
+    """Process-wide storage client.
+
+    The credentials are built once and the client uses a single `AuthorizedSession` with a
+    pooled HTTP adapter, so every manager reuses the same TLS connections and access token.
+    """
+    service_account_info = get_service_account_info()
+    credentials = service_account.Credentials.from_service_account_info(
+        service_account_info, scopes=storage.Client.SCOPE
+    )
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    return storage.Client(credentials=credentials, project=service_account_info["project_id"], _http=session)
+
+
+@functools.lru_cache(maxsize=None)
+def get_bucket(bucket_name: str) -> storage.Bucket:
+    """Shared bucket handle of the process-wide client."""
+    return get_storage_client().bucket(bucket_name)
+
+
+# Optional replacement for `get_bucket` (e.g. `utils.gcs_emulator.EmulatedBucket`)
+_bucket_factory = None
+
+
+def set_bucket_factory(factory=None) -> None:
+    """Make every GCSClient use `factory(bucket_name)` as its bucket; None restores real GCS."""
+    global _bucket_factory
+    _bucket_factory = factory
+
+
+if os.environ.get("MF_GCS_EMULATOR", "").lower() in ("1", "true", "yes"):
+    from .gcs_emulator import EmulatedBucket
+    set_bucket_factory(functools.lru_cache(maxsize=None)(
+        lambda name: EmulatedBucket(name, latency_ms=float(os.environ.get("MF_GCS_EMULATOR_LATENCY_MS", 0)))
+    ))
+
 
 class GCSClient:
     def __init__(self, bucket_name: str, file_name: str):
         self.bucket_name = bucket_name
         self.file_name = file_name
+        if _bucket_factory is not None:
+            self.client = None
+            self.bucket = _bucket_factory(bucket_name)
+        else:
+            self.client = get_storage_client()
+            self.bucket = get_bucket(bucket_name)
 
-        raw_json = st.secrets["gcs"]["service_account_json"]
-        fixed_json = re.sub(r'("private_key"\s*:\s*")(.+?)(")', 
-                            lambda m: m.group(1) + m.group(2).replace('\n', '\\n') + m.group(3), 
-                            raw_json, flags=re.DOTALL)
+    @staticmethod
+    def download_json(blob, **kwargs):
+        """Download and parse a JSON object stored in either format.
 
-        service_account_info = json.loads(fixed_json)        
-        credentials = service_account.Credentials.from_service_account_info(service_account_info)
-        
-        self.client = storage.Client(credentials=credentials, project=service_account_info["project_id"])
-        self.bucket = self.client.bucket(bucket_name)
+        `raw_download` skips GCS decompressive transcoding, so the compressed bytes travel
+        over the wire and are decompressed here.
+        """
+        return decode_payload(blob.download_as_bytes(raw_download=True, **kwargs))
 
+    @staticmethod
+    def upload_json(blob, data, **kwargs):
+        """Upload `data` in `STORAGE_FORMAT`, setting Content-Encoding for gzip payloads."""
+        body, content_encoding = encode_payload(data)
+        blob.content_encoding = content_encoding
+        blob.upload_from_string(body, content_type="application/json", **kwargs)
+        return blob
+
+    @tracing.traced("gcs.load_data")
     def load_data(self):
         blob = self.bucket.blob(self.file_name)
         if blob.exists():
-            return json.loads(blob.download_as_text())
+            return self.download_json(blob)
         else:
             self.save_data([])
             return []
 
+    @tracing.traced("gcs.save_data")
     def save_data(self, data):
-        blob = self.bucket.blob(self.file_name)
-        blob.upload_from_string(json.dumps(data, indent=4), content_type="application/json")
+        return self.upload_json(self.bucket.blob(self.file_name), data)
@@ -0,0 +1,135 @@
+"""
+In-process stand-in for a GCS bucket, for offline runs, tests and load benchmarks.
+
+Implements the subset of the `google.cloud.storage` Bucket/Blob API used by `GCSClient`
+and the managers in `data_loader`: ``blob``, ``get_blob``, ``list_blobs``, and on blobs
+``exists``, ``download_as_bytes``, ``upload_from_string`` and ``delete``. Every write bumps
+the object generation, ``if_generation_match`` preconditions behave like GCS (0 means
+"must not exist") and raise the same `google.api_core` exceptions. Each request can be
+delayed by a configurable latency, and requests are counted per operation.
+
+Usage::
+
+    from utils import gcs_client
+    from utils.gcs_emulator import EmulatedBucket
+
+    bucket = EmulatedBucket(latency_ms=40, jitter_ms=10)
+    gcs_client.set_bucket_factory(lambda name: bucket)   # all managers now use it
+
+or run the app offline with ``MF_GCS_EMULATOR=1`` (optionally ``MF_GCS_EMULATOR_LATENCY_MS``).
+"""
+import collections
+import itertools
+import random
+import threading
+import time
+
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+
+class EmulatedBlob:
+    def __init__(self, bucket: "EmulatedBucket", name: str, generation: int = None, content_encoding: str = None):
+        self.bucket = bucket
+        self.name = name
+        self.generation = generation
+        self.content_encoding = content_encoding
+        self.content_type = None
+
+    def exists(self) -> bool:
+        return self.bucket._request("exists", lambda: self.name in self.bucket._objects)
+
+    def download_as_bytes(self, raw_download: bool = False, if_generation_match: int = None) -> bytes:
+        def read():
+            stored = self.bucket._objects.get(self.name)
+            if stored is None:
+                raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+            if if_generation_match is not None and stored["generation"] != if_generation_match:
+                raise PreconditionFailed(f"Generation mismatch for {self.name}")
+            return stored["data"]
+        return self.bucket._request("download", read)
+
+    def download_as_text(self, **kwargs) -> str:
+        return self.download_as_bytes(**kwargs).decode("utf-8")
+
+    def upload_from_string(self, data, content_type: str = None, if_generation_match: int = None) -> None:
+        body = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+
+        def write():
+            stored = self.bucket._objects.get(self.name)
+            current = stored["generation"] if stored else 0
+            if if_generation_match is not None and current != if_generation_match:
+                raise PreconditionFailed(f"Generation mismatch for {self.name}")
+            generation = next(self.bucket._generations)
+            self.bucket._objects[self.name] = {
+                "data": body, "generation": generation, "content_encoding": self.content_encoding,
+            }
+            return generation
+        self.generation = self.bucket._request("upload", write)
+        self.content_type = content_type
+
+    def delete(self) -> None:
+        def remove():
+            if self.bucket._objects.pop(self.name, None) is None:
+                raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+        self.bucket._request("delete", remove)
+
+
+class EmulatedBucket:
+    """
+    Thread-safe in-memory bucket with GCS generation semantics.
+
+    Parameters:
+        name (str): Bucket name.
+        latency_ms (float): Delay added to every request.
+        jitter_ms (float): Uniform random extra delay (0..jitter_ms) per request.
+
+    Public Methods:
+        blob(name) / get_blob(name) / list_blobs(prefix) -> Blob API as in google.cloud.storage
+        request_counts() -> dict
+            Requests per operation since the last `reset_counts`.
+        reset_counts() -> None
+    """
+
+    def __init__(self, name: str = "emulated", latency_ms: float = 0.0, jitter_ms: float = 0.0):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._objects = {}
+        self._generations = itertools.count(1)
+        self._lock = threading.Lock()
+        self._counts = collections.Counter()
+
+    def _request(self, operation: str, fn):
+        delay_ms = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        with self._lock:
+            self._counts[operation] += 1
+            return fn()
+
+    def blob(self, name: str) -> EmulatedBlob:
+        return EmulatedBlob(self, name)
+
+    def get_blob(self, name: str):
+        def read_metadata():
+            stored = self._objects.get(name)
+            if stored is None:
+                return None
+            return EmulatedBlob(self, name, stored["generation"], stored["content_encoding"])
+        return self._request("metadata", read_metadata)
+
+    def list_blobs(self, prefix: str = ""):
+        def listing():
+            return [
+                EmulatedBlob(self, name, stored["generation"], stored["content_encoding"])
+                for name, stored in sorted(self._objects.items()) if name.startswith(prefix)
+            ]
+        return self._request("list", listing)
+
+    def request_counts(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self._counts.clear()
@@ -0,0 +1,188 @@
+"""
+Groww link store and background resolver.
+
+Links are looked up with a Google search, which can take seconds and is rate limited,
+so it never runs on the render path. `request` queues scheme names for a single
+background worker; pages read the shared `GrowwLinkStore` and show a placeholder until
+the link arrives (see `streamlit_components.groww_link_manager`).
+
+Store format (``data/groww_links.json``), compatible with the old plain-string file::
+
+    {"<scheme name>": "https://groww.in/mutual-funds/...",          # found, kept forever
+     "<scheme name>": {"url": null, "expires_at": 1760000000.0}}   # not found, retried after expiry
+
+Legacy ``null`` entries count as expired misses and are looked up again.
+
+Usage::
+
+    from utils import groww_links
+
+    groww_links.request(["HDFC Flexi Cap Fund - Direct Plan - Growth"])
+    state, url = groww_links.lookup("HDFC Flexi Cap Fund - Direct Plan - Growth")
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from googlesearch import search
+
+from config.settings import BASE_DIR
+from . import tracing
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+STORE_PATH = os.path.join(BASE_DIR, "data", "groww_links.json")
+NOT_FOUND_TTL_SECONDS = 7 * 24 * 3600  # no Groww page found
+ERROR_TTL_SECONDS = 15 * 60            # search failed (network, rate limit)
+
+FOUND, NOT_FOUND, PENDING = "found", "not_found", "pending"
+
+
+class GrowwLinkStore:
+    """
+    JSON-file key-value store of scheme name -> Groww link, shared by all sessions.
+
+    Reads are served from memory and reloaded only when the file changes on disk. Writes
+    take an exclusive lock (a thread lock plus ``flock`` on a sidecar lock file where
+    available), merge with the current file contents and replace the file atomically, so
+    concurrent writers in this or other processes never lose each other's entries.
+
+    Parameters:
+        path (str): Location of the JSON file.
+
+    Public Methods:
+        get(scheme_name) -> tuple
+            (state, url) where state is FOUND, NOT_FOUND or PENDING (unknown or expired).
+        put(scheme_name, url=None, ttl=NOT_FOUND_TTL_SECONDS)
+            Record a found link (url) or a miss (url None) that expires after `ttl` seconds.
+    """
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._mtime = None
+
+    def _locked_file(self):
+        lock_file = open(self.path + ".lock", "a")
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        return lock_file
+
+    def _reload(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            self._entries = json.load(f)
+        self._mtime = mtime
+
+    def get(self, scheme_name: str) -> tuple:
+        with self._lock:
+            self._reload()
+            entry = self._entries.get(scheme_name)
+        if isinstance(entry, str):
+            return FOUND, entry
+        if isinstance(entry, dict) and entry.get("expires_at", 0) > time.time():
+            return NOT_FOUND, None
+        return PENDING, None
+
+    def put(self, scheme_name: str, url: str = None, ttl: float = NOT_FOUND_TTL_SECONDS) -> None:
+        entry = url if url else {"url": None, "expires_at": time.time() + ttl}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock, self._locked_file():
+            self._reload()
+            self._entries[scheme_name] = entry
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.stat(self.path).st_mtime_ns
+
+
+_STORE = GrowwLinkStore()
+_QUEUE = queue.Queue()
+_PENDING = set()
+_PENDING_LOCK = threading.Lock()
+_WORKER = None
+
+
+def _search(scheme_name: str) -> str:
+    """First groww.in/mutual-funds result of a Google search for the scheme, or None."""
+    query = f'site:groww.in/mutual-funds "{scheme_name}"'
+    with tracing.span("groww.search"):
+        for url in search(query, num_results=5):
+            if "groww.in/mutual-funds" in url:
+                return url
+    return None
+
+
+def _resolve(scheme_name: str) -> None:
+    if _STORE.get(scheme_name)[0] != PENDING:  # resolved by another process meanwhile
+        return
+    try:
+        url = _search(scheme_name)
+    except Exception as exc:
+        logger.warning("Groww link search failed for %s: %s", scheme_name, exc)
+        _STORE.put(scheme_name, None, ttl=ERROR_TTL_SECONDS)
+        return
+    _STORE.put(scheme_name, url)
+
+
+def _work() -> None:
+    while True:
+        scheme_name = _QUEUE.get()
+        try:
+            _resolve(scheme_name)
+        except Exception:
+            logger.exception("Groww link resolution failed for %s", scheme_name)
+        finally:
+            with _PENDING_LOCK:
+                _PENDING.discard(scheme_name)
+
+
+def _ensure_worker() -> None:
+    global _WORKER
+    if _WORKER is None or not _WORKER.is_alive():
+        _WORKER = threading.Thread(target=_work, name="groww-links", daemon=True)
+        _WORKER.start()
+
+
+def lookup(scheme_name: str) -> tuple:
+    """(state, url) of a scheme from the shared store; never searches."""
+    state, url = _STORE.get(scheme_name)
+    tracing.record_cache("groww_links", hit=state != PENDING)
+    return state, url
+
+
+def request(scheme_names) -> int:
+    """Queue unresolved schemes for the background worker.
+
+    Args:
+        scheme_names (iterable[str]): Scheme names; known, fresh and already queued ones are skipped.
+
+    Returns:
+        int: Number of schemes newly queued.
+    """
+    queued = 0
+    with _PENDING_LOCK:
+        for scheme_name in dict.fromkeys(scheme_names):
+            if scheme_name in _PENDING or _STORE.get(scheme_name)[0] != PENDING:
+                continue
+            _PENDING.add(scheme_name)
+            _QUEUE.put(scheme_name)
+            queued += 1
+        if queued:
+            _ensure_worker()
+    return queued
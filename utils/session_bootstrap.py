@@ -0,0 +1,109 @@
+"""
+Session bootstrap: prefetch every user-data file in parallel.
+
+Pages read favourites, blacklist, saved simulations and investments through separate
+managers, each a blocking storage round-trip. `prefetch_user_data` loads them all at
+once on a small thread pool; the results land in the shared manager cache (see
+`GCSJSONManager`), so the reads that follow on the page are served from memory.
+
+`migrate_holdings` regenerates the holdings aggregate if it does not match the stored
+investments (the only place it is rebuilt; reads never write).
+
+`prefetch_groww_links` then queues the Groww links of favourites and holdings for the
+background resolver (see `utils.groww_links`), so they are usually resolved before a page
+asks for them.
+
+Usage (once per session, e.g. in ``app.py``)::
+
+    from utils.session_bootstrap import bootstrap_session
+    bootstrap_session()
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from . import groww_links, tracing
+from .data_loader import (
+    BlacklistManager, FavouritesManager, HoldingsManager, MyInvestmentsManager, SimulationManager
+)
+
+logger = logging.getLogger(__name__)
+
+USER_DATA_MANAGERS = [FavouritesManager, BlacklistManager, SimulationManager, MyInvestmentsManager, HoldingsManager]
+SESSION_FLAG = "_user_data_prefetched"
+
+
+@tracing.traced("session.prefetch_user_data")
+def prefetch_user_data(max_workers: int = 4) -> dict:
+    """Load every user-data file concurrently.
+
+    Args:
+        max_workers (int): Size of the thread pool.
+
+    Returns:
+        dict: file name (manager class name if it could not be built) -> {'items': number of
+        items or None, 'ms': load time, 'error': message or None}. Never raises.
+    """
+    # Managers are built on the calling thread (secrets and the shared client live there);
+    # one that cannot be built (missing secret, unreachable bucket) is only reported
+    managers, results = [], {}
+    for manager_cls in USER_DATA_MANAGERS:
+        try:
+            managers.append(manager_cls())
+        except Exception as exc:
+            logger.warning("Prefetch of %s skipped: %s", manager_cls.__name__, exc)
+            results[manager_cls.__name__] = {"items": None, "ms": 0.0, "error": str(exc)}
+
+    def load(manager):
+        start = time.perf_counter()
+        try:
+            items, error = len(manager.load_data()), None
+        except Exception as exc:  # A failed prefetch only means a cold read later
+            logger.warning("Prefetch of %s failed: %s", manager.file_name, exc)
+            items, error = None, str(exc)
+        return manager.file_name, {"items": items, "ms": (time.perf_counter() - start) * 1000, "error": error}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch") as pool:
+        results.update(pool.map(load, managers))
+    return results
+
+
+def migrate_holdings() -> bool:
+    """Bring the holdings aggregate up to date with the investments (see `MyInvestmentsManager.migrate_holdings`).
+
+    Returns:
+        bool: True if the aggregate was rebuilt.
+    """
+    try:
+        rebuilt = MyInvestmentsManager().migrate_holdings()
+    except Exception as exc:
+        logger.warning("Holdings migration skipped: %s", exc)
+        return False
+    if rebuilt:
+        logger.info("Rebuilt the holdings aggregate from the investments")
+    return rebuilt
+
+
+def prefetch_groww_links() -> int:
+    """Queue the Groww links of all favourite and held schemes for background resolution.
+
+    Returns:
+        int: Number of schemes queued (already known links are skipped).
+    """
+    try:
+        schemes = FavouritesManager().load_data() + HoldingsManager().load_data()
+    except Exception as exc:
+        logger.warning("Groww link prefetch skipped: %s", exc)
+        return 0
+    return groww_links.request(item["scheme_name"] for item in schemes if item.get("scheme_name"))
+
+
+def bootstrap_session() -> None:
+    """Run `prefetch_user_data`, `migrate_holdings` and `prefetch_groww_links` once per Streamlit session."""
+    if st.session_state.get(SESSION_FLAG):
+        return
+    st.session_state[SESSION_FLAG] = prefetch_user_data()
+    migrate_holdings()
+    prefetch_groww_links()
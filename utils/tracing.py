@@ -0,0 +1,224 @@
+"""
+Lightweight span / timing instrumentation for the data, analytics and UI layers.
+
+Tracing is off by default and costs a single flag check per instrumented call while off.
+Turn it on with the environment variable ``MF_TRACING=1`` (``MF_TRACING=log`` also writes
+every span as a JSON line to stderr through the ``mf_analytics.tracing`` logger) or by
+calling `enable()`.
+
+Usage::
+
+    from utils import tracing
+
+    @tracing.traced("gcs.load_data")
+    def load_data(self): ...
+
+    with tracing.span("chart.render", window=30):
+        ...
+
+    tracing.record_cache("groww_links", hit=True)
+    tracing.summary()   # per-name call counts, latencies and cache hit ratios
+
+Finished spans are kept in an in-memory ring buffer (`recent_spans`) and aggregated
+per name (`summary`, `export_summary`). Span attributes are nested under ``"attrs"`` so
+they never shadow the record fields.
+"""
+import collections
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("mf_analytics.tracing")
+
+_ENABLED = os.environ.get("MF_TRACING", "").lower() in ("1", "true", "yes", "log")
+_LOG_SPANS = os.environ.get("MF_TRACING", "").lower() == "log"
+_BUFFER = collections.deque(maxlen=int(os.environ.get("MF_TRACING_BUFFER", 10000)))
+_STATS = {}
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+def _configure_span_logging() -> None:
+    """Make span records visible: INFO level and a stderr handler unless one is attached."""
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False  # one line per span, even if the root logger has handlers
+
+
+if _LOG_SPANS:
+    _configure_span_logging()
+
+
+def enable(buffer_size: int = None, log_spans: bool = False) -> None:
+    """Start recording spans (optionally resizing the ring buffer and logging each span)."""
+    global _ENABLED, _LOG_SPANS, _BUFFER
+    with _LOCK:
+        if buffer_size is not None and buffer_size != _BUFFER.maxlen:
+            _BUFFER = collections.deque(_BUFFER, maxlen=buffer_size)
+        _ENABLED, _LOG_SPANS = True, log_spans
+    if log_spans:
+        _configure_span_logging()
+
+
+def disable() -> None:
+    """Stop recording spans; instrumented code falls back to the no-op path."""
+    global _ENABLED
+    _ENABLED = False
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def reset() -> None:
+    """Clear the ring buffer and all aggregated statistics."""
+    with _LOCK:
+        _BUFFER.clear()
+        _STATS.clear()
+
+
+def _stats_for(name: str) -> dict:
+    stats = _STATS.get(name)
+    if stats is None:
+        stats = _STATS[name] = {
+            "calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "cache_hits": 0, "cache_misses": 0,
+        }
+    return stats
+
+
+class _Span:
+    __slots__ = ("name", "attrs", "parent", "start")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = getattr(_LOCAL, "stack", None)
+        if stack is None:
+            stack = _LOCAL.stack = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        _LOCAL.stack.pop()
+        record = {
+            "name": self.name,
+            "parent": self.parent,
+            "start": time.time() - duration_ms / 1000,
+            "duration_ms": duration_ms,
+            "thread": threading.current_thread().name,
+            "error": exc_type.__name__ if exc_type else None,
+            "attrs": self.attrs,
+        }
+        with _LOCK:
+            _BUFFER.append(record)
+            stats = _stats_for(self.name)
+            stats["calls"] += 1
+            stats["errors"] += exc_type is not None
+            stats["total_ms"] += duration_ms
+            stats["max_ms"] = max(stats["max_ms"], duration_ms)
+        if _LOG_SPANS:
+            logger.info(json.dumps(record, default=str))
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, /, **attrs):
+    """Context manager timing the enclosed block as span `name` (no-op while disabled)."""
+    if not _ENABLED:
+        return _NOOP_SPAN
+    return _Span(name, attrs)
+
+
+def traced(name: str = None):
+    """Decorator timing every call of the wrapped function as a span.
+
+    Args:
+        name (str, optional): Span name. Defaults to ``module.qualname`` of the function.
+    """
+    def decorator(fn):
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+            with _Span(span_name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
+
+def record_cache(name: str, hit: bool) -> None:
+    """Count a cache hit or miss under `name` (no-op while disabled)."""
+    if not _ENABLED:
+        return
+    with _LOCK:
+        _stats_for(name)["cache_hits" if hit else "cache_misses"] += 1
+
+
+def recent_spans(limit: int = None) -> list:
+    """Return the most recent finished spans (newest last) from the ring buffer."""
+    with _LOCK:
+        spans = list(_BUFFER)
+    return spans[-limit:] if limit else spans
+
+
+def summary() -> list:
+    """Aggregate statistics per span / cache name.
+
+    Returns:
+        list[dict]: One row per name with keys name, calls, errors, total_ms, mean_ms,
+        p95_ms (over spans still in the ring buffer), max_ms, cache_hits, cache_misses
+        and cache_hit_ratio, sorted by total time.
+    """
+    with _LOCK:
+        stats = {name: dict(values) for name, values in _STATS.items()}
+        durations = collections.defaultdict(list)
+        for record in _BUFFER:
+            durations[record["name"]].append(record["duration_ms"])
+
+    rows = []
+    for name, values in stats.items():
+        recent = sorted(durations.get(name, []))
+        lookups = values["cache_hits"] + values["cache_misses"]
+        rows.append({
+            "name": name,
+            **values,
+            "mean_ms": values["total_ms"] / values["calls"] if values["calls"] else 0.0,
+            "p95_ms": recent[min(len(recent) - 1, int(0.95 * len(recent)))] if recent else 0.0,
+            "cache_hit_ratio": values["cache_hits"] / lookups if lookups else None,
+        })
+    return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+
+def export_summary(path: str = None) -> str:
+    """Serialize `summary()` (and the buffered spans) as JSON, optionally writing it to `path`."""
+    payload = json.dumps({"summary": summary(), "spans": recent_spans()}, indent=2, default=str)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(payload)
+    return payload